@@ -5,12 +5,32 @@ if not pm.is_installed("pyvis"):
 if not pm.is_installed("networkx"):
     pm.install("networkx")
 
+import asyncio
 import networkx as nx
 from pyvis.network import Network
 import random
 
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+
+WORKING_DIR = "./dickens"
+
+
+async def export_graphml(working_dir):
+    """Export the knowledge graph stored by NetworkXStorage as a GraphML file"""
+    initialize_share_data()
+    graph_storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await graph_storage.initialize()
+    return await graph_storage.export_graphml()
+
+
 # Load the GraphML file
-G = nx.read_graphml("./dickens/graph_chunk_entity_relation.graphml")
+G = nx.read_graphml(asyncio.run(export_graphml(WORKING_DIR)))
 
 # Create a Pyvis network
 net = Network(height="100vh", notebook=True)
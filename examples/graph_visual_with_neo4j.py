@@ -1,8 +1,12 @@
+import asyncio
 import os
 import json
 import xml.etree.ElementTree as ET
 from neo4j import GraphDatabase
 
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import initialize_share_data
+
 # Constants
 WORKING_DIR = "./dickens"
 BATCH_SIZE_NODES = 500
@@ -98,9 +102,22 @@ def process_in_batches(tx, query, data, batch_size):
         tx.run(query, {"nodes": batch} if "nodes" in query else {"edges": batch})
 
 
+async def export_graphml(working_dir):
+    """Export the knowledge graph stored by NetworkXStorage as a GraphML file"""
+    initialize_share_data()
+    graph_storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="",
+        global_config={"working_dir": working_dir},
+        embedding_func=None,
+    )
+    await graph_storage.initialize()
+    return await graph_storage.export_graphml()
+
+
 def main():
     # Paths
-    xml_file = os.path.join(WORKING_DIR, "graph_chunk_entity_relation.graphml")
+    xml_file = asyncio.run(export_graphml(WORKING_DIR))
     json_file = os.path.join(WORKING_DIR, "graph_data.json")
 
     # Convert XML to JSON
@@ -39,6 +39,11 @@ from lightrag.constants import (
     DEFAULT_OLLAMA_MODEL_TAG,
     DEFAULT_RERANK_BINDING,
     DEFAULT_ENTITY_TYPES,
+    DEFAULT_EXTRACTION_MAX_WORKERS,
+    DEFAULT_MAX_PARALLEL_ENQUEUE,
+    DEFAULT_DELETE_BATCH_SIZE,
+    DEFAULT_EXTRACTION_TIMEOUT,
+    DEFAULT_EXTRACTION_MEMORY_LIMIT_MB,
 )
 
 # use the .env that is inside the current folder
@@ -304,6 +309,16 @@ def parse_args() -> argparse.Namespace:
     # Get MAX_PARALLEL_INSERT from environment
     args.max_parallel_insert = get_env_value("MAX_PARALLEL_INSERT", 2, int)
 
+    # Files enqueued concurrently when scanning the input directory
+    args.max_parallel_enqueue = get_env_value(
+        "MAX_PARALLEL_ENQUEUE", DEFAULT_MAX_PARALLEL_ENQUEUE, int
+    )
+
+    # Documents deleted together, a failure only fails its own batch
+    args.delete_batch_size = get_env_value(
+        "DELETE_BATCH_SIZE", DEFAULT_DELETE_BATCH_SIZE, int
+    )
+
     # Get MAX_GRAPH_NODES from environment
     args.max_graph_nodes = get_env_value("MAX_GRAPH_NODES", 1000, int)
 
@@ -342,6 +357,17 @@ def parse_args() -> argparse.Namespace:
     # Select Document loading tool (DOCLING, DEFAULT)
     args.document_loading_engine = get_env_value("DOCUMENT_LOADING_ENGINE", "DEFAULT")
 
+    # Worker processes for PDF/DOCX/PPTX/XLSX text extraction
+    args.extraction_max_workers = get_env_value(
+        "EXTRACTION_MAX_WORKERS", DEFAULT_EXTRACTION_MAX_WORKERS, int
+    )
+    args.extraction_timeout = get_env_value(
+        "EXTRACTION_TIMEOUT", DEFAULT_EXTRACTION_TIMEOUT, int
+    )
+    args.extraction_memory_limit_mb = get_env_value(
+        "EXTRACTION_MEMORY_LIMIT_MB", DEFAULT_EXTRACTION_MEMORY_LIMIT_MB, int
+    )
+
     # Add environment variables that were previously read directly
     args.cors_origins = get_env_value("CORS_ORIGINS", "*")
     args.summary_language = get_env_value("SUMMARY_LANGUAGE", DEFAULT_SUMMARY_LANGUAGE)
@@ -0,0 +1,297 @@
+"""
+Out-of-process text extraction for PDF, DOCX, PPTX and XLSX uploads.
+
+PyPDF2, python-docx, python-pptx, openpyxl and docling are CPU bound and hold
+the GIL, so running them inside the request handler freezes the event loop for
+the whole conversion. Each file is extracted in its own worker process:
+
+- at most ``max_workers`` extractions run at once, the rest wait in a queue
+- a worker exceeding the per-file ``timeout`` is killed
+- ``memory_limit_mb`` caps the address space of each worker (Unix only)
+- workers write text page by page to a spool file, so the full text is never
+  pickled back through a pipe or held by worker and server at the same time
+
+Worker processes come from a forkserver (spawn where unavailable) so that the
+server's threads and open connections are never forked.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import aiofiles
+import pipmaster as pm
+
+from lightrag.utils import logger
+
+
+class DocumentExtractionError(Exception):
+    """Raised when a worker fails to extract text from a document"""
+
+
+class DocumentExtractionTimeout(DocumentExtractionError):
+    """Raised when a worker exceeds the per-file extraction timeout"""
+
+
+def _docling_pages(file_path: str) -> Iterator[str]:
+    if not pm.is_installed("docling"):  # type: ignore
+        pm.install("docling")
+    from docling.document_converter import DocumentConverter  # type: ignore
+
+    converter = DocumentConverter()
+    result = converter.convert(file_path)
+    yield result.document.export_to_markdown()
+
+
+def _pdf_pages(file_path: str) -> Iterator[str]:
+    if not pm.is_installed("pypdf2"):  # type: ignore
+        pm.install("pypdf2")
+    from PyPDF2 import PdfReader  # type: ignore
+
+    with open(file_path, "rb") as f:
+        reader = PdfReader(f)
+        for page in reader.pages:
+            yield page.extract_text() + "\n"
+
+
+def _docx_pages(file_path: str) -> Iterator[str]:
+    if not pm.is_installed("python-docx"):  # type: ignore
+        try:
+            pm.install("python-docx")
+        except Exception:
+            pm.install("docx")
+    from docx import Document  # type: ignore
+
+    doc = Document(file_path)
+    for i, paragraph in enumerate(doc.paragraphs):
+        yield paragraph.text if i == 0 else "\n" + paragraph.text
+
+
+def _pptx_pages(file_path: str) -> Iterator[str]:
+    if not pm.is_installed("python-pptx"):  # type: ignore
+        pm.install("pptx")
+    from pptx import Presentation  # type: ignore
+
+    prs = Presentation(file_path)
+    for slide in prs.slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                yield shape.text + "\n"
+
+
+def _xlsx_pages(file_path: str) -> Iterator[str]:
+    if not pm.is_installed("openpyxl"):  # type: ignore
+        pm.install("openpyxl")
+    from openpyxl import load_workbook  # type: ignore
+
+    wb = load_workbook(file_path)
+    for sheet in wb:
+        yield f"Sheet: {sheet.title}\n"
+        for row in sheet.iter_rows(values_only=True):
+            yield (
+                "\t".join(str(cell) if cell is not None else "" for cell in row) + "\n"
+            )
+        yield "\n"
+
+
+EXTRACTORS: dict[str, Callable[[str], Iterator[str]]] = {
+    ".pdf": _pdf_pages,
+    ".docx": _docx_pages,
+    ".pptx": _pptx_pages,
+    ".xlsx": _xlsx_pages,
+}
+
+
+def get_extractor(ext: str, engine: str = "DEFAULT") -> Callable[[str], Iterator[str]]:
+    """Return the page iterator for a file extension and document loading engine"""
+    if engine == "DOCLING":
+        return _docling_pages
+    return EXTRACTORS[ext]
+
+
+def _extraction_worker(
+    extractor: Callable[[str], Iterator[str]],
+    src_path: str,
+    out_path: str,
+    memory_limit_mb: int,
+    conn,
+) -> None:
+    """Worker process entry point: stream extracted pages into ``out_path``"""
+    try:
+        if memory_limit_mb > 0:
+            import resource
+
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+        with open(out_path, "w", encoding="utf-8") as out:
+            for page in extractor(src_path):
+                out.write(page)
+        conn.send(("ok", None))
+    except MemoryError:
+        conn.send(("error", f"exceeded memory limit of {memory_limit_mb} MB"))
+    except BaseException as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+def _get_mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        ctx = multiprocessing.get_context("forkserver")
+        # Import parsers' host module once in the server instead of per worker
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class DocumentExtractionPool:
+    """Bounded pool of extraction worker processes with per-file timeouts
+
+    Args:
+        max_workers: Maximum number of concurrent extraction processes.
+        timeout: Seconds before a worker is killed, 0 or None disables the timeout.
+        memory_limit_mb: Address space limit per worker in MB, 0 disables the limit.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        timeout: float | None = None,
+        memory_limit_mb: int = 0,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout or None
+        self.memory_limit_mb = memory_limit_mb
+        self._semaphore: asyncio.Semaphore | None = None
+        self._processes: set = set()
+        self._ctx = None
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    async def extract(
+        self, file_path: Path, extractor: Callable[[str], Iterator[str]]
+    ) -> str:
+        """Extract the text of ``file_path`` in a worker process
+
+        Raises:
+            DocumentExtractionTimeout: The worker exceeded the timeout and was killed.
+            DocumentExtractionError: The extractor raised or the worker died.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+
+        self._queued += 1
+        queued = True
+        try:
+            async with self._semaphore:
+                self._queued -= 1
+                queued = False
+                self._running += 1
+                try:
+                    content = await self._run(file_path, extractor)
+                    self._completed += 1
+                    return content
+                except DocumentExtractionTimeout:
+                    self._timed_out += 1
+                    raise
+                except DocumentExtractionError:
+                    self._failed += 1
+                    raise
+                finally:
+                    self._running -= 1
+        finally:
+            if queued:
+                self._queued -= 1
+
+    async def _run(self, file_path: Path, extractor) -> str:
+        if self._ctx is None:
+            self._ctx = _get_mp_context()
+
+        fd, out_path = tempfile.mkstemp(prefix="lightrag_extract_", suffix=".txt")
+        os.close(fd)
+        parent_conn, child_conn = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(
+            target=_extraction_worker,
+            args=(
+                extractor,
+                str(file_path),
+                out_path,
+                self.memory_limit_mb,
+                child_conn,
+            ),
+            daemon=True,
+        )
+        try:
+            # Starting the forkserver on first use imports lightrag, keep it off the loop
+            await asyncio.to_thread(proc.start)
+            child_conn.close()
+            self._processes.add(proc)
+
+            # Wait on the pipe, not the process: a worker reporting a large error
+            # message blocks in send() until the message is read. The pipe also
+            # becomes readable (EOF) when the worker dies without reporting.
+            if not await asyncio.to_thread(parent_conn.poll, self.timeout):
+                proc.kill()
+                await asyncio.to_thread(proc.join)
+                logger.warning(
+                    f"[File Extraction]Killed worker for {file_path.name} after {self.timeout}s"
+                )
+                raise DocumentExtractionTimeout(
+                    f"extraction timed out after {self.timeout}s"
+                )
+
+            try:
+                status, message = await asyncio.to_thread(parent_conn.recv)
+            except EOFError:
+                # Worker died before reporting, e.g. killed by the OOM killer
+                status, message = None, None
+            # The worker exits right after reporting
+            await asyncio.to_thread(proc.join, self.timeout)
+            if status != "ok":
+                if status is None:
+                    message = f"extraction worker exited with code {proc.exitcode}"
+                    if self.memory_limit_mb > 0:
+                        message += f" (memory limit {self.memory_limit_mb} MB)"
+                raise DocumentExtractionError(message)
+
+            async with aiofiles.open(out_path, "r", encoding="utf-8") as f:
+                return await f.read()
+        finally:
+            # Also reached when the caller is cancelled while the worker runs
+            if proc.is_alive():
+                proc.kill()
+            self._processes.discard(proc)
+            child_conn.close()
+            parent_conn.close()
+            try:
+                os.unlink(out_path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and outcome counters"""
+        return {
+            "max_workers": self.max_workers,
+            "queued": self._queued,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+        }
+
+    def shutdown(self) -> None:
+        """Kill any extraction still running"""
+        for proc in list(self._processes):
+            if proc.is_alive():
+                proc.kill()
+        self._processes.clear()
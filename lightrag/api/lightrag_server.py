@@ -46,6 +46,7 @@ from lightrag.constants import (
 from lightrag.api.routers.document_routes import (
     DocumentManager,
     create_document_routes,
+    shutdown_extraction_pool,
 )
 from lightrag.api.routers.query_routes import create_query_routes
 from lightrag.api.routers.graph_routes import create_graph_routes
@@ -338,6 +339,9 @@ def create_app(args):
             yield
 
         finally:
+            # Stop extraction workers still converting uploads
+            shutdown_extraction_pool()
+
             # Clean up database connections
             await rag.finalize_storages()
 
@@ -6,8 +6,8 @@ import asyncio
 from lightrag.utils import logger, get_pinyin_sort_key
 import aiofiles
 import shutil
+import time
 import traceback
-import pipmaster as pm
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Literal
@@ -25,6 +25,11 @@ from lightrag import LightRAG
 from lightrag.base import DeletionResult, DocProcessingStatus, DocStatus
 from lightrag.utils import generate_track_id
 from lightrag.api.utils_api import get_combined_auth_dependency
+from lightrag.api.document_extraction import (
+    EXTRACTORS,
+    DocumentExtractionPool,
+    get_extractor,
+)
 from ..config import global_args
 
 
@@ -687,6 +692,7 @@ class PipelineStatusResponse(BaseModel):
         latest_message: Latest message from pipeline processing
         history_messages: List of history messages
         update_status: Status of update flags for all namespaces
+        stages: Queue depth, active workers and throughput per ingestion stage
     """
 
     autoscanned: bool = False
@@ -700,6 +706,7 @@ class PipelineStatusResponse(BaseModel):
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
     update_status: Optional[dict] = None
+    stages: Optional[dict] = None
 
     @field_validator("job_start", mode="before")
     @classmethod
@@ -876,6 +883,30 @@ def get_unique_filename_in_enqueued(target_dir: Path, original_name: str) -> str
     return f"{base_name}_{timestamp}{extension}"
 
 
+# Minimum seconds between enqueue progress updates in pipeline_status
+ENQUEUE_PROGRESS_INTERVAL = 2.0
+
+_extraction_pool: Optional[DocumentExtractionPool] = None
+
+
+def get_extraction_pool() -> DocumentExtractionPool:
+    """Worker pool used for PDF/DOCX/PPTX/XLSX text extraction"""
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = DocumentExtractionPool(
+            max_workers=global_args.extraction_max_workers,
+            timeout=global_args.extraction_timeout,
+            memory_limit_mb=global_args.extraction_memory_limit_mb,
+        )
+    return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Kill extraction workers still running when the server stops"""
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown()
+
+
 async def pipeline_enqueue_file(
     rag: LightRAG, file_path: Path, track_id: str = None
 ) -> tuple[bool, str]:
@@ -907,7 +938,9 @@ async def pipeline_enqueue_file(
         file = None
         try:
             async with aiofiles.open(file_path, "rb") as f:
-                file = await f.read()
+                # Binary documents are read by the extraction worker itself
+                if ext not in EXTRACTORS:
+                    file = await f.read()
         except PermissionError as e:
             error_files = [
                 {
@@ -1046,24 +1079,10 @@ async def pipeline_enqueue_file(
 
                 case ".pdf":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("pypdf2"):  # type: ignore
-                                pm.install("pypdf2")
-                            from PyPDF2 import PdfReader  # type: ignore
-                            from io import BytesIO
-
-                            pdf_file = BytesIO(file)
-                            reader = PdfReader(pdf_file)
-                            for page in reader.pages:
-                                content += page.extract_text() + "\n"
+                        content = await get_extraction_pool().extract(
+                            file_path,
+                            get_extractor(".pdf", global_args.document_loading_engine),
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1083,28 +1102,10 @@ async def pipeline_enqueue_file(
 
                 case ".docx":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("python-docx"):  # type: ignore
-                                try:
-                                    pm.install("python-docx")
-                                except Exception:
-                                    pm.install("docx")
-                            from docx import Document  # type: ignore
-                            from io import BytesIO
-
-                            docx_file = BytesIO(file)
-                            doc = Document(docx_file)
-                            content = "\n".join(
-                                [paragraph.text for paragraph in doc.paragraphs]
-                            )
+                        content = await get_extraction_pool().extract(
+                            file_path,
+                            get_extractor(".docx", global_args.document_loading_engine),
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1124,26 +1125,10 @@ async def pipeline_enqueue_file(
 
                 case ".pptx":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("python-pptx"):  # type: ignore
-                                pm.install("pptx")
-                            from pptx import Presentation  # type: ignore
-                            from io import BytesIO
-
-                            pptx_file = BytesIO(file)
-                            prs = Presentation(pptx_file)
-                            for slide in prs.slides:
-                                for shape in slide.shapes:
-                                    if hasattr(shape, "text"):
-                                        content += shape.text + "\n"
+                        content = await get_extraction_pool().extract(
+                            file_path,
+                            get_extractor(".pptx", global_args.document_loading_engine),
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1163,33 +1148,10 @@ async def pipeline_enqueue_file(
 
                 case ".xlsx":
                     try:
-                        if global_args.document_loading_engine == "DOCLING":
-                            if not pm.is_installed("docling"):  # type: ignore
-                                pm.install("docling")
-                            from docling.document_converter import DocumentConverter  # type: ignore
-
-                            converter = DocumentConverter()
-                            result = converter.convert(file_path)
-                            content = result.document.export_to_markdown()
-                        else:
-                            if not pm.is_installed("openpyxl"):  # type: ignore
-                                pm.install("openpyxl")
-                            from openpyxl import load_workbook  # type: ignore
-                            from io import BytesIO
-
-                            xlsx_file = BytesIO(file)
-                            wb = load_workbook(xlsx_file)
-                            for sheet in wb:
-                                content += f"Sheet: {sheet.title}\n"
-                                for row in sheet.iter_rows(values_only=True):
-                                    content += (
-                                        "\t".join(
-                                            str(cell) if cell is not None else ""
-                                            for cell in row
-                                        )
-                                        + "\n"
-                                    )
-                                content += "\n"
+                        content = await get_extraction_pool().extract(
+                            file_path,
+                            get_extractor(".xlsx", global_args.document_loading_engine),
+                        )
                     except Exception as e:
                         error_files = [
                             {
@@ -1361,10 +1323,48 @@ async def pipeline_index_file(rag: LightRAG, file_path: Path, track_id: str = No
         logger.error(traceback.format_exc())
 
 
+async def _report_enqueue_progress(
+    total: int, enqueued: int, failed: int, start_time: float
+) -> None:
+    """Publish file enqueue throughput to pipeline_status"""
+    from lightrag.kg.shared_storage import (
+        get_namespace_data,
+        get_pipeline_status_lock,
+    )
+
+    elapsed = time.perf_counter() - start_time
+    done = enqueued + failed
+    progress = {
+        "total": total,
+        "enqueued": enqueued,
+        "failed": failed,
+        "elapsed": round(elapsed, 2),
+        "files_per_second": round(done / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+    message = (
+        f"Enqueued {done}/{total} files ({failed} failed, "
+        f"{progress['files_per_second']} files/s)"
+    )
+    try:
+        pipeline_status = await get_namespace_data("pipeline_status")
+        async with get_pipeline_status_lock():
+            pipeline_status["enqueue_progress"] = progress
+            pipeline_status["latest_message"] = message
+            pipeline_status["history_messages"].append(message)
+    except Exception as e:
+        logger.debug(f"Could not update pipeline status with enqueue progress: {e}")
+    logger.info(message)
+
+
 async def pipeline_index_files(
     rag: LightRAG, file_paths: List[Path], track_id: str = None
 ):
-    """Index multiple files sequentially to avoid high CPU load
+    """Index multiple files through a bounded concurrent enqueue pipeline
+
+    Up to ``MAX_PARALLEL_ENQUEUE`` files are read, extracted, hashed and
+    enqueued at the same time; CPU heavy extraction is further bounded by the
+    extraction worker pool. Throughput is reported in pipeline_status under
+    ``enqueue_progress``.
 
     Args:
         rag: LightRAG instance
@@ -1374,21 +1374,36 @@ async def pipeline_index_files(
     if not file_paths:
         return
     try:
-        enqueued = False
-
         # Use get_pinyin_sort_key for Chinese pinyin sorting
         sorted_file_paths = sorted(
             file_paths, key=lambda p: get_pinyin_sort_key(str(p))
         )
+        total = len(sorted_file_paths)
+        pending = iter(sorted_file_paths)
+        counts = {"enqueued": 0, "failed": 0}
+        start_time = time.perf_counter()
+        last_report = start_time
+
+        async def worker():
+            nonlocal last_report
+            for file_path in pending:
+                success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
+                counts["enqueued" if success else "failed"] += 1
+                now = time.perf_counter()
+                if now - last_report >= ENQUEUE_PROGRESS_INTERVAL:
+                    last_report = now
+                    await _report_enqueue_progress(
+                        total, counts["enqueued"], counts["failed"], start_time
+                    )
 
-        # Process files sequentially with track_id
-        for file_path in sorted_file_paths:
-            success, _ = await pipeline_enqueue_file(rag, file_path, track_id)
-            if success:
-                enqueued = True
+        concurrency = max(1, min(global_args.max_parallel_enqueue, total))
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        await _report_enqueue_progress(
+            total, counts["enqueued"], counts["failed"], start_time
+        )
 
         # Process the queue only if at least one file was successfully enqueued
-        if enqueued:
+        if counts["enqueued"]:
             await rag.apipeline_process_enqueue_documents()
     except Exception as e:
         logger.error(f"Error indexing files: {str(e)}")
@@ -1443,9 +1458,14 @@ async def run_scanning_process(
             valid_files = []
             processed_files = []
 
+            # Resolve all file names against doc status in one batched lookup
+            existing_docs = await rag.doc_status.get_docs_by_file_paths(
+                [file_path.name for file_path in new_files]
+            )
+
             for file_path in new_files:
                 filename = file_path.name
-                existing_doc_data = await rag.doc_status.get_doc_by_file_path(filename)
+                existing_doc_data = existing_docs.get(filename)
 
                 if existing_doc_data and existing_doc_data.get("status") == "processed":
                     # File is already PROCESSED, skip it with warning
@@ -1497,10 +1517,19 @@ async def background_delete_documents(
     pipeline_status = await get_namespace_data("pipeline_status")
     pipeline_status_lock = get_pipeline_status_lock()
 
+    doc_ids = list(dict.fromkeys(doc_ids))
     total_docs = len(doc_ids)
     successful_deletions = []
     failed_deletions = []
 
+    # Delete in bounded batches, each with one analysis, rebuild and persist
+    # pass; a failing batch only fails its own documents
+    batch_size = max(1, global_args.delete_batch_size)
+    batches = [
+        doc_ids[start : start + batch_size]
+        for start in range(0, total_docs, batch_size)
+    ]
+
     # Double-check pipeline status before proceeding
     async with pipeline_status_lock:
         if pipeline_status.get("busy", False):
@@ -1514,7 +1543,7 @@ async def background_delete_documents(
                 "job_name": f"Deleting {total_docs} Documents",
                 "job_start": datetime.now().isoformat(),
                 "docs": total_docs,
-                "batchs": total_docs,
+                "batchs": len(batches),
                 "cur_batch": 0,
                 "latest_message": "Starting document deletion process",
             }
@@ -1523,158 +1552,180 @@ async def background_delete_documents(
         pipeline_status["history_messages"][:] = ["Starting document deletion process"]
 
     try:
-        # Loop through each document ID and delete them one by one
-        for i, doc_id in enumerate(doc_ids, 1):
+        processed = 0
+        for batch_number, batch_ids in enumerate(batches, 1):
+            batch_msg = f"Deleting batch {batch_number}/{len(batches)}: {len(batch_ids)} documents"
+            logger.info(batch_msg)
             async with pipeline_status_lock:
-                start_msg = f"Deleting document {i}/{total_docs}: {doc_id}"
-                logger.info(start_msg)
-                pipeline_status["cur_batch"] = i
-                pipeline_status["latest_message"] = start_msg
-                pipeline_status["history_messages"].append(start_msg)
+                pipeline_status["cur_batch"] = batch_number
+                pipeline_status["latest_message"] = batch_msg
+                pipeline_status["history_messages"].append(batch_msg)
 
-            file_path = "#"
             try:
-                result = await rag.adelete_by_doc_id(doc_id)
-                file_path = (
-                    getattr(result, "file_path", "-") if "result" in locals() else "-"
-                )
-                if result.status == "success":
-                    successful_deletions.append(doc_id)
-                    success_msg = (
-                        f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
+                results = await rag.adelete_by_doc_ids(batch_ids)
+            except Exception as e:
+                logger.error(traceback.format_exc())
+                results = [
+                    DeletionResult(
+                        status="fail",
+                        doc_id=doc_id,
+                        message=f"Deletion batch failed: {e}",
+                        status_code=500,
                     )
-                    logger.info(success_msg)
-                    async with pipeline_status_lock:
-                        pipeline_status["history_messages"].append(success_msg)
+                    for doc_id in batch_ids
+                ]
 
-                    # Handle file deletion if requested and file_path is available
-                    if (
-                        delete_file
-                        and result.file_path
-                        and result.file_path != "unknown_source"
-                    ):
-                        try:
-                            deleted_files = []
-                            # SECURITY FIX: Use secure path validation to prevent arbitrary file deletion
-                            safe_file_path = validate_file_path_security(
-                                result.file_path, doc_manager.input_dir
-                            )
+            for i, (doc_id, result) in enumerate(
+                zip(batch_ids, results), processed + 1
+            ):
+                file_path = "#"
+                try:
+                    file_path = getattr(result, "file_path", "-")
+                    if result.status == "success":
+                        successful_deletions.append(doc_id)
+                        success_msg = (
+                            f"Document deleted {i}/{total_docs}: {doc_id}[{file_path}]"
+                        )
+                        logger.info(success_msg)
+                        async with pipeline_status_lock:
+                            pipeline_status["history_messages"].append(success_msg)
+
+                        # Handle file deletion if requested and file_path is available
+                        if (
+                            delete_file
+                            and result.file_path
+                            and result.file_path != "unknown_source"
+                        ):
+                            try:
+                                deleted_files = []
+                                # SECURITY FIX: Use secure path validation to prevent arbitrary file deletion
+                                safe_file_path = validate_file_path_security(
+                                    result.file_path, doc_manager.input_dir
+                                )
 
-                            if safe_file_path is None:
-                                # Security violation detected - log and skip file deletion
-                                security_msg = f"Security violation: Unsafe file path detected for deletion - {result.file_path}"
-                                logger.warning(security_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = security_msg
-                                    pipeline_status["history_messages"].append(
-                                        security_msg
-                                    )
-                            else:
-                                # check and delete files from input_dir directory
-                                if safe_file_path.exists():
-                                    try:
-                                        safe_file_path.unlink()
-                                        deleted_files.append(safe_file_path.name)
-                                        file_delete_msg = f"Successfully deleted input_dir file: {result.file_path}"
-                                        logger.info(file_delete_msg)
-                                        async with pipeline_status_lock:
-                                            pipeline_status["latest_message"] = (
-                                                file_delete_msg
-                                            )
-                                            pipeline_status["history_messages"].append(
-                                                file_delete_msg
-                                            )
-                                    except Exception as file_error:
-                                        file_error_msg = f"Failed to delete input_dir file {result.file_path}: {str(file_error)}"
-                                        logger.debug(file_error_msg)
-                                        async with pipeline_status_lock:
-                                            pipeline_status["latest_message"] = (
-                                                file_error_msg
-                                            )
-                                            pipeline_status["history_messages"].append(
-                                                file_error_msg
-                                            )
+                                if safe_file_path is None:
+                                    # Security violation detected - log and skip file deletion
+                                    security_msg = f"Security violation: Unsafe file path detected for deletion - {result.file_path}"
+                                    logger.warning(security_msg)
+                                    async with pipeline_status_lock:
+                                        pipeline_status["latest_message"] = security_msg
+                                        pipeline_status["history_messages"].append(
+                                            security_msg
+                                        )
+                                else:
+                                    # check and delete files from input_dir directory
+                                    if safe_file_path.exists():
+                                        try:
+                                            safe_file_path.unlink()
+                                            deleted_files.append(safe_file_path.name)
+                                            file_delete_msg = f"Successfully deleted input_dir file: {result.file_path}"
+                                            logger.info(file_delete_msg)
+                                            async with pipeline_status_lock:
+                                                pipeline_status["latest_message"] = (
+                                                    file_delete_msg
+                                                )
+                                                pipeline_status[
+                                                    "history_messages"
+                                                ].append(file_delete_msg)
+                                        except Exception as file_error:
+                                            file_error_msg = f"Failed to delete input_dir file {result.file_path}: {str(file_error)}"
+                                            logger.debug(file_error_msg)
+                                            async with pipeline_status_lock:
+                                                pipeline_status["latest_message"] = (
+                                                    file_error_msg
+                                                )
+                                                pipeline_status[
+                                                    "history_messages"
+                                                ].append(file_error_msg)
 
-                                # Also check and delete files from __enqueued__ directory
-                                enqueued_dir = doc_manager.input_dir / "__enqueued__"
-                                if enqueued_dir.exists():
-                                    # SECURITY FIX: Validate that the file path is safe before processing
-                                    # Only proceed if the original path validation passed
-                                    base_name = Path(result.file_path).stem
-                                    extension = Path(result.file_path).suffix
-
-                                    # Search for exact match and files with numeric suffixes
-                                    for enqueued_file in enqueued_dir.glob(
-                                        f"{base_name}*{extension}"
-                                    ):
-                                        # Additional security check: ensure enqueued file is within enqueued directory
-                                        safe_enqueued_path = (
-                                            validate_file_path_security(
-                                                enqueued_file.name, enqueued_dir
+                                    # Also check and delete files from __enqueued__ directory
+                                    enqueued_dir = (
+                                        doc_manager.input_dir / "__enqueued__"
+                                    )
+                                    if enqueued_dir.exists():
+                                        # SECURITY FIX: Validate that the file path is safe before processing
+                                        # Only proceed if the original path validation passed
+                                        base_name = Path(result.file_path).stem
+                                        extension = Path(result.file_path).suffix
+
+                                        # Search for exact match and files with numeric suffixes
+                                        for enqueued_file in enqueued_dir.glob(
+                                            f"{base_name}*{extension}"
+                                        ):
+                                            # Additional security check: ensure enqueued file is within enqueued directory
+                                            safe_enqueued_path = (
+                                                validate_file_path_security(
+                                                    enqueued_file.name, enqueued_dir
+                                                )
                                             )
+                                            if safe_enqueued_path is not None:
+                                                try:
+                                                    enqueued_file.unlink()
+                                                    deleted_files.append(
+                                                        enqueued_file.name
+                                                    )
+                                                    logger.info(
+                                                        f"Successfully deleted enqueued file: {enqueued_file.name}"
+                                                    )
+                                                except Exception as enqueued_error:
+                                                    file_error_msg = f"Failed to delete enqueued file {enqueued_file.name}: {str(enqueued_error)}"
+                                                    logger.debug(file_error_msg)
+                                                    async with pipeline_status_lock:
+                                                        pipeline_status[
+                                                            "latest_message"
+                                                        ] = file_error_msg
+                                                        pipeline_status[
+                                                            "history_messages"
+                                                        ].append(file_error_msg)
+                                            else:
+                                                security_msg = f"Security violation: Unsafe enqueued file path detected - {enqueued_file.name}"
+                                                logger.warning(security_msg)
+
+                                if deleted_files == []:
+                                    file_error_msg = f"File deletion skipped, missing or unsafe file: {result.file_path}"
+                                    logger.warning(file_error_msg)
+                                    async with pipeline_status_lock:
+                                        pipeline_status["latest_message"] = (
+                                            file_error_msg
                                         )
-                                        if safe_enqueued_path is not None:
-                                            try:
-                                                enqueued_file.unlink()
-                                                deleted_files.append(enqueued_file.name)
-                                                logger.info(
-                                                    f"Successfully deleted enqueued file: {enqueued_file.name}"
-                                                )
-                                            except Exception as enqueued_error:
-                                                file_error_msg = f"Failed to delete enqueued file {enqueued_file.name}: {str(enqueued_error)}"
-                                                logger.debug(file_error_msg)
-                                                async with pipeline_status_lock:
-                                                    pipeline_status[
-                                                        "latest_message"
-                                                    ] = file_error_msg
-                                                    pipeline_status[
-                                                        "history_messages"
-                                                    ].append(file_error_msg)
-                                        else:
-                                            security_msg = f"Security violation: Unsafe enqueued file path detected - {enqueued_file.name}"
-                                            logger.warning(security_msg)
-
-                            if deleted_files == []:
-                                file_error_msg = f"File deletion skipped, missing or unsafe file: {result.file_path}"
-                                logger.warning(file_error_msg)
+                                        pipeline_status["history_messages"].append(
+                                            file_error_msg
+                                        )
+
+                            except Exception as file_error:
+                                file_error_msg = f"Failed to delete file {result.file_path}: {str(file_error)}"
+                                logger.error(file_error_msg)
                                 async with pipeline_status_lock:
                                     pipeline_status["latest_message"] = file_error_msg
                                     pipeline_status["history_messages"].append(
                                         file_error_msg
                                     )
-
-                        except Exception as file_error:
-                            file_error_msg = f"Failed to delete file {result.file_path}: {str(file_error)}"
-                            logger.error(file_error_msg)
+                        elif delete_file:
+                            no_file_msg = (
+                                f"File deletion skipped, missing file path: {doc_id}"
+                            )
+                            logger.warning(no_file_msg)
                             async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = file_error_msg
-                                pipeline_status["history_messages"].append(
-                                    file_error_msg
-                                )
-                    elif delete_file:
-                        no_file_msg = (
-                            f"File deletion skipped, missing file path: {doc_id}"
-                        )
-                        logger.warning(no_file_msg)
+                                pipeline_status["latest_message"] = no_file_msg
+                                pipeline_status["history_messages"].append(no_file_msg)
+                    else:
+                        failed_deletions.append(doc_id)
+                        error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
+                        logger.error(error_msg)
                         async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = no_file_msg
-                            pipeline_status["history_messages"].append(no_file_msg)
-                else:
+                            pipeline_status["latest_message"] = error_msg
+                            pipeline_status["history_messages"].append(error_msg)
+
+                except Exception as e:
                     failed_deletions.append(doc_id)
-                    error_msg = f"Failed to delete {i}/{total_docs}: {doc_id}[{file_path}] - {result.message}"
+                    error_msg = f"Error deleting document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
                     logger.error(error_msg)
+                    logger.error(traceback.format_exc())
                     async with pipeline_status_lock:
                         pipeline_status["latest_message"] = error_msg
                         pipeline_status["history_messages"].append(error_msg)
 
-            except Exception as e:
-                failed_deletions.append(doc_id)
-                error_msg = f"Error deleting document {i}/{total_docs}: {doc_id}[{file_path}] - {str(e)}"
-                logger.error(error_msg)
-                logger.error(traceback.format_exc())
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = error_msg
-                    pipeline_status["history_messages"].append(error_msg)
+            processed += len(batch_ids)
 
     except Exception as e:
         error_msg = f"Critical error during batch deletion: {str(e)}"
@@ -2149,6 +2200,8 @@ def create_document_routes(
                 - latest_message (str): Latest message from pipeline processing
                 - history_messages (List[str], optional): List of history messages (limited to latest 1000 entries,
                   with truncation message if more than 1000 messages exist)
+                - stages (dict, optional): Per-stage queue depth, active workers, completed and
+                  failed counts and throughput of the ingestion pipeline
 
         Raises:
             HTTPException: If an error occurs while retrieving pipeline status (500)
@@ -2181,6 +2234,7 @@ def create_document_routes(
 
             # Add processed update_status to the status dictionary
             status_dict["update_status"] = processed_update_status
+            status_dict["extraction_pool"] = get_extraction_pool().stats()
 
             # Convert history_messages to a regular list if it's a Manager.list
             # and limit to latest 1000 entries with truncation message if needed
@@ -3,8 +3,10 @@ This module contains all graph-related routes for the LightRAG API.
 """
 
 from typing import Optional, Dict, Any
+import json
 import traceback
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from lightrag.utils import logger
@@ -160,6 +162,10 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
         label: str = Query(..., description="Label to get knowledge graph for"),
         max_depth: int = Query(3, description="Maximum depth of graph", ge=1),
         max_nodes: int = Query(1000, description="Maximum nodes to return", ge=1),
+        stream: bool = Query(
+            False,
+            description="Stream the graph as NDJSON batches while nodes are found",
+        ),
     ):
         """
         Retrieve a connected subgraph of nodes where the label includes the specified label.
@@ -171,6 +177,11 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
             label (str): Label of the starting node
             max_depth (int, optional): Maximum depth of the subgraph,Defaults to 3
             max_nodes: Maxiumu nodes to return
+            stream (bool, optional): Return `application/x-ndjson` instead of a single
+                JSON object. Each line is a partial graph `{"nodes": [...], "edges": [...],
+                "is_truncated": false}`; every edge arrives with or after both of its
+                nodes and only the last line carries the real is_truncated flag.
+                Errors during streaming are sent as `{"error": "..."}`.
 
         Returns:
             Dict[str, List[str]]: Knowledge graph for label
@@ -181,6 +192,32 @@ def create_graph_routes(rag, api_key: Optional[str] = None):
                 f"get_knowledge_graph called with label: '{label}' (length: {len(label)}, repr: {repr(label)})"
             )
 
+            if stream:
+
+                async def stream_generator():
+                    try:
+                        async for batch in rag.iter_knowledge_graph(
+                            node_label=label,
+                            max_depth=max_depth,
+                            max_nodes=max_nodes,
+                        ):
+                            yield f"{batch.model_dump_json()}\n"
+                    except Exception as e:
+                        logger.error(
+                            f"Error streaming knowledge graph for label '{label}': {str(e)}"
+                        )
+                        yield f"{json.dumps({'error': str(e)})}\n"
+
+                return StreamingResponse(
+                    stream_generator(),
+                    media_type="application/x-ndjson",
+                    headers={
+                        "Cache-Control": "no-cache",
+                        "Content-Type": "application/x-ndjson",
+                        "X-Accel-Buffering": "no",  # Ensure proper handling of streaming response when proxied by Nginx
+                    },
+                )
+
             return await rag.get_knowledge_graph(
                 node_label=label,
                 max_depth=max_depth,
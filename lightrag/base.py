@@ -25,6 +25,7 @@ from .constants import (
     DEFAULT_MAX_ENTITY_TOKENS,
     DEFAULT_MAX_RELATION_TOKENS,
     DEFAULT_MAX_TOTAL_TOKENS,
+    DEFAULT_RETRIEVAL_LEG_TIMEOUT,
     DEFAULT_HISTORY_TURNS,
     DEFAULT_OLLAMA_MODEL_NAME,
     DEFAULT_OLLAMA_MODEL_TAG,
@@ -130,6 +131,13 @@ class QueryParam:
     )
     """Maximum total tokens budget for the entire query context (entities + relations + chunks + system prompt)."""
 
+    retrieval_leg_timeout: float = float(
+        os.getenv("RETRIEVAL_LEG_TIMEOUT", str(DEFAULT_RETRIEVAL_LEG_TIMEOUT))
+    )
+    """Maximum seconds for each concurrent retrieval leg (local entities, global relations, vector chunks).
+    A leg that times out contributes no results instead of stalling the query. 0 disables the timeout.
+    """
+
     hl_keywords: list[str] = field(default_factory=list)
     """List of high-level keywords to prioritize in retrieval."""
 
@@ -666,6 +674,19 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             indicating whether the graph was truncated due to max_nodes limit
         """
 
+    async def iter_knowledge_graph(
+        self, node_label: str, max_depth: int = 3, max_nodes: int = 1000
+    ) -> AsyncIterator[KnowledgeGraph]:
+        """Stream the subgraph of `get_knowledge_graph` as partial KnowledgeGraph batches.
+
+        Every node and edge appears in exactly one batch, and each edge is sent
+        in the same batch as, or after, both of its endpoints. Only the final
+        batch carries the is_truncated flag. Storages that can explore
+        incrementally should override this; the default sends the whole result
+        as a single batch.
+        """
+        yield await self.get_knowledge_graph(node_label, max_depth, max_nodes)
+
     @abstractmethod
     async def get_all_nodes(self) -> list[dict]:
         """Get all nodes in the graph.
@@ -807,6 +828,28 @@ class DocStatusStorage(BaseKVStorage, ABC):
             Returns the same format as get_by_ids method
         """
 
+    async def get_docs_by_file_paths(
+        self, file_paths: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get documents for many file paths at once
+
+        Storage backends should override this with a single batched lookup;
+        the default falls back to one get_doc_by_file_path call per path.
+
+        Args:
+            file_paths: The file paths to search for
+
+        Returns:
+            dict[str, dict[str, Any]]: Document data keyed by file path, paths
+            without a document are omitted
+        """
+        result = {}
+        for file_path in dict.fromkeys(file_paths):
+            doc = await self.get_doc_by_file_path(file_path)
+            if doc is not None:
+                result[file_path] = doc
+        return result
+
 
 class StoragesStatus(str, Enum):
     """Storages status"""
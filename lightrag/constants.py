@@ -22,6 +22,8 @@ DEFAULT_SUMMARY_MAX_TOKENS = 1200
 DEFAULT_SUMMARY_LENGTH_RECOMMENDED = 600
 # Maximum token size sent to LLM for summary
 DEFAULT_SUMMARY_CONTEXT_SIZE = 12000
+# Maximum map-reduce rounds when summarizing a very long description list
+DEFAULT_SUMMARY_MAX_REDUCE_DEPTH = 5
 # Default entities to extract if ENTITY_TYPES is not specified in .env
 DEFAULT_ENTITY_TYPES = [
     "Person",
@@ -49,6 +51,10 @@ DEFAULT_MAX_TOTAL_TOKENS = 30000
 DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 5
 DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
+# Number of token counts memoized per tokenizer for context truncation
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 50000
+# Max seconds for each retrieval leg (local/global/vector), 0 disables the timeout
+DEFAULT_RETRIEVAL_LEG_TIMEOUT = 60
 
 # TODO: Deprated. All conversation_history messages is send to LLM.
 DEFAULT_HISTORY_TURNS = 0
@@ -66,10 +72,36 @@ DEFAULT_TEMPERATURE = 1.0
 # Async configuration defaults
 DEFAULT_MAX_ASYNC = 4  # Default maximum async operations
 DEFAULT_MAX_PARALLEL_INSERT = 2  # Default maximum parallel insert operations
+DEFAULT_PIPELINE_QUEUE_SIZE = 4  # Documents waiting in front of each ingestion stage
 
 # Embedding configuration defaults
 DEFAULT_EMBEDDING_FUNC_MAX_ASYNC = 8  # Default max async for embedding functions
 DEFAULT_EMBEDDING_BATCH_NUM = 10  # Default batch size for embedding computations
+DEFAULT_MERGE_VDB_BATCH_UPSERT = True  # Bulk upsert vectors after merging
+
+# Semantic query cache defaults (see LightRAG.embedding_cache_config)
+DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES = 1000  # LRU eviction beyond this size
+DEFAULT_SEMANTIC_CACHE_TTL = 3600  # Seconds, 0 keeps entries until evicted
+
+# Shared HTTP client pool defaults (see lightrag.llm.client_registry)
+DEFAULT_HTTP_MAX_CONNECTIONS = 100  # Max open connections per client
+DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20  # Idle connections kept alive
+DEFAULT_HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept
+
+# Files read, extracted and enqueued concurrently by the API directory scanner
+DEFAULT_MAX_PARALLEL_ENQUEUE = 8
+
+# Documents deleted per adelete_by_doc_ids call by the API delete endpoint
+DEFAULT_DELETE_BATCH_SIZE = 20
+
+# Document text extraction worker pool defaults (API server uploads)
+DEFAULT_EXTRACTION_MAX_WORKERS = 2  # Concurrent extraction processes
+DEFAULT_EXTRACTION_TIMEOUT = 600  # Seconds per file, 0 disables the timeout
+DEFAULT_EXTRACTION_MEMORY_LIMIT_MB = 0  # Per worker address space, 0 disables
+
+# Rows per executemany round trip and transaction for PostgreSQL bulk upserts
+DEFAULT_POSTGRES_UPSERT_BATCH_SIZE = 500
 
 # Gunicorn worker timeout
 DEFAULT_TIMEOUT = 300
@@ -0,0 +1,139 @@
+"""
+Cross-process change feed for file backed storages.
+
+In multi-worker mode a flush in one worker sets the update flags of all other
+workers, which used to make each of them re-read and re-parse the whole
+storage file. The writing worker now also appends the changes of the flush to
+a delta log next to the storage file, and the other workers replay only the
+records written since their last sync.
+
+The position of a reader is ``(epoch, offset)``. The epoch lives in shared
+storage and is bumped whenever the log is truncated (it grew past
+``STORAGE_DELTA_LOG_MAX_MB``, or the storage was dropped); a reader holding
+an older epoch falls back to a full reload. All methods must be called while
+holding the storage lock, which also serializes the storage file writes.
+
+Records are written as JSON lines, numpy arrays as base64 encoded buffers, so
+reading the log never executes code.
+"""
+
+import base64
+import json
+import os
+from typing import Any
+
+import numpy as np
+
+from lightrag.utils import logger
+from .shared_storage import get_namespace_data, is_multiprocess
+
+# Truncate the delta log once it grows past this size; lagging readers reload fully
+DELTA_LOG_MAX_BYTES = int(os.getenv("STORAGE_DELTA_LOG_MAX_MB", "256")) * 1024 * 1024
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return {
+            "__ndarray__": base64.b64encode(np.ascontiguousarray(value)).decode(
+                "ascii"
+            ),
+            "dtype": value.dtype.str,
+            "shape": list(value.shape),
+        }
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in the delta log")
+
+
+def _decode_object(obj: dict) -> Any:
+    if "__ndarray__" in obj:
+        return np.frombuffer(
+            bytearray(base64.b64decode(obj["__ndarray__"])),
+            dtype=np.dtype(obj["dtype"]),
+        ).reshape(obj["shape"])
+    return obj
+
+
+class SharedDeltaLog:
+    """Append-only log of flushed changes replayed by the other worker processes
+
+    Args:
+        namespace: Final namespace of the storage, used for the shared epoch.
+        file_name: Path of the delta log file.
+        workspace: Workspace name used in log messages.
+    """
+
+    def __init__(self, namespace: str, file_name: str, workspace: str = "_"):
+        self.namespace = namespace
+        self.file_name = file_name
+        self.workspace = workspace
+        self.enabled = False
+        self._meta = None
+
+    async def initialize(self) -> None:
+        # Only worker processes sharing the data need a change feed
+        self.enabled = is_multiprocess()
+        if self.enabled:
+            self._meta = await get_namespace_data(f"{self.namespace}_delta_log")
+
+    def _epoch(self) -> int:
+        if "epoch" not in self._meta:
+            # First use since the server started, records of a previous run are stale
+            self._remove_file()
+            self._meta["epoch"] = 0
+        return self._meta["epoch"]
+
+    def _remove_file(self) -> None:
+        if os.path.exists(self.file_name):
+            os.remove(self.file_name)
+
+    def _size(self) -> int:
+        return os.path.getsize(self.file_name) if os.path.exists(self.file_name) else 0
+
+    def position(self) -> tuple[int, int] | None:
+        """Current end of the log, i.e. the position of a fully synced reader"""
+        if not self.enabled:
+            return None
+        return self._epoch(), self._size()
+
+    def reset(self) -> None:
+        """Discard all records; readers will reload the storage file instead"""
+        if not self.enabled:
+            return
+        self._meta["epoch"] = self._epoch() + 1
+        self._remove_file()
+
+    def publish(self, record: Any) -> None:
+        """Append the changes of one flush"""
+        if not self.enabled:
+            return
+        self._epoch()
+        if self._size() > DELTA_LOG_MAX_BYTES:
+            self.reset()
+        line = json.dumps(record, default=_encode_value, ensure_ascii=False) + "\n"
+        with open(self.file_name, "ab") as f:
+            f.write(line.encode("utf-8"))
+
+    def read_since(self, position: tuple[int, int] | None) -> list[Any] | None:
+        """Records appended after ``position``, or None if a full reload is needed"""
+        if not self.enabled or position is None:
+            return None
+        epoch, offset = position
+        if epoch != self._epoch() or offset > self._size():
+            return None
+        records = []
+        try:
+            with open(self.file_name, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    records.append(json.loads(line, object_hook=_decode_object))
+        except FileNotFoundError:
+            return records if offset == 0 else None
+        except Exception as e:
+            logger.warning(
+                f"[{self.workspace}] Unreadable delta log {self.file_name}, reloading: {e}"
+            )
+            return None
+        return records
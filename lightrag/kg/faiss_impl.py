@@ -1,6 +1,7 @@
 import os
 import time
 import asyncio
+import random
 from typing import Any, final
 import json
 import numpy as np
@@ -9,6 +10,7 @@ from dataclasses import dataclass
 from lightrag.utils import logger, compute_mdhash_id
 from lightrag.base import BaseVectorStorage
 
+from .delta_log import SharedDeltaLog
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
@@ -18,6 +20,9 @@ from .shared_storage import (
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Supported approximate index types for vector_db_storage_cls_kwargs["index_type"]
+ANN_INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+
 
 @final
 @dataclass
@@ -25,6 +30,23 @@ class FaissVectorDBStorage(BaseVectorStorage):
     """
     A Faiss-based Vector DB Storage for LightRAG.
     Uses cosine similarity by storing normalized vectors in a Faiss index with inner product search.
+
+    The exact IndexFlatIP index is always kept as the source of truth. An optional
+    approximate (ANN) index can be selected through vector_db_storage_cls_kwargs:
+    - index_type: "flat" (default), "hnsw", "ivf_flat" or "ivf_pq"
+    - hnsw_m / ef_construction / ef_search: HNSW graph degree and search depth
+    - nlist / nprobe: IVF cell count (default 4*sqrt(n)) and cells visited per query
+    - pq_m / pq_nbits: IVF-PQ sub-quantizers (must divide the dimension) and bits per code
+    - ann_min_vectors: vector count before the ANN index is first built (default 10000)
+    - ann_rebuild_ratio: ratio of stale ANN entries triggering a rebuild (default 0.2)
+    - ann_rebuild_max_stale: stale ANN entries triggering a rebuild regardless of the
+      ratio (default 10000)
+
+    The ANN index is trained in a worker thread, so queries keep using the previous
+    index (or exact search) until the new one is swapped in. HNSW cannot remove
+    vectors: removed IDs stay in the graph as stale entries, excluded from searches
+    with an IDSelector until the next rebuild. A rebuilt index is written to disk and
+    announced in the delta log, so the other workers load it instead of keeping theirs.
     """
 
     def __post_init__(self):
@@ -60,14 +82,42 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
-        # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
-        # Keep a local store for metadata, IDs, etc.
-        # Maps <int faiss_id> → metadata (including your original ID).
-        self._id_to_meta = {}
+        # Approximate index configuration
+        self._index_type = kwargs.get("index_type", "flat")
+        if self._index_type not in ANN_INDEX_TYPES:
+            raise ValueError(
+                f"index_type must be one of {ANN_INDEX_TYPES}, got '{self._index_type}'"
+            )
+        self._hnsw_m = int(kwargs.get("hnsw_m", 32))
+        self._ef_construction = int(kwargs.get("ef_construction", 200))
+        self._ef_search = int(kwargs.get("ef_search", 64))
+        self._nlist = kwargs.get("nlist")
+        self._nprobe = int(kwargs.get("nprobe", 16))
+        self._pq_m = int(kwargs.get("pq_m", 16))
+        self._pq_nbits = int(kwargs.get("pq_nbits", 8))
+        if self._index_type == "ivf_pq" and self._dim % self._pq_m != 0:
+            raise ValueError(
+                f"pq_m ({self._pq_m}) must divide the embedding dimension ({self._dim})"
+            )
+        self._ann_min_vectors = int(kwargs.get("ann_min_vectors", 10000))
+        self._ann_rebuild_ratio = float(kwargs.get("ann_rebuild_ratio", 0.2))
+        self._ann_rebuild_max_stale = int(kwargs.get("ann_rebuild_max_stale", 10000))
+        self._ann_index_file = os.path.join(
+            workspace_dir, f"faiss_index_{self.namespace}.{self._index_type}.index"
+        )
+        self._rebuild_task: asyncio.Task | None = None
+        self._index_generation = 0
+
+        # Changes since the last flush, published for the other workers on save
+        self._delta_log = SharedDeltaLog(
+            self.final_namespace,
+            os.path.join(workspace_dir, f"faiss_index_{self.namespace}.delta"),
+            self.workspace,
+        )
+        self._pending_ops: list[tuple[str, Any]] = []
+        self._delta_position = None
 
+        self._reset_index()
         self._load_faiss_index()
 
     async def initialize(self):
@@ -75,24 +125,63 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Get the update flag for cross-process update notification
         self.storage_updated = await get_update_flag(self.final_namespace)
         # Get the storage lock for use in other methods
-        self._storage_lock = get_storage_lock()
+        self._storage_lock = get_storage_lock(namespace=self.final_namespace)
+        await self._delta_log.initialize()
+        async with self._storage_lock:
+            self._delta_position = self._delta_log.position()
+
+    async def finalize(self):
+        """Wait for a running background ANN rebuild before shutting down"""
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            await asyncio.gather(self._rebuild_task, return_exceptions=True)
 
     async def _get_index(self):
         """Check if the shtorage should be reloaded"""
+        # Lock-free fast path: only a flush by another process requires a reload
+        if not self.storage_updated.value:
+            return self._index
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
             # Check if storage was updated by another process
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-                self._load_faiss_index()
+                self._sync_from_other_process()
                 self.storage_updated.value = False
             return self._index
 
+    def _sync_from_other_process(self) -> None:
+        """Catch up with another worker's flush; caller must hold the storage lock"""
+        # Replayed records reuse the writer's Faiss ids, which may collide with ids
+        # this worker handed out to its own unflushed upserts
+        records = (
+            None
+            if self._pending_ops
+            else self._delta_log.read_since(self._delta_position)
+        )
+        if records is not None:
+            reload_ann = False
+            for ops in records:
+                for op, payload in ops:
+                    if op == "add":
+                        self._add_vectors(self._index, *payload)
+                    elif op == "remove":
+                        self._remove_vectors(payload)
+                    else:
+                        # The writer rebuilt its ANN index, the file matches the log end
+                        reload_ann = True
+            if reload_ann:
+                self._load_ann_index()
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} FAISS applied {len(records)} {self.namespace} updates from another process"
+            )
+        else:
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
+            )
+            self._reset_index()
+            self._load_faiss_index()
+            self._pending_ops.clear()
+        self._delta_position = self._delta_log.position()
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
         Insert or update vectors in the Faiss index.
@@ -152,9 +241,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Upsert logic:
         # 1. Identify which vectors to remove if they exist
         # 2. Remove them
-        # 3. Add the new vectors
+        # 3. Add the new vectors under fresh Faiss IDs
+        index = await self._get_index()
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -163,16 +253,14 @@ class FaissVectorDBStorage(BaseVectorStorage):
             await self._remove_faiss_ids(existing_ids_to_remove)
 
         # Step 2: Add new vectors
-        index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
-
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+        fids = np.arange(
+            self._next_fid, self._next_fid + len(list_data), dtype=np.int64
+        )
+        self._next_fid += len(list_data)
+        # Step 3: Store metadata for each new ID, vectors live in the index only
+        self._add_vectors(index, fids, embeddings, list_data)
+        if self._delta_log.enabled:
+            self._pending_ops.append(("add", (fids, embeddings, list_data)))
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -198,7 +286,15 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         # Perform the similarity search
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        ann_index = self._ann_index
+        if ann_index is not None and ann_index.ntotal > 0:
+            distances, indices = ann_index.search(
+                embedding,
+                min(top_k, ann_index.ntotal),
+                params=self._ann_search_params(),
+            )
+        else:
+            distances, indices = index.search(embedding, top_k)
 
         distances = distances[0]
         indices = indices[0]
@@ -213,12 +309,12 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if dist < self.cosine_better_than_threshold:
                 continue
 
-            meta = self._id_to_meta.get(idx, {})
-            # Filter out __vector__ from query results to avoid returning large vector data
-            filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
+            meta = self._id_to_meta.get(int(idx))
+            if meta is None:
+                continue
             results.append(
                 {
-                    **filtered_meta,
+                    **meta,
                     "id": meta.get("__id__"),
                     "distance": float(dist),
                     "created_at": meta.get("__created_at__"),
@@ -277,10 +373,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
            KG-storage-log should be used to avoid data corruption
         """
         logger.debug(f"[{self.workspace}] Searching relations for entity {entity_name}")
-        relations = []
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("src_id") == entity_name or meta.get("tgt_id") == entity_name:
-                relations.append(fid)
+        await self._get_index()
+        relations = list(self._entity_to_fids.get(entity_name, ()))
 
         logger.debug(
             f"[{self.workspace}] Found {len(relations)} relations for {entity_name}"
@@ -295,39 +389,345 @@ class FaissVectorDBStorage(BaseVectorStorage):
     # Internal helper methods
     # --------------------------------------------------------------------------------
 
+    def _new_index(self):
+        """
+        Create an empty index for inner product (cosine similarity on normalized vectors).
+        IndexIDMap2 lets us choose the Faiss IDs, remove vectors in place and
+        reconstruct vectors by ID, so no raw vectors need to be kept in metadata.
+        """
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+
+    def _reset_index(self):
+        """Reset the index and all in-memory lookup tables"""
+        self._index = self._new_index()
+        # Maps <int faiss_id> → metadata (including your original ID).
+        self._id_to_meta: dict[int, dict[str, Any]] = {}
+        # Reverse map <custom id> → <int faiss_id>
+        self._custom_id_to_fid: dict[str, int] = {}
+        # Secondary index <entity name> → faiss ids of relations with it as src/tgt
+        self._entity_to_fids: dict[str, set[int]] = {}
+        # Faiss IDs are never reused, so a removed ID cannot alias a new vector
+        self._next_fid = 0
+        # Optional approximate index, built from the flat index
+        self._ann_index = None
+        self._ann_dirty = False
+        # Removed IDs still present in the HNSW graph, and the search parameters
+        # excluding them (rebuilt when the set changes)
+        self._ann_stale: set[int] = set()
+        self._ann_search_state = None
+        # Set when a rebuilt ANN index has not been announced to the other workers
+        self._ann_rebuilt = False
+        # Faiss IDs added while a background rebuild is running
+        self._ann_pending_adds: list[int] | None = None
+        # Invalidates background rebuilds started against the previous state
+        self._index_generation += 1
+
+    def _add_meta(self, fid: int, meta: dict[str, Any]):
+        self._id_to_meta[fid] = meta
+        self._custom_id_to_fid[meta["__id__"]] = fid
+        for key in ("src_id", "tgt_id"):
+            entity_name = meta.get(key)
+            if entity_name is not None:
+                self._entity_to_fids.setdefault(entity_name, set()).add(fid)
+        self._next_fid = max(self._next_fid, fid + 1)
+
+    def _pop_meta(self, fid: int):
+        meta = self._id_to_meta.pop(fid, None)
+        if meta is None:
+            return
+        if self._custom_id_to_fid.get(meta["__id__"]) == fid:
+            del self._custom_id_to_fid[meta["__id__"]]
+        for key in ("src_id", "tgt_id"):
+            fids = self._entity_to_fids.get(meta.get(key))
+            if fids is not None:
+                fids.discard(fid)
+                if not fids:
+                    del self._entity_to_fids[meta[key]]
+
     def _find_faiss_id_by_custom_id(self, custom_id: str):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
 
     async def _remove_faiss_ids(self, fid_list):
         """
-        Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Remove a list of internal Faiss IDs from the index in place.
+        """
+        async with self._storage_lock:
+            self._remove_vectors(fid_list)
+            if self._delta_log.enabled:
+                self._pending_ops.append(("remove", list(fid_list)))
+
+    def _add_vectors(self, index, fids: np.ndarray, embeddings: np.ndarray, metas):
+        index.add_with_ids(embeddings, fids)
+        if self._ann_index is not None:
+            self._ann_index.add_with_ids(embeddings, fids)
+            self._ann_dirty = True
+        if self._ann_pending_adds is not None:
+            self._ann_pending_adds.extend(fids.tolist())
+        for fid, meta in zip(fids.tolist(), metas):
+            self._add_meta(fid, meta)
+
+    def _remove_vectors(self, fid_list):
+        fids = np.asarray(fid_list, dtype=np.int64)
+        self._index.remove_ids(fids)
+        if self._ann_index is not None:
+            self._ann_remove_ids(fids)
+        for fid in fid_list:
+            self._pop_meta(fid)
+
+    # --------------------------------------------------------------------------------
+    # Approximate (ANN) index management
+    # --------------------------------------------------------------------------------
+
+    def _ann_remove_ids(self, fids: np.ndarray):
+        """Remove IDs from the ANN index; HNSW keeps them as stale entries that are
+        excluded from searches and dropped on rebuild"""
+        if self._index_type == "hnsw":
+            self._ann_stale.update(fids.tolist())
+            self._ann_search_state = None
+        else:
+            self._ann_index.remove_ids(fids)
+        self._ann_dirty = True
+
+    def _ann_stale_count(self) -> int:
+        if self._index_type == "hnsw":
+            return len(self._ann_stale)
+        return max(self._ann_index.ntotal - len(self._id_to_meta), 0)
+
+    def _ann_search_params(self):
+        """Search parameters excluding stale HNSW entries, None when there are none"""
+        if not self._ann_stale:
+            return None
+        if self._ann_search_state is None:
+            stale = np.fromiter(
+                self._ann_stale, dtype=np.int64, count=len(self._ann_stale)
+            )
+            batch = faiss.IDSelectorBatch(stale)
+            selector = faiss.IDSelectorNot(batch)
+            params = faiss.SearchParametersHNSW()
+            params.sel = selector
+            params.efSearch = self._ef_search
+            # The parameters only point to the selectors, keep them referenced
+            self._ann_search_state = (params, selector, batch)
+        return self._ann_search_state[0]
+
+    def _set_ann_search_params(self, ann_index):
+        if self._index_type == "hnsw":
+            faiss.downcast_index(ann_index.index).hnsw.efSearch = self._ef_search
+        else:
+            faiss.extract_index_ivf(ann_index).nprobe = self._nprobe
+
+    def _build_ann_index(self, ids: np.ndarray, vectors: np.ndarray):
+        """Create, train and fill an ANN index (CPU bound, runs in a worker thread)"""
+        n = len(vectors)
+        if self._index_type == "hnsw":
+            inner = faiss.IndexHNSWFlat(
+                self._dim, self._hnsw_m, faiss.METRIC_INNER_PRODUCT
+            )
+            inner.hnsw.efConstruction = self._ef_construction
+        else:
+            # Faiss needs ~39 training points per IVF cell
+            nlist = int(self._nlist or 4 * np.sqrt(n))
+            nlist = max(1, min(nlist, n // 39 or 1))
+            if self._index_type == "ivf_flat":
+                description = f"IVF{nlist},Flat"
+            else:
+                description = f"IVF{nlist},PQ{self._pq_m}x{self._pq_nbits}"
+            inner = faiss.index_factory(
+                self._dim, description, faiss.METRIC_INNER_PRODUCT
+            )
+            # Train on a bounded sample
+            train_size = min(n, max(nlist * 256, 2**self._pq_nbits * 64))
+            sample = vectors[np.random.choice(n, train_size, replace=False)]
+            inner.train(sample)
+
+        # IVF indexes store IDs natively; HNSW needs an ID mapping layer
+        ann_index = faiss.IndexIDMap(inner) if self._index_type == "hnsw" else inner
+        ann_index.add_with_ids(vectors, ids)
+        self._set_ann_search_params(ann_index)
+        return ann_index
+
+    def _snapshot_flat(self) -> tuple[np.ndarray, np.ndarray]:
+        """Copy IDs and vectors out of the flat index"""
+        ids = faiss.vector_to_array(self._index.id_map).astype(np.int64)
+        if len(ids) == 0:
+            return ids, np.empty((0, self._dim), dtype=np.float32)
+        vectors = self._index.index.reconstruct_n(0, self._index.ntotal)
+        return ids, vectors
+
+    def _ann_needs_rebuild(self) -> bool:
+        if self._index_type == "flat":
+            return False
+        live = len(self._id_to_meta)
+        if self._ann_index is None:
+            return live >= self._ann_min_vectors
+        return self._ann_stale_count() > min(
+            self._ann_rebuild_ratio * max(live, 1), self._ann_rebuild_max_stale
+        )
+
+    async def rebuild_index(self) -> bool:
+        """Build (or rebuild) the ANN index from the flat index without blocking queries
+
+        The flat index is snapshotted under the storage lock, the ANN index is trained in
+        a worker thread, and vectors added meanwhile are applied before it is swapped in.
+
+        Returns:
+            bool: True if a new ANN index was installed
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
+        if self._index_type == "flat":
+            return False
 
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
+        await self._get_index()
+        async with self._storage_lock:
+            generation = self._index_generation
+            ids, vectors = self._snapshot_flat()
+            self._ann_pending_adds = []
+        if len(ids) == 0:
+            self._ann_pending_adds = None
+            return False
+
+        start = time.perf_counter()
+        try:
+            ann_index = await asyncio.to_thread(self._build_ann_index, ids, vectors)
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Failed to build {self._index_type} index for {self.namespace}: {e}"
+            )
+            if generation == self._index_generation:
+                self._ann_pending_adds = None
+            return False
 
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
+            if generation != self._index_generation:
+                logger.info(
+                    f"[{self.workspace}] Discarding {self._index_type} index for {self.namespace}: storage was reloaded"
+                )
+                return False
+
+            # Apply vectors added while the index was being built
+            pending = [fid for fid in self._ann_pending_adds if fid in self._id_to_meta]
+            self._ann_pending_adds = None
+            if pending:
+                pending_ids = np.asarray(pending, dtype=np.int64)
+                ann_index.add_with_ids(
+                    np.vstack([self._index.reconstruct(fid) for fid in pending]),
+                    pending_ids,
+                )
+            self._ann_index = ann_index
+            self._ann_stale = set()
+            self._ann_search_state = None
+            # Drop vectors removed while the index was being built
+            live_ids = np.fromiter(self._id_to_meta.keys(), dtype=np.int64)
+            stale_ids = ids[~np.isin(ids, live_ids)]
+            if len(stale_ids):
+                self._ann_remove_ids(stale_ids)
+            self._ann_dirty = True
+            self._ann_rebuilt = True
+            if (
+                self._delta_log.enabled
+                and not self._pending_ops
+                and not self.storage_updated.value
+            ):
+                # Nothing unflushed or unsynced: the index matches the log end,
+                # publish it now instead of waiting for the next flush
+                self._publish_ann_rebuild()
+                await set_all_update_flags(self.final_namespace)
+                self.storage_updated.value = False
+
+        logger.info(
+            f"[{self.workspace}] Built {self._index_type} index for {self.namespace} with {ann_index.ntotal} vectors in {time.perf_counter() - start:.2f}s"
+        )
+        return True
+
+    def _publish_ann_rebuild(self):
+        """Write a rebuilt ANN index and tell the other workers to load it; caller
+        must hold the storage lock and have no unpublished changes"""
+        self._write_ann_index()
+        self._delta_log.publish([("ann", None)])
+        self._delta_position = self._delta_log.position()
+        self._ann_rebuilt = False
+
+    def _schedule_rebuild(self):
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return
+        self._rebuild_task = asyncio.create_task(self.rebuild_index())
+
+    async def benchmark_index(
+        self, sample_size: int = 100, top_k: int = 10
+    ) -> dict[str, Any]:
+        """Report recall and latency of the ANN index against exact flat search
 
-            self._id_to_meta = new_id_to_meta
+        Stored vectors are sampled and used as queries against both indexes.
+
+        Args:
+            sample_size: Number of stored vectors used as queries
+            top_k: Number of neighbors compared per query
+
+        Returns:
+            dict with index type, search parameters, recall@top_k and latency
+            statistics (milliseconds) for the flat and ANN indexes
+        """
+        index = await self._get_index()
+        ann_index = self._ann_index
+        if ann_index is None:
+            raise ValueError(
+                f"No {self._index_type} index built for {self.namespace}, call rebuild_index() first"
+            )
+
+        live_ids = list(self._id_to_meta.keys())
+        sample_ids = random.sample(live_ids, min(sample_size, len(live_ids)))
+        queries = np.vstack([index.reconstruct(fid) for fid in sample_ids])
+
+        def _run():
+            def _timed_search(search_index, k):
+                latencies, found = [], []
+                for query in queries:
+                    start = time.perf_counter()
+                    _, result = search_index.search(query.reshape(1, -1), k)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    found.append(result[0])
+                return np.array(latencies), found
+
+            def _latency_stats(latencies):
+                return {
+                    "mean": float(latencies.mean()),
+                    "p50": float(np.percentile(latencies, 50)),
+                    "p99": float(np.percentile(latencies, 99)),
+                }
+
+            flat_latencies, exact = _timed_search(index, top_k)
+            ann_latencies, approx = _timed_search(ann_index, top_k)
+            recalls = [
+                len(set(e[e >= 0]) & set(a[a >= 0])) / max(len(e[e >= 0]), 1)
+                for e, a in zip(exact, approx)
+            ]
+            return {
+                "flat": _latency_stats(flat_latencies),
+                "ann": _latency_stats(ann_latencies),
+                "recall": float(np.mean(recalls)),
+            }
+
+        report = await asyncio.to_thread(_run)
+        params = (
+            {"ef_search": self._ef_search, "hnsw_m": self._hnsw_m}
+            if self._index_type == "hnsw"
+            else {
+                "nprobe": self._nprobe,
+                "nlist": int(faiss.extract_index_ivf(ann_index).nlist),
+            }
+        )
+        return {
+            "index_type": self._index_type,
+            "params": params,
+            "vectors": len(live_ids),
+            "sample_size": len(sample_ids),
+            "top_k": top_k,
+            f"recall@{top_k}": report["recall"],
+            "flat_latency_ms": report["flat"],
+            "ann_latency_ms": report["ann"],
+        }
 
     def _save_faiss_index(self):
         """
@@ -336,7 +736,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         faiss.write_index(self._index, self._faiss_index_file)
 
         # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
+        # _id_to_meta is { int: { '__id__': doc_id, ... } }, vectors live in the index.
         # We'll keep the int -> dict, but JSON requires string keys.
         serializable_dict = {}
         for fid, meta in self._id_to_meta.items():
@@ -345,6 +745,39 @@ class FaissVectorDBStorage(BaseVectorStorage):
         with open(self._meta_file, "w", encoding="utf-8") as f:
             json.dump(serializable_dict, f)
 
+        if self._ann_index is not None and self._ann_dirty:
+            self._write_ann_index()
+
+    def _write_ann_index(self):
+        tmp_file = self._ann_index_file + ".tmp"
+        faiss.write_index(self._ann_index, tmp_file)
+        os.replace(tmp_file, self._ann_index_file)
+        self._ann_dirty = False
+
+    def _load_ann_index(self):
+        """Load the ANN index file written by the last flush; the flat index and
+        metadata must already reflect that flush"""
+        if self._index_type == "flat" or not os.path.exists(self._ann_index_file):
+            return
+        try:
+            ann_index = faiss.read_index(self._ann_index_file)
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Failed to load {self._index_type} index for {self.namespace}: {e}"
+            )
+            return
+        self._set_ann_search_params(ann_index)
+        self._ann_index = ann_index
+        self._ann_dirty = False
+        self._ann_search_state = None
+        self._ann_stale = set()
+        if self._index_type == "hnsw":
+            ann_ids = faiss.vector_to_array(ann_index.id_map)
+            self._ann_stale = set(ann_ids.tolist()) - self._id_to_meta.keys()
+        logger.info(
+            f"[{self.workspace}] {self._index_type} index loaded with {ann_index.ntotal} vectors from {self._ann_index_file}"
+        )
+
     def _load_faiss_index(self):
         """
         Load the Faiss index + metadata from disk if it exists,
@@ -358,27 +791,38 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         try:
             # Load the Faiss index
-            self._index = faiss.read_index(self._faiss_index_file)
+            index = faiss.read_index(self._faiss_index_file)
             # Load metadata
             with open(self._meta_file, "r", encoding="utf-8") as f:
                 stored_dict = json.load(f)
 
+            if not isinstance(index, faiss.IndexIDMap2):
+                # Legacy layout: sequential IndexFlatIP positions used as Faiss IDs
+                vectors = index.reconstruct_n(0, index.ntotal)
+                index = self._new_index()
+                index.add_with_ids(vectors, np.arange(len(vectors), dtype=np.int64))
+                logger.info(
+                    f"[{self.workspace}] Migrated legacy Faiss index for {self.namespace} to IndexIDMap2"
+                )
+            self._index = index
+
             # Convert string keys back to int
-            self._id_to_meta = {}
             for fid_str, meta in stored_dict.items():
-                fid = int(fid_str)
-                self._id_to_meta[fid] = meta
+                # Vectors are kept in the index, drop legacy copies in metadata
+                meta.pop("__vector__", None)
+                self._add_meta(int(fid_str), meta)
 
             logger.info(
                 f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
             )
+
+            self._load_ann_index()
         except Exception as e:
             logger.error(
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -388,9 +832,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
+                self._pending_ops.clear()
+                self._delta_position = self._delta_log.position()
                 self.storage_updated.value = False
                 return False  # Return error
 
@@ -399,10 +844,23 @@ class FaissVectorDBStorage(BaseVectorStorage):
             try:
                 # Save data to disk
                 self._save_faiss_index()
+                if self._ann_rebuilt:
+                    # Other workers load the rebuilt ANN index saved with this flush
+                    if self._delta_log.enabled:
+                        self._pending_ops.append(("ann", None))
+                    self._ann_rebuilt = False
+                # Let the other processes apply the changes instead of reloading
+                if self._pending_ops:
+                    self._delta_log.publish(self._pending_ops)
+                    self._pending_ops = []
+                self._delta_position = self._delta_log.position()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
                 self.storage_updated.value = False
+                # Build the ANN index in background once enough vectors exist or it got stale
+                if self._ann_needs_rebuild():
+                    self._schedule_rebuild()
             except Exception as e:
                 logger.error(
                     f"[{self.workspace}] Error saving FAISS index for {self.namespace}: {e}"
@@ -420,6 +878,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         Returns:
             The vector data if found, or None if not found
         """
+        # Pick up changes flushed by other processes
+        await self._get_index()
         # Find the Faiss internal ID for the custom ID
         fid = self._find_faiss_id_by_custom_id(id)
         if fid is None:
@@ -430,10 +890,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not metadata:
             return None
 
-        # Filter out __vector__ from metadata to avoid returning large vector data
-        filtered_metadata = {k: v for k, v in metadata.items() if k != "__vector__"}
         return {
-            **filtered_metadata,
+            **metadata,
             "id": metadata.get("__id__"),
             "created_at": metadata.get("__created_at__"),
         }
@@ -450,6 +908,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not ids:
             return []
 
+        await self._get_index()
         results: list[dict[str, Any] | None] = []
         for id in ids:
             record = None
@@ -457,12 +916,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if fid is not None:
                 metadata = self._id_to_meta.get(fid)
                 if metadata:
-                    # Filter out __vector__ from metadata to avoid returning large vector data
-                    filtered_metadata = {
-                        k: v for k, v in metadata.items() if k != "__vector__"
-                    }
                     record = {
-                        **filtered_metadata,
+                        **metadata,
                         "id": metadata.get("__id__"),
                         "created_at": metadata.get("__created_at__"),
                     }
@@ -483,15 +938,14 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not ids:
             return {}
 
+        index = await self._get_index()
         vectors_dict = {}
         for id in ids:
             # Find the Faiss internal ID for the custom ID
             fid = self._find_faiss_id_by_custom_id(id)
-            if fid is not None and fid in self._id_to_meta:
-                metadata = self._id_to_meta[fid]
-                # Get the stored vector from metadata
-                if "__vector__" in metadata:
-                    vectors_dict[id] = metadata["__vector__"]
+            if fid is not None:
+                # Reconstruct the stored (normalized) vector from the index
+                vectors_dict[id] = index.reconstruct(fid).tolist()
 
         return vectors_dict
 
@@ -514,17 +968,20 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
                 if os.path.exists(self._faiss_index_file):
                     os.remove(self._faiss_index_file)
                 if os.path.exists(self._meta_file):
                     os.remove(self._meta_file)
+                if os.path.exists(self._ann_index_file):
+                    os.remove(self._ann_index_file)
 
-                self._id_to_meta = {}
                 self._load_faiss_index()
+                self._pending_ops.clear()
+                self._delta_log.reset()
+                self._delta_position = self._delta_log.position()
 
                 # Notify other processes
                 await set_all_update_flags(self.final_namespace)
@@ -1,4 +1,6 @@
+from bisect import bisect_left, insort
 from dataclasses import dataclass
+from enum import Enum
 import os
 from typing import Any, Union, final
 
@@ -25,6 +27,153 @@ from .shared_storage import (
 )
 
 
+SORT_FIELDS = ("created_at", "updated_at", "id", "file_path")
+
+
+def _status_value(status: Any) -> Any:
+    return status.value if isinstance(status, Enum) else status
+
+
+def _prepare_doc_status(doc_data: dict[str, Any]) -> DocProcessingStatus:
+    """Build a DocProcessingStatus from a stored record without modifying it"""
+    data = doc_data.copy()
+    # Remove deprecated content field if it exists
+    data.pop("content", None)
+    # If file_path is not in data, use document id as file path
+    if "file_path" not in data:
+        data["file_path"] = "no-file-path"
+    # Ensure new fields exist with default values
+    if "metadata" not in data:
+        data["metadata"] = {}
+    if "error_msg" not in data:
+        data["error_msg"] = None
+    return DocProcessingStatus(**data)
+
+
+class _DocStatusIndex:
+    """In-memory secondary indexes over the doc status records
+
+    Maintains status, track_id and file_path buckets plus (sort_key, doc_id)
+    lists kept sorted per sort field, both overall and per status, so
+    pagination is a slice instead of a full sort. Sorted lists are built on
+    first use and then maintained incrementally. Buckets are insertion
+    ordered dicts; an updated document moves to the end of its buckets.
+    """
+
+    # Past this many changes in one batch, re-sorting beats inserting one by one
+    BULK_THRESHOLD = 1000
+
+    def __init__(self):
+        self.version: Any = None
+        self.clear()
+
+    def clear(self) -> None:
+        self.entries: dict[str, tuple[Any, Any, Any, dict[str, Any]]] = {}
+        self.by_status: dict[Any, dict[str, None]] = {}
+        self.by_track_id: dict[Any, dict[str, None]] = {}
+        self.by_file_path: dict[Any, dict[str, None]] = {}
+        self.sorted: dict[tuple[Any, str], list[tuple[Any, str]]] = {}
+
+    def _sort_key(self, doc_id: str, field: str) -> Any:
+        keys = self.entries[doc_id][3]
+        if field == "file_path" and "file_path" not in keys:
+            # Pinyin conversion is costly, only done once file_path sorting is used
+            keys["file_path"] = get_pinyin_sort_key(keys["raw_file_path"])
+        return keys[field]
+
+    def _add_entry(self, doc_id: str, doc_data: dict[str, Any]) -> Any:
+        status = _status_value(doc_data.get("status"))
+        track_id = doc_data.get("track_id")
+        file_path = doc_data.get("file_path")
+        keys = {
+            "created_at": doc_data.get("created_at") or "",
+            "updated_at": doc_data.get("updated_at") or "",
+            "id": doc_id,
+            "raw_file_path": doc_data.get("file_path", "no-file-path") or "",
+        }
+        self.entries[doc_id] = (status, track_id, file_path, keys)
+        self.by_status.setdefault(status, {})[doc_id] = None
+        if track_id is not None:
+            self.by_track_id.setdefault(track_id, {})[doc_id] = None
+        if file_path is not None:
+            self.by_file_path.setdefault(file_path, {})[doc_id] = None
+        return status
+
+    def rebuild(self, data: dict[str, dict[str, Any]]) -> None:
+        self.clear()
+        for doc_id, doc_data in data.items():
+            self._add_entry(doc_id, doc_data)
+
+    def add_many(self, data: dict[str, dict[str, Any]]) -> None:
+        if len(data) > self.BULK_THRESHOLD:
+            for doc_id in data:
+                self.remove(doc_id, keep_sorted=False)
+            self.sorted.clear()
+            for doc_id, doc_data in data.items():
+                self._add_entry(doc_id, doc_data)
+            return
+        for doc_id, doc_data in data.items():
+            self.add(doc_id, doc_data)
+
+    def add(self, doc_id: str, doc_data: dict[str, Any]) -> None:
+        self.remove(doc_id)
+        status = self._add_entry(doc_id, doc_data)
+        for field in SORT_FIELDS:
+            for items in (
+                self.sorted.get((None, field)),
+                self.sorted.get((status, field)),
+            ):
+                if items is not None:
+                    insort(items, (self._sort_key(doc_id, field), doc_id))
+
+    def remove(self, doc_id: str, keep_sorted: bool = True) -> None:
+        if doc_id not in self.entries:
+            return
+        status, track_id, file_path, keys = self.entries[doc_id]
+        if keep_sorted:
+            for field in SORT_FIELDS:
+                for items in (
+                    self.sorted.get((None, field)),
+                    self.sorted.get((status, field)),
+                ):
+                    if items is None:
+                        continue
+                    item = (self._sort_key(doc_id, field), doc_id)
+                    pos = bisect_left(items, item)
+                    if pos < len(items) and items[pos] == item:
+                        del items[pos]
+        del self.entries[doc_id]
+        for buckets, value in (
+            (self.by_status, status),
+            (self.by_track_id, track_id),
+            (self.by_file_path, file_path),
+        ):
+            bucket = buckets.get(value)
+            if bucket is not None:
+                bucket.pop(doc_id, None)
+                if not bucket:
+                    del buckets[value]
+
+    def page(
+        self, status: Any, field: str, descending: bool, start: int, end: int
+    ) -> tuple[list[str], int]:
+        """Return the doc ids of one page and the total number of matches"""
+        items = self.sorted.get((status, field))
+        if items is None:
+            doc_ids = self.entries if status is None else self.by_status.get(status, {})
+            items = sorted(
+                (self._sort_key(doc_id, field), doc_id) for doc_id in doc_ids
+            )
+            self.sorted[(status, field)] = items
+        total = len(items)
+        if descending:
+            lo, hi = max(total - end, 0), max(total - start, 0)
+            ids = [doc_id for _, doc_id in reversed(items[lo:hi])]
+        else:
+            ids = [doc_id for _, doc_id in items[start:end]]
+        return ids, total
+
+
 @final
 @dataclass
 class JsonDocStatusStorage(DocStatusStorage):
@@ -47,23 +196,47 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        self._index = _DocStatusIndex()
+        self._index_meta = None
 
     async def initialize(self):
         """Initialize storage data"""
-        self._storage_lock = get_storage_lock()
+        self._storage_lock = get_storage_lock(namespace=self.final_namespace)
         self.storage_updated = await get_update_flag(self.final_namespace)
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.final_namespace)
             self._data = await get_namespace_data(self.final_namespace)
+            # Shared version counter telling every process when to rebuild its index
+            self._index_meta = await get_namespace_data(
+                f"{self.final_namespace}_index_meta"
+            )
             if need_init:
                 loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
                     self._data.update(loaded_data)
+                    # Only the shared version: the local index is still empty
+                    # and gets built from the loaded data on first use
+                    self._index_meta["version"] = self._index_meta.get("version", 0) + 1
                     logger.info(
                         f"[{self.workspace}] Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
                     )
 
+    def _bump_index_version(self) -> None:
+        """Record a mutation; caller must hold the storage lock"""
+        version = self._index_meta.get("version", 0) + 1
+        self._index_meta["version"] = version
+        self._index.version = version
+
+    def _ensure_index(self) -> _DocStatusIndex:
+        """Rebuild the local index if the data changed elsewhere; caller must hold the storage lock"""
+        version = self._index_meta.get("version", 0)
+        if self._index.version != version:
+            data = dict(self._data) if hasattr(self._data, "_getvalue") else self._data
+            self._index.rebuild(data)
+            self._index.version = version
+        return self._index
+
     async def filter_keys(self, keys: set[str]) -> set[str]:
         """Return keys that should be processed (not in storage or not successfully processed)"""
         if self._storage_lock is None:
@@ -90,66 +263,38 @@ class JsonDocStatusStorage(DocStatusStorage):
         if self._storage_lock is None:
             raise StorageNotInitializedError("JsonDocStatusStorage")
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
+            for status, bucket in self._ensure_index().by_status.items():
+                counts[status] = counts.get(status, 0) + len(bucket)
         return counts
 
     async def get_docs_by_status(
         self, status: DocStatus
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
-        result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v["status"] == status.value:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
-        return result
+            doc_ids = list(self._ensure_index().by_status.get(status.value, ()))
+            return self._build_doc_statuses(doc_ids)
 
     async def get_docs_by_track_id(
         self, track_id: str
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific track_id"""
-        result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v.get("track_id") == track_id:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # Remove deprecated content field if it exists
-                        data.pop("content", None)
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        # Ensure new fields exist with default values
-                        if "metadata" not in data:
-                            data["metadata"] = {}
-                        if "error_msg" not in data:
-                            data["error_msg"] = None
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(
-                            f"[{self.workspace}] Missing required field for document {k}: {e}"
-                        )
-                        continue
+            doc_ids = list(self._ensure_index().by_track_id.get(track_id, ()))
+            return self._build_doc_statuses(doc_ids)
+
+    def _build_doc_statuses(self, doc_ids: list[str]) -> dict[str, DocProcessingStatus]:
+        result = {}
+        for doc_id in doc_ids:
+            doc_data = self._data.get(doc_id)
+            if doc_data is None:
+                continue
+            try:
+                result[doc_id] = _prepare_doc_status(doc_data)
+            except KeyError as e:
+                logger.error(
+                    f"[{self.workspace}] Missing required field for document {doc_id}: {e}"
+                )
         return result
 
     async def index_done_callback(self) -> None:
@@ -182,7 +327,10 @@ class JsonDocStatusStorage(DocStatusStorage):
             for doc_id, doc_data in data.items():
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
+            index = self._ensure_index()
             self._data.update(data)
+            index.add_many(data)
+            self._bump_index_version()
             await set_all_update_flags(self.final_namespace)
 
         await self.index_done_callback()
@@ -225,66 +373,30 @@ class JsonDocStatusStorage(DocStatusStorage):
         if sort_direction.lower() not in ["asc", "desc"]:
             sort_direction = "desc"
 
-        # For JSON storage, we load all data and sort/filter in memory
-        all_docs = []
+        # Secondary indexes keep every sort order ready, so a page is a slice
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+        status = status_filter.value if status_filter is not None else None
 
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                # Apply status filter
-                if (
-                    status_filter is not None
-                    and doc_data.get("status") != status_filter.value
-                ):
+            doc_ids, total_count = self._ensure_index().page(
+                status,
+                sort_field,
+                sort_direction.lower() == "desc",
+                start_idx,
+                end_idx,
+            )
+            paginated_docs = []
+            for doc_id in doc_ids:
+                doc_data = self._data.get(doc_id)
+                if doc_data is None:
                     continue
-
                 try:
-                    # Prepare document data
-                    data = doc_data.copy()
-                    data.pop("content", None)
-                    if "file_path" not in data:
-                        data["file_path"] = "no-file-path"
-                    if "metadata" not in data:
-                        data["metadata"] = {}
-                    if "error_msg" not in data:
-                        data["error_msg"] = None
-
-                    doc_status = DocProcessingStatus(**data)
-
-                    # Add sort key for sorting
-                    if sort_field == "id":
-                        doc_status._sort_key = doc_id
-                    elif sort_field == "file_path":
-                        # Use pinyin sorting for file_path field to support Chinese characters
-                        file_path_value = getattr(doc_status, sort_field, "")
-                        doc_status._sort_key = get_pinyin_sort_key(file_path_value)
-                    else:
-                        doc_status._sort_key = getattr(doc_status, sort_field, "")
-
-                    all_docs.append((doc_id, doc_status))
-
+                    paginated_docs.append((doc_id, _prepare_doc_status(doc_data)))
                 except KeyError as e:
                     logger.error(
                         f"[{self.workspace}] Error processing document {doc_id}: {e}"
                     )
-                    continue
-
-        # Sort documents
-        reverse_sort = sort_direction.lower() == "desc"
-        all_docs.sort(
-            key=lambda x: getattr(x[1], "_sort_key", ""), reverse=reverse_sort
-        )
-
-        # Remove sort key from documents
-        for doc_id, doc in all_docs:
-            if hasattr(doc, "_sort_key"):
-                delattr(doc, "_sort_key")
-
-        total_count = len(all_docs)
-
-        # Apply pagination
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_docs = all_docs[start_idx:end_idx]
 
         return paginated_docs, total_count
 
@@ -316,13 +428,16 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
+            index = self._ensure_index()
             any_deleted = False
             for doc_id in doc_ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
+                    index.remove(doc_id)
                     any_deleted = True
 
             if any_deleted:
+                self._bump_index_version()
                 await set_all_update_flags(self.final_namespace)
 
     async def get_doc_by_file_path(self, file_path: str) -> Union[dict[str, Any], None]:
@@ -339,13 +454,28 @@ class JsonDocStatusStorage(DocStatusStorage):
             raise StorageNotInitializedError("JsonDocStatusStorage")
 
         async with self._storage_lock:
-            for doc_id, doc_data in self._data.items():
-                if doc_data.get("file_path") == file_path:
-                    # Return complete document data, consistent with get_by_ids method
-                    return doc_data
+            for doc_id in self._ensure_index().by_file_path.get(file_path, ()):
+                # Return complete document data, consistent with get_by_ids method
+                return self._data.get(doc_id)
 
         return None
 
+    async def get_docs_by_file_paths(
+        self, file_paths: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get documents for many file paths from the file_path index"""
+        if self._storage_lock is None:
+            raise StorageNotInitializedError("JsonDocStatusStorage")
+
+        result = {}
+        async with self._storage_lock:
+            by_file_path = self._ensure_index().by_file_path
+            for file_path in file_paths:
+                bucket = by_file_path.get(file_path)
+                if bucket and file_path not in result:
+                    result[file_path] = self._data.get(next(iter(bucket)))
+        return result
+
     async def drop(self) -> dict[str, str]:
         """Drop all document status data from storage and clean up resources
 
@@ -362,6 +492,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                self._index.clear()
+                self._bump_index_version()
                 await set_all_update_flags(self.final_namespace)
 
             await self.index_done_callback()
@@ -1,4 +1,7 @@
+import asyncio
+import json
 import os
+import time
 from dataclasses import dataclass
 from typing import Any, final
 
@@ -21,6 +24,15 @@ from .shared_storage import (
     try_initialize_namespace,
 )
 
+# Compact the change log into a new snapshot once it exceeds this ratio of the snapshot size
+LOG_COMPACT_RATIO = float(os.getenv("JSON_KV_LOG_COMPACT_RATIO", "0.5"))
+# Never compact logs smaller than this many bytes
+LOG_COMPACT_MIN_BYTES = 1024 * 1024
+# When to fsync the change log and snapshots: always, everysec or no
+LOG_FSYNC = os.getenv("JSON_KV_LOG_FSYNC", "everysec").lower()
+# Seconds between change log fsyncs with the everysec policy
+LOG_FSYNC_INTERVAL = 1.0
+
 
 @final
 @dataclass
@@ -38,106 +50,292 @@ class JsonKVStorage(BaseKVStorage):
             self.workspace = "_"
 
         os.makedirs(workspace_dir, exist_ok=True)
+        # Snapshot file plus an append-only log of the changes made since it was written
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        self._log_file = os.path.join(workspace_dir, f"kv_store_{self.namespace}.log")
+        # Log being folded into a new snapshot by a background compaction
+        self._compacting_log_file = self._log_file + ".compacting"
 
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Keys changed since the last flush, shared by all processes
+        self._dirty_keys = None
+        self._log_meta = None
+        self._compaction_task = None
+        self._last_fsync = 0.0
+        # Syncs appends made within LOG_FSYNC_INTERVAL of the last fsync
+        self._fsync_task = None
 
     async def initialize(self):
         """Initialize storage data"""
-        self._storage_lock = get_storage_lock()
+        self._storage_lock = get_storage_lock(namespace=self.final_namespace)
         self.storage_updated = await get_update_flag(self.final_namespace)
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.final_namespace)
             self._data = await get_namespace_data(self.final_namespace)
+            self._dirty_keys = await get_namespace_data(
+                f"{self.final_namespace}_dirty_keys"
+            )
+            self._log_meta = await get_namespace_data(
+                f"{self.final_namespace}_log_meta"
+            )
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                loaded_data = load_json(self._file_name)
                 async with self._storage_lock:
+                    if loaded_data is None:
+                        # A log only applies to the snapshot it was written after
+                        self._remove_logs()
+                        loaded_data = {}
                     # Migrate legacy cache structure if needed
                     if self.namespace.endswith("_cache"):
                         loaded_data = await self._migrate_legacy_cache_structure(
                             loaded_data
                         )
+                    replayed = self._replay_logs(loaded_data)
 
                     self._data.update(loaded_data)
                     data_count = len(loaded_data)
 
+                    if os.path.exists(self._compacting_log_file):
+                        # Finish a compaction interrupted by a crash
+                        self._write_snapshot(loaded_data)
+                        self._remove_logs()
+
                     logger.info(
-                        f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {data_count} records"
+                        f"[{self.workspace}] Process {os.getpid()} KV load {self.namespace} with {data_count} records ({replayed} log records replayed)"
                     )
 
+    def _remove_logs(self) -> None:
+        for log_file in (self._compacting_log_file, self._log_file):
+            if os.path.exists(log_file):
+                os.remove(log_file)
+
+    def _replay_logs(self, data: dict[str, Any]) -> int:
+        """Apply the change logs on top of the snapshot data
+
+        A torn record at the tail of a log (interrupted write) is dropped and
+        truncated so that later appends start on a record boundary.
+        """
+        replayed = 0
+        for log_file in (self._compacting_log_file, self._log_file):
+            if not os.path.exists(log_file):
+                continue
+            valid_offset = 0
+            with open(log_file, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("missing record terminator")
+                        record = json.loads(line)
+                    except ValueError as e:
+                        logger.warning(
+                            f"[{self.workspace}] Ignoring incomplete {self.namespace} log record at offset {valid_offset}: {e}"
+                        )
+                        break
+                    data.update(record.get("upsert", {}))
+                    for key in record.get("delete", []):
+                        data.pop(key, None)
+                    valid_offset += len(line)
+                    replayed += 1
+            if valid_offset < os.path.getsize(log_file):
+                with open(log_file, "r+b") as f:
+                    f.truncate(valid_offset)
+        return replayed
+
+    def _append_log(self, record: dict[str, Any]) -> int:
+        """Append one change record to the log, returns the number of bytes written
+
+        With the everysec policy an append is synced right away if the last
+        fsync is older than LOG_FSYNC_INTERVAL, otherwise by a timer task once
+        the interval has passed, so the tail of a burst is synced too.
+        """
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self._log_file, "ab") as f:
+            f.write(line)
+            f.flush()
+            if LOG_FSYNC == "always":
+                os.fsync(f.fileno())
+            elif LOG_FSYNC == "everysec":
+                now = time.monotonic()
+                if now - self._last_fsync >= LOG_FSYNC_INTERVAL:
+                    os.fsync(f.fileno())
+                    self._last_fsync = now
+                elif self._fsync_task is None or self._fsync_task.done():
+                    self._fsync_task = asyncio.create_task(self._deferred_fsync())
+        return len(line)
+
+    def _fsync_logs(self) -> None:
+        """Sync the change logs; caller must hold the storage lock"""
+        for log_file in (self._compacting_log_file, self._log_file):
+            if os.path.exists(log_file):
+                with open(log_file, "rb") as f:
+                    os.fsync(f.fileno())
+        self._last_fsync = time.monotonic()
+
+    async def _deferred_fsync(self) -> None:
+        await asyncio.sleep(
+            max(0.0, self._last_fsync + LOG_FSYNC_INTERVAL - time.monotonic())
+        )
+        try:
+            async with self._storage_lock:
+                self._fsync_logs()
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error syncing {self.namespace} log: {e}")
+
+    @staticmethod
+    def _write_snapshot_file(data: dict[str, Any], file_name: str) -> None:
+        write_json(data, file_name)
+        if LOG_FSYNC != "no":
+            with open(file_name, "rb") as f:
+                os.fsync(f.fileno())
+
+    def _write_snapshot(self, data: dict[str, Any]) -> None:
+        """Atomically replace the snapshot with ``data``"""
+        tmp_file = self._file_name + ".tmp"
+        self._write_snapshot_file(data, tmp_file)
+        os.replace(tmp_file, self._file_name)
+
+    def _compaction_due(self) -> bool:
+        if os.path.exists(self._compacting_log_file) or not os.path.exists(
+            self._log_file
+        ):
+            return False
+        log_size = os.path.getsize(self._log_file)
+        snapshot_size = os.path.getsize(self._file_name)
+        return (
+            log_size > LOG_COMPACT_MIN_BYTES
+            and log_size > snapshot_size * LOG_COMPACT_RATIO
+        )
+
+    async def _compact(self) -> None:
+        """Fold the change log into a new snapshot without blocking writers
+
+        The log is renamed under the storage lock so later flushes start a new
+        one; the snapshot is then serialized in a worker thread and swapped in.
+        """
+        try:
+            async with self._storage_lock:
+                if not self._compaction_due():
+                    return
+                os.replace(self._log_file, self._compacting_log_file)
+                generation = self._log_meta.get("generation", 0)
+                # Copy records one level deep so in-place edits cannot race the writer
+                snapshot = {
+                    k: dict(v) if isinstance(v, dict) else v
+                    for k, v in self._data.items()
+                }
+
+            start = time.perf_counter()
+            tmp_file = self._file_name + ".compacting.tmp"
+            await asyncio.to_thread(self._write_snapshot_file, snapshot, tmp_file)
+
+            async with self._storage_lock:
+                if self._log_meta.get("generation", 0) != generation:
+                    # Storage was dropped while the snapshot was being written
+                    os.remove(tmp_file)
+                    return
+                os.replace(tmp_file, self._file_name)
+                os.remove(self._compacting_log_file)
+            logger.info(
+                f"[{self.workspace}] Compacted {self.namespace} log into snapshot with {len(snapshot)} records in {time.perf_counter() - start:.2f}s"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error compacting {self.namespace} log: {e}"
+            )
+
     async def index_done_callback(self) -> None:
+        """Persist the records changed since the last flush as one log record"""
+        compact = False
         async with self._storage_lock:
             if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
-
-                # Calculate data count - all data is now flattened
-                data_count = len(data_dict)
-
-                logger.debug(
-                    f"[{self.workspace}] Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
-                )
-                write_json(data_dict, self._file_name)
+                dirty_keys = list(self._dirty_keys.keys())
+                self._dirty_keys.clear()
+
+                if not os.path.exists(self._file_name):
+                    # The log is always relative to a snapshot, start with one
+                    data_dict = (
+                        dict(self._data)
+                        if hasattr(self._data, "_getvalue")
+                        else self._data
+                    )
+                    logger.debug(
+                        f"[{self.workspace}] Process {os.getpid()} KV writting {len(data_dict)} records to {self.namespace}"
+                    )
+                    self._write_snapshot(data_dict)
+                    self._remove_logs()
+                elif dirty_keys:
+                    record = {"upsert": {}, "delete": []}
+                    for key in dirty_keys:
+                        value = self._data.get(key)
+                        if value is None:
+                            record["delete"].append(key)
+                        else:
+                            record["upsert"][key] = value
+                    written = self._append_log(record)
+                    logger.debug(
+                        f"[{self.workspace}] Process {os.getpid()} KV logged {len(record['upsert'])} upserts, {len(record['delete'])} deletes to {self.namespace} ({written} bytes)"
+                    )
+                    compact = self._compaction_due()
                 await clear_all_update_flags(self.final_namespace)
 
+        if compact and (self._compaction_task is None or self._compaction_task.done()):
+            self._compaction_task = asyncio.create_task(self._compact())
+
     async def get_all(self) -> dict[str, Any]:
         """Get all data from storage
 
         Returns:
             Dictionary containing all stored data
         """
-        async with self._storage_lock:
-            result = {}
-            for key, value in self._data.items():
-                if value:
-                    # Create a copy to avoid modifying the original data
-                    data = dict(value)
-                    # Ensure time fields are present, provide default values for old data
-                    data.setdefault("create_time", 0)
-                    data.setdefault("update_time", 0)
-                    result[key] = data
-                else:
-                    result[key] = value
-            return result
+        # Reads take no lock: every access below is a single dict operation, atomic
+        # within the event loop and on the shared-data manager in multiprocess mode
+        result = {}
+        for key, value in self._data.items():
+            if value:
+                # Create a copy to avoid modifying the original data
+                data = dict(value)
+                # Ensure time fields are present, provide default values for old data
+                data.setdefault("create_time", 0)
+                data.setdefault("update_time", 0)
+                result[key] = data
+            else:
+                result[key] = value
+        return result
 
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
-        async with self._storage_lock:
-            result = self._data.get(id)
-            if result:
+        result = self._data.get(id)
+        if result:
+            # Create a copy to avoid modifying the original data
+            result = dict(result)
+            # Ensure time fields are present, provide default values for old data
+            result.setdefault("create_time", 0)
+            result.setdefault("update_time", 0)
+            # Ensure _id field contains the clean ID
+            result["_id"] = id
+        return result
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        results = []
+        for id in ids:
+            data = self._data.get(id, None)
+            if data:
                 # Create a copy to avoid modifying the original data
-                result = dict(result)
+                result = {k: v for k, v in data.items()}
                 # Ensure time fields are present, provide default values for old data
                 result.setdefault("create_time", 0)
                 result.setdefault("update_time", 0)
                 # Ensure _id field contains the clean ID
                 result["_id"] = id
-            return result
-
-    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
-        async with self._storage_lock:
-            results = []
-            for id in ids:
-                data = self._data.get(id, None)
-                if data:
-                    # Create a copy to avoid modifying the original data
-                    result = {k: v for k, v in data.items()}
-                    # Ensure time fields are present, provide default values for old data
-                    result.setdefault("create_time", 0)
-                    result.setdefault("update_time", 0)
-                    # Ensure _id field contains the clean ID
-                    result["_id"] = id
-                    results.append(result)
-                else:
-                    results.append(None)
-            return results
+                results.append(result)
+            else:
+                results.append(None)
+        return results
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
-        async with self._storage_lock:
-            return set(keys) - set(self._data.keys())
+        return set(keys) - set(self._data.keys())
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
@@ -148,8 +346,6 @@ class JsonKVStorage(BaseKVStorage):
         if not data:
             return
 
-        import time
-
         current_time = int(time.time())  # Get current Unix timestamp
 
         logger.debug(
@@ -175,6 +371,7 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            self._dirty_keys.update(dict.fromkeys(data))
             await set_all_update_flags(self.final_namespace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -195,6 +392,7 @@ class JsonKVStorage(BaseKVStorage):
             for doc_id in ids:
                 result = self._data.pop(doc_id, None)
                 if result is not None:
+                    self._dirty_keys[doc_id] = None
                     any_deleted = True
 
             if any_deleted:
@@ -206,8 +404,7 @@ class JsonKVStorage(BaseKVStorage):
 
         This method will:
         1. Clear all data from memory
-        2. Update flags to notify other processes
-        3. Trigger index_done_callback to save the empty state
+        2. Write an empty snapshot and remove the change logs
 
         Returns:
             dict[str, str]: Operation status and message
@@ -217,9 +414,13 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
-                await set_all_update_flags(self.final_namespace)
+                self._dirty_keys.clear()
+                # Invalidates a compaction that is writing the old data
+                self._log_meta["generation"] = self._log_meta.get("generation", 0) + 1
+                self._write_snapshot({})
+                self._remove_logs()
+                await clear_all_update_flags(self.final_namespace)
 
-            await self.index_done_callback()
             logger.info(
                 f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}"
             )
@@ -283,3 +484,12 @@ class JsonKVStorage(BaseKVStorage):
         """
         if self.namespace.endswith("_cache"):
             await self.index_done_callback()
+        if self._compaction_task is not None:
+            await self._compaction_task
+            self._compaction_task = None
+        if self._fsync_task is not None and not self._fsync_task.done():
+            # Sync the pending appends now instead of waiting for the timer
+            self._fsync_task.cancel()
+            self._fsync_task = None
+            async with self._storage_lock:
+                self._fsync_logs()
@@ -784,6 +784,203 @@ class MemgraphStorage(BaseGraphStorage):
         degrees = int(src_degree) + int(trg_degree)
         return degrees
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        """Retrieve multiple nodes in one query using UNWIND.
+
+        Args:
+            node_ids: List of node entity IDs to fetch.
+
+        Returns:
+            dict: Mapping of node_id to node properties, missing nodes are omitted
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})
+                RETURN id AS entity_id, n
+                """
+                result = await session.run(query, node_ids=node_ids)
+                nodes = {}
+                async for record in result:
+                    entity_id = record["entity_id"]
+                    if entity_id in nodes:
+                        continue  # Keep the first node, as get_node does
+                    node_dict = dict(record["n"])
+                    # Remove workspace label from labels list if it exists
+                    if "labels" in node_dict:
+                        node_dict["labels"] = [
+                            label
+                            for label in node_dict["labels"]
+                            if label != workspace_label
+                        ]
+                    nodes[entity_id] = node_dict
+                await result.consume()  # Ensure result is fully consumed
+                return nodes
+            except Exception as e:
+                logger.error(f"[{self.workspace}] Error getting nodes batch: {str(e)}")
+                raise
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        """Retrieve the degree of multiple nodes in one query using UNWIND.
+
+        Args:
+            node_ids: List of node entity IDs to look up.
+
+        Returns:
+            dict: Mapping of node_id to its degree, 0 for missing nodes
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})
+                OPTIONAL MATCH (n)-[r]-()
+                RETURN id AS entity_id, COUNT(r) AS degree
+                """
+                result = await session.run(query, node_ids=node_ids)
+                degrees = {}
+                async for record in result:
+                    degrees[record["entity_id"]] = record["degree"]
+                await result.consume()  # Ensure result is fully consumed
+
+                for node_id in node_ids:
+                    if node_id not in degrees:
+                        logger.warning(
+                            f"[{self.workspace}] No node found with label '{node_id}'"
+                        )
+                        degrees[node_id] = 0
+                return degrees
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error getting node degrees batch: {str(e)}"
+                )
+                raise
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Calculate the combined degree of both endpoints for multiple edges.
+
+        Args:
+            edge_pairs: List of (src, tgt) tuples.
+
+        Returns:
+            dict: Mapping of (src, tgt) to the sum of both node degrees
+        """
+        unique_node_ids = {src for src, _ in edge_pairs}
+        unique_node_ids.update(tgt for _, tgt in edge_pairs)
+        degrees = await self.node_degrees_batch(list(unique_node_ids))
+        return {
+            (src, tgt): degrees.get(src, 0) + degrees.get(tgt, 0)
+            for src, tgt in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """Retrieve edge properties for multiple (src, tgt) pairs in one query.
+
+        Args:
+            pairs: List of dictionaries, e.g. [{"src": "node1", "tgt": "node2"}, ...]
+
+        Returns:
+            dict: Mapping of (src, tgt) to edge properties, missing edges are omitted
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $pairs AS pair
+                MATCH (start:`{workspace_label}` {{entity_id: pair.src}})-[r]-(end:`{workspace_label}` {{entity_id: pair.tgt}})
+                RETURN pair.src AS src_id, pair.tgt AS tgt_id, properties(r) AS edge_properties
+                """
+                result = await session.run(query, pairs=pairs)
+                edges = {}
+                async for record in result:
+                    key = (record["src_id"], record["tgt_id"])
+                    if key in edges:
+                        continue  # Keep the first edge, as get_edge does
+                    edge_result = dict(record["edge_properties"])
+                    for field_name, default_value in {
+                        "weight": 1.0,
+                        "source_id": None,
+                        "description": None,
+                        "keywords": None,
+                    }.items():
+                        edge_result.setdefault(field_name, default_value)
+                    edges[key] = edge_result
+                await result.consume()  # Ensure result is fully consumed
+                return edges
+            except Exception as e:
+                logger.error(f"[{self.workspace}] Error getting edges batch: {str(e)}")
+                raise
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Retrieve the edges of multiple nodes in one query using UNWIND.
+
+        Args:
+            node_ids: List of node entity IDs to retrieve edges for.
+
+        Returns:
+            dict: Mapping of node_id to a list of (source, target) tuples, where
+            each edge is oriented by its stored direction
+        """
+        if self._driver is None:
+            raise RuntimeError(
+                "Memgraph driver is not initialized. Call 'await initialize()' first."
+            )
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            try:
+                workspace_label = self._get_workspace_label()
+                query = f"""
+                UNWIND $node_ids AS id
+                MATCH (n:`{workspace_label}` {{entity_id: id}})-[r]-(connected:`{workspace_label}`)
+                WHERE connected.entity_id IS NOT NULL
+                RETURN id AS queried_id, connected.entity_id AS connected_entity_id,
+                       startNode(r).entity_id AS start_entity_id
+                """
+                result = await session.run(query, node_ids=node_ids)
+                edges = {node_id: [] for node_id in node_ids}
+                async for record in result:
+                    queried_id = record["queried_id"]
+                    connected_id = record["connected_entity_id"]
+                    if record["start_entity_id"] == queried_id:
+                        edges[queried_id].append((queried_id, connected_id))
+                    else:
+                        edges[queried_id].append((connected_id, queried_id))
+                await result.consume()  # Ensure result is fully consumed
+                return edges
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error getting nodes edges batch: {str(e)}"
+                )
+                raise
+
     async def get_nodes_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
         """Get all nodes that are associated with the given chunk_ids.
 
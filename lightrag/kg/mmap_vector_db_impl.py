@@ -0,0 +1,891 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, final
+
+import numpy as np
+
+from lightrag.utils import logger, compute_mdhash_id
+from lightrag.base import BaseVectorStorage
+
+from .shared_storage import (
+    get_storage_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+# Rows scored per matmul block; bounds the float32 temporary for float16 matrices
+_QUERY_BLOCK_ROWS = 65536
+# Vector bytes copied per block when rewriting the files under a new generation
+_REWRITE_BLOCK_BYTES = 16 * 1024 * 1024
+# Metadata fields kept in the on-demand content file instead of in memory
+HEAVY_FIELDS = ("content",)
+
+
+@final
+@dataclass
+class MmapVectorDBStorage(BaseVectorStorage):
+    """
+    A file-based vector storage keeping all vectors in one contiguous row-major matrix.
+
+    Files in the workspace directory, ``<gen>`` being the generation of the last rewrite:
+    - `vdb_{namespace}.meta.json`: small header with the committed row count and file sizes
+    - `vdb_{namespace}.<gen>.vectors`: raw normalized vectors (float32 or float16), opened with np.memmap
+    - `vdb_{namespace}.<gen>.rows.jsonl`: append-only log of row ids, light metadata and tombstones
+    - `vdb_{namespace}.<gen>.content.jsonl` / `.offsets`: append-only heavy columns (the chunk
+      text) with one int64 start offset per row; they are read on demand, never at load time
+
+    New vectors are appended to the end of the matrix; updates and deletes tombstone the
+    old row. A flush appends only the rows and tombstones since the previous flush, then
+    atomically replaces the header, which is the commit point: bytes appended by an
+    interrupted flush are ignored on reload. Once the ratio of tombstoned rows exceeds
+    `compact_ratio`, the live rows are streamed block by block into files of the next
+    generation and the header swap switches to them, so a crash during compaction leaves
+    the previous generation intact.
+
+    Supported vector_db_storage_cls_kwargs:
+    - cosine_better_than_threshold (required)
+    - vector_dtype: "float32" (default) or "float16"
+    - compact_ratio: tombstone ratio triggering compaction (default 0.3)
+    """
+
+    def __post_init__(self):
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        vector_dtype = kwargs.get("vector_dtype", "float32")
+        if vector_dtype not in ("float32", "float16"):
+            raise ValueError(
+                f"vector_dtype must be 'float32' or 'float16', got '{vector_dtype}'"
+            )
+        self._dtype = np.dtype(vector_dtype)
+        self._compact_ratio = float(kwargs.get("compact_ratio", 0.3))
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+            self.final_namespace = f"{self.workspace}_{self.namespace}"
+        else:
+            # Default behavior when workspace is empty
+            self.final_namespace = self.namespace
+            self.workspace = "_"
+            workspace_dir = working_dir
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._workspace_dir = workspace_dir
+        self._meta_file = os.path.join(workspace_dir, f"vdb_{self.namespace}.meta.json")
+        self._heavy_fh = None
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._storage_lock = None
+        self.storage_updated = None
+        self._load()
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.final_namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock(
+            enable_logging=False, namespace=self.final_namespace
+        )
+
+    # ----- in-memory state -----
+
+    def _gen_file(self, generation: int, suffix: str) -> str:
+        return os.path.join(
+            self._workspace_dir, f"vdb_{self.namespace}.{generation}.{suffix}"
+        )
+
+    @property
+    def _vectors_file(self) -> str:
+        return self._gen_file(self._generation, "vectors")
+
+    def _reset(self):
+        """Reset in-memory state to an empty store"""
+        self._close_heavy_file()
+        self._generation = 0
+        self._matrix = np.empty((0, self._dim), dtype=self._dtype)
+        self._persisted_rows = 0  # rows backed by the memmapped file
+        self._pending: list[np.ndarray] = []  # rows appended since last flush
+        self._pending_matrix: np.ndarray | None = None
+        self._ids: list[str | None] = []  # row -> custom id, None for tombstones
+        self._created_at: list[int | None] = []
+        self._columns: dict[str, list] = {}  # light meta field -> per-row values
+        self._alive = np.zeros(0, dtype=bool)
+        self._id_to_row: dict[str, int] = {}
+        self._dead_rows = 0
+        self._needs_rewrite = False  # persisted rows changed, full rewrite needed
+        # Committed sizes of the append-only files
+        self._rows_log_bytes = 0
+        self._heavy_bytes = 0
+        self._heavy_offsets = np.zeros(0, dtype=np.int64)
+        self._pending_heavy: list[dict] = []
+        self._pending_dels: list[int] = []  # persisted rows tombstoned since last flush
+
+    def _close_heavy_file(self):
+        if self._heavy_fh is not None:
+            self._heavy_fh.close()
+            self._heavy_fh = None
+
+    def _open_matrix(self, file_name: str, dtype: np.dtype, rows: int):
+        matrix = np.memmap(file_name, dtype=dtype, mode="r", shape=(rows, self._dim))
+        if dtype != self._dtype:
+            # dtype changed in config: rows are converted by the rewrite on next flush
+            self._needs_rewrite = True
+        return matrix
+
+    def _set_rows(self, ids: list, created_at: list, fields: list[dict]):
+        """Install row ids and light metadata, building the lookup structures"""
+        rows = len(ids)
+        self._ids = ids
+        self._created_at = created_at
+        names = {name for row_fields in fields for name in row_fields}
+        self._columns = {
+            name: [row_fields.get(name) for row_fields in fields] for name in names
+        }
+        self._alive = np.fromiter(
+            (i is not None for i in self._ids), dtype=bool, count=rows
+        )
+        self._id_to_row = {
+            custom_id: row
+            for row, custom_id in enumerate(self._ids)
+            if custom_id is not None
+        }
+        self._dead_rows = rows - len(self._id_to_row)
+
+    def _load(self):
+        """Open the vector matrix with np.memmap and replay the row log"""
+        self._reset()
+        if not os.path.exists(self._meta_file):
+            return
+
+        try:
+            with open(self._meta_file, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Failed to load {self.namespace} metadata: {e}"
+            )
+            return
+
+        rows = int(meta.get("rows", 0))
+        if meta.get("embedding_dim") != self._dim:
+            raise ValueError(
+                f"[{self.workspace}] Embedding dim mismatch for {self.namespace}: "
+                f"expected {self._dim}, found {meta.get('embedding_dim')} in {self._meta_file}"
+            )
+        file_dtype = np.dtype(meta.get("dtype", "float32"))
+
+        self._generation = int(meta["generation"])
+        if rows > 0:
+            self._matrix = self._open_matrix(self._vectors_file, file_dtype, rows)
+        self._persisted_rows = rows
+
+        # Replay the committed part of the row log, later bytes are uncommitted
+        self._rows_log_bytes = int(meta.get("rows_log_bytes", 0))
+        ids: list = []
+        created_at: list = []
+        fields: list[dict] = []
+        deleted: list[int] = []
+        if self._rows_log_bytes:
+            with open(self._gen_file(self._generation, "rows.jsonl"), "rb") as f:
+                data = f.read(self._rows_log_bytes)
+            for line in data.splitlines():
+                record = json.loads(line)
+                if "del" in record:
+                    deleted.extend(record["del"])
+                    continue
+                for custom_id, created, row_fields in record["rows"]:
+                    ids.append(custom_id)
+                    created_at.append(created)
+                    fields.append(row_fields)
+        for row in deleted:
+            ids[row] = None
+            created_at[row] = None
+            fields[row] = {}
+        self._set_rows(ids[:rows], created_at[:rows], fields[:rows])
+
+        self._heavy_bytes = int(meta.get("heavy_bytes", 0))
+        if rows:
+            self._heavy_offsets = np.fromfile(
+                self._gen_file(self._generation, "offsets"),
+                dtype=np.int64,
+                count=rows,
+            )
+            self._heavy_fh = open(
+                self._gen_file(self._generation, "content.jsonl"), "rb"
+            )
+
+        logger.info(
+            f"[{self.workspace}] Loaded {self.namespace} with {len(self._id_to_row)} vectors ({self._dead_rows} tombstoned) from {self._vectors_file}"
+        )
+
+    async def _get_store(self):
+        """Check if the storage should be reloaded"""
+        # Lock-free fast path: only a flush by another process requires a reload
+        if not self.storage_updated.value:
+            return self
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            # Check if data needs to be reloaded
+            if self.storage_updated.value:
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+                )
+                self._load()
+                self.storage_updated.value = False
+            return self
+
+    @property
+    def _total_rows(self) -> int:
+        return len(self._ids)
+
+    def _rows_matrix(self, start: int, end: int) -> np.ndarray:
+        """Return rows [start, end) across the persisted matrix and pending rows"""
+        if end <= self._persisted_rows:
+            return self._matrix[start:end]
+        if self._pending_matrix is None:
+            self._pending_matrix = (
+                np.vstack(self._pending)
+                if self._pending
+                else np.empty((0, self._dim), dtype=self._dtype)
+            )
+        pending_start = max(start - self._persisted_rows, 0)
+        pending_end = end - self._persisted_rows
+        if start >= self._persisted_rows:
+            return self._pending_matrix[pending_start:pending_end]
+        return np.vstack(
+            [self._matrix[start:], self._pending_matrix[pending_start:pending_end]]
+        )
+
+    def _gather_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Gather arbitrary rows with one fancy index per backing array"""
+        out = np.empty((len(rows), self._dim), dtype=self._dtype)
+        persisted_mask = rows < self._persisted_rows
+        if persisted_mask.any():
+            out[persisted_mask] = self._matrix[rows[persisted_mask]]
+        if not persisted_mask.all():
+            pending_matrix = self._rows_matrix(self._persisted_rows, self._total_rows)
+            out[~persisted_mask] = pending_matrix[
+                rows[~persisted_mask] - self._persisted_rows
+            ]
+        return out
+
+    def _tombstone(self, row: int):
+        self._ids[row] = None
+        self._created_at[row] = None
+        for values in self._columns.values():
+            values[row] = None
+        self._alive[row] = False
+        self._dead_rows += 1
+        if row >= self._persisted_rows:
+            self._pending_heavy[row - self._persisted_rows] = {}
+        else:
+            self._pending_dels.append(row)
+
+    def _remove_ids(self, ids: list[str]) -> int:
+        removed = 0
+        for custom_id in ids:
+            row = self._id_to_row.pop(custom_id, None)
+            if row is not None:
+                self._tombstone(row)
+                removed += 1
+        return removed
+
+    def _read_heavy_line(self, row: int) -> bytes:
+        """Raw JSON line holding the heavy fields of a persisted row"""
+        start = int(self._heavy_offsets[row])
+        end = (
+            int(self._heavy_offsets[row + 1])
+            if row + 1 < self._persisted_rows
+            else self._heavy_bytes
+        )
+        self._heavy_fh.seek(start)
+        return self._heavy_fh.read(end - start)
+
+    def _read_heavy(self, rows) -> list[dict]:
+        """Heavy fields of the given rows, read from the content file when persisted"""
+        return [
+            self._pending_heavy[row - self._persisted_rows]
+            if row >= self._persisted_rows
+            else json.loads(self._read_heavy_line(row))
+            for row in rows
+        ]
+
+    def _row_to_record(self, row: int, heavy: dict | None = None) -> dict[str, Any]:
+        record = {
+            field: values[row]
+            for field, values in self._columns.items()
+            if values[row] is not None
+        }
+        record.update(heavy if heavy is not None else self._read_heavy([row])[0])
+        record["id"] = self._ids[row]
+        record["created_at"] = self._created_at[row]
+        return record
+
+    # ----- BaseVectorStorage API -----
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+
+        if len(embeddings) != len(data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(data)}"
+            )
+            return
+
+        # Normalize for cosine similarity via inner product
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        embeddings = (embeddings / norms).astype(self._dtype)
+
+        await self._get_store()
+
+        # Updated ids are tombstoned and re-appended
+        self._remove_ids(list(data.keys()))
+
+        start_row = self._total_rows
+        for offset, (custom_id, value) in enumerate(data.items()):
+            row = start_row + offset
+            self._id_to_row[custom_id] = row
+            self._ids.append(custom_id)
+            self._created_at.append(current_time)
+            for field in self.meta_fields:
+                if field in HEAVY_FIELDS:
+                    continue
+                if field not in self._columns:
+                    self._columns[field] = [None] * row
+                self._columns[field].append(value.get(field))
+            self._pending_heavy.append(
+                {
+                    field: value[field]
+                    for field in HEAVY_FIELDS
+                    if field in self.meta_fields and value.get(field) is not None
+                }
+            )
+            # Keep columns for fields not provided in this record aligned
+            for field, values in self._columns.items():
+                if len(values) <= row:
+                    values.append(None)
+
+        self._pending.append(embeddings)
+        self._pending_matrix = None
+        self._alive = np.concatenate([self._alive, np.ones(len(data), dtype=bool)])
+
+    async def query(
+        self, query: str, top_k: int, query_embedding: list[float] = None
+    ) -> list[dict[str, Any]]:
+        # Use provided embedding or compute it
+        if query_embedding is not None:
+            embedding = np.asarray(query_embedding, dtype=np.float32)
+        else:
+            # Execute embedding outside of lock to avoid improve cocurrent
+            embedding = await self.embedding_func(
+                [query], _priority=5
+            )  # higher priority for query
+            embedding = np.asarray(embedding[0], dtype=np.float32)
+
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+
+        await self._get_store()
+        total_rows = self._total_rows
+        if total_rows == 0 or top_k <= 0:
+            return []
+
+        # Score all rows with blocked matmuls against the contiguous matrix
+        scores = np.empty(total_rows, dtype=np.float32)
+        for start in range(0, total_rows, _QUERY_BLOCK_ROWS):
+            end = min(start + _QUERY_BLOCK_ROWS, total_rows)
+            block = self._rows_matrix(start, end)
+            scores[start:end] = block.astype(np.float32, copy=False) @ embedding
+        scores[~self._alive[:total_rows]] = -np.inf
+
+        k = min(top_k, total_rows)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates])]
+
+        rows = [
+            int(row)
+            for row in candidates
+            if scores[row] >= self.cosine_better_than_threshold
+        ]
+        results = []
+        for row, heavy in zip(rows, self._read_heavy(rows)):
+            record = self._row_to_record(row, heavy)
+            record["distance"] = float(scores[row])
+            results.append(record)
+        return results
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        try:
+            await self._get_store()
+            removed = self._remove_ids(ids)
+            logger.debug(
+                f"[{self.workspace}] Successfully deleted {removed} vectors from {self.namespace}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error while deleting vectors from {self.namespace}: {e}"
+            )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        try:
+            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+            logger.debug(
+                f"[{self.workspace}] Attempting to delete entity {entity_name} with ID {entity_id}"
+            )
+            await self._get_store()
+            if self._remove_ids([entity_id]):
+                logger.debug(
+                    f"[{self.workspace}] Successfully deleted entity {entity_name}"
+                )
+            else:
+                logger.debug(
+                    f"[{self.workspace}] Entity {entity_name} not found in storage"
+                )
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error deleting entity {entity_name}: {e}")
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        try:
+            await self._get_store()
+            src_ids = self._columns.get("src_id", [])
+            tgt_ids = self._columns.get("tgt_id", [])
+            ids_to_delete = [
+                self._ids[row]
+                for row, (src, tgt) in enumerate(zip(src_ids, tgt_ids))
+                if src == entity_name or tgt == entity_name
+            ]
+            logger.debug(
+                f"[{self.workspace}] Found {len(ids_to_delete)} relations for entity {entity_name}"
+            )
+            if ids_to_delete:
+                self._remove_ids(ids_to_delete)
+                logger.debug(
+                    f"[{self.workspace}] Deleted {len(ids_to_delete)} relations for {entity_name}"
+                )
+            else:
+                logger.debug(
+                    f"[{self.workspace}] No relations found for entity {entity_name}"
+                )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error deleting relations for {entity_name}: {e}"
+            )
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        await self._get_store()
+        row = self._id_to_row.get(id)
+        if row is None:
+            return None
+        return self._row_to_record(row)
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        await self._get_store()
+        rows = [self._id_to_row.get(str(requested_id)) for requested_id in ids]
+        found = [row for row in rows if row is not None]
+        heavy = dict(zip(found, self._read_heavy(found)))
+        return [
+            self._row_to_record(row, heavy[row]) if row is not None else None
+            for row in rows
+        ]
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """Get vectors by their IDs, returning only ID and vector data for efficiency
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Dictionary mapping IDs to their vector embeddings
+            Format: {id: [vector_values], ...}
+        """
+        if not ids:
+            return {}
+
+        await self._get_store()
+        found_ids = [i for i in ids if i in self._id_to_row]
+        if not found_ids:
+            return {}
+
+        rows = np.fromiter(
+            (self._id_to_row[i] for i in found_ids),
+            dtype=np.int64,
+            count=len(found_ids),
+        )
+        vectors = self._gather_rows(rows).astype(np.float32)
+        return dict(zip(found_ids, vectors.tolist()))
+
+    # ----- persistence -----
+
+    @staticmethod
+    def _write_at(file_name: str, offset: int, chunks) -> int:
+        """Write ``chunks`` at ``offset``, dropping uncommitted bytes; returns the new size"""
+        with open(file_name, "r+b" if os.path.exists(file_name) else "wb") as f:
+            f.seek(offset)
+            f.truncate()
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    @staticmethod
+    def _encode_heavy(heavy: dict) -> bytes:
+        return (json.dumps(heavy, ensure_ascii=False) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _line_offsets(lines: list[bytes], base: int) -> np.ndarray:
+        offsets = np.empty(len(lines), dtype=np.int64)
+        position = base
+        for i, line in enumerate(lines):
+            offsets[i] = position
+            position += len(line)
+        return offsets
+
+    def _row_entries(self, rows) -> list:
+        return [
+            [
+                self._ids[row],
+                self._created_at[row],
+                {
+                    field: values[row]
+                    for field, values in self._columns.items()
+                    if values[row] is not None
+                },
+            ]
+            for row in rows
+        ]
+
+    def _write_meta(
+        self, rows: int, generation: int, rows_log_bytes: int, heavy_bytes: int
+    ):
+        """Atomically replace the header; this commits everything written before it"""
+        meta = {
+            "embedding_dim": self._dim,
+            "dtype": self._dtype.name,
+            "generation": generation,
+            "rows": rows,
+            "rows_log_bytes": rows_log_bytes,
+            "heavy_bytes": heavy_bytes,
+        }
+        tmp_file = self._meta_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self._meta_file)
+
+    def _append_changes(self, total_rows: int):
+        """Append rows and tombstones since the last flush to the current generation"""
+        generation = self._generation
+        first_new = self._persisted_rows
+        itemsize = self._dim * self._dtype.itemsize
+
+        if self._pending:
+            self._write_at(
+                self._gen_file(generation, "vectors"),
+                first_new * itemsize,
+                (np.ascontiguousarray(block).tobytes() for block in self._pending),
+            )
+
+        records = []
+        if self._pending_dels:
+            records.append({"del": self._pending_dels})
+        if total_rows > first_new:
+            records.append({"rows": self._row_entries(range(first_new, total_rows))})
+        if records:
+            self._rows_log_bytes = self._write_at(
+                self._gen_file(generation, "rows.jsonl"),
+                self._rows_log_bytes,
+                (
+                    (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                    for record in records
+                ),
+            )
+
+        if total_rows > first_new:
+            lines = [self._encode_heavy(heavy) for heavy in self._pending_heavy]
+            offsets = self._line_offsets(lines, self._heavy_bytes)
+            self._heavy_bytes = self._write_at(
+                self._gen_file(generation, "content.jsonl"), self._heavy_bytes, lines
+            )
+            self._write_at(
+                self._gen_file(generation, "offsets"),
+                first_new * 8,
+                [offsets.tobytes()],
+            )
+            self._heavy_offsets = np.concatenate(
+                [self._heavy_offsets[:first_new], offsets]
+            )
+
+        self._write_meta(
+            total_rows, generation, self._rows_log_bytes, self._heavy_bytes
+        )
+
+    def _rewrite(self):
+        """Stream the live rows into the next generation and switch to it with the header swap
+
+        Rows are copied in blocks of about _REWRITE_BLOCK_BYTES of vectors from the current
+        memmap, pending rows and content file, so only one block is held in memory.
+        """
+        old_files = [
+            self._gen_file(self._generation, suffix)
+            for suffix in ("vectors", "rows.jsonl", "content.jsonl", "offsets")
+        ]
+        generation = self._generation + 1
+        keep = np.flatnonzero(self._alive[: self._total_rows])
+        block_rows = max(1, _REWRITE_BLOCK_BYTES // (self._dim * self._dtype.itemsize))
+        blocks = [
+            keep[start : start + block_rows]
+            for start in range(0, len(keep), block_rows)
+        ]
+
+        self._write_at(
+            self._gen_file(generation, "vectors"),
+            0,
+            (self._gather_rows(block).tobytes() for block in blocks),
+        )
+        rows_log_bytes = self._write_at(
+            self._gen_file(generation, "rows.jsonl"),
+            0,
+            (
+                (
+                    json.dumps(
+                        {"rows": self._row_entries(block.tolist())},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                ).encode("utf-8")
+                for block in blocks
+            ),
+        )
+
+        offsets = np.empty(len(keep), dtype=np.int64)
+
+        def heavy_chunks():
+            position = 0
+            for block_start, block in zip(range(0, len(keep), block_rows), blocks):
+                # Persisted lines are copied as is, without decoding them
+                lines = [
+                    self._read_heavy_line(row)
+                    if row < self._persisted_rows
+                    else self._encode_heavy(
+                        self._pending_heavy[row - self._persisted_rows]
+                    )
+                    for row in block.tolist()
+                ]
+                offsets[block_start : block_start + len(lines)] = self._line_offsets(
+                    lines, position
+                )
+                position += sum(len(line) for line in lines)
+                yield b"".join(lines)
+
+        heavy_bytes = self._write_at(
+            self._gen_file(generation, "content.jsonl"), 0, heavy_chunks()
+        )
+        self._write_at(self._gen_file(generation, "offsets"), 0, [offsets.tobytes()])
+        self._write_meta(len(keep), generation, rows_log_bytes, heavy_bytes)
+
+        # Committed: renumber the in-memory rows to match the new generation
+        keep_rows = keep.tolist()
+        self._ids = [self._ids[row] for row in keep_rows]
+        self._created_at = [self._created_at[row] for row in keep_rows]
+        self._columns = {
+            field: [values[row] for row in keep_rows]
+            for field, values in self._columns.items()
+        }
+        self._id_to_row = {custom_id: row for row, custom_id in enumerate(self._ids)}
+        self._alive = np.ones(len(keep_rows), dtype=bool)
+        self._dead_rows = 0
+        self._generation = generation
+        self._rows_log_bytes = rows_log_bytes
+        self._heavy_bytes = heavy_bytes
+        self._heavy_offsets = offsets
+
+        # The previous generation is no longer referenced by the header
+        self._matrix = np.empty((0, self._dim), dtype=self._dtype)
+        self._close_heavy_file()
+        for file_name in old_files:
+            try:
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+            except OSError as e:
+                logger.warning(
+                    f"[{self.workspace}] Could not remove old {self.namespace} file {file_name}: {e}"
+                )
+
+    def _flush(self):
+        total_rows = self._total_rows
+        if total_rows and self._dead_rows / total_rows > self._compact_ratio:
+            logger.info(
+                f"[{self.workspace}] Compacting {self.namespace}: dropping {self._dead_rows} of {total_rows} rows"
+            )
+            self._needs_rewrite = True
+
+        if self._needs_rewrite:
+            self._rewrite()
+            total_rows = self._total_rows
+        else:
+            self._append_changes(total_rows)
+
+        # Reopen the memmap and the content file over the committed rows
+        if total_rows:
+            self._matrix = np.memmap(
+                self._vectors_file,
+                dtype=self._dtype,
+                mode="r",
+                shape=(total_rows, self._dim),
+            )
+            if self._heavy_fh is None:
+                self._heavy_fh = open(
+                    self._gen_file(self._generation, "content.jsonl"), "rb"
+                )
+        else:
+            self._matrix = np.empty((0, self._dim), dtype=self._dtype)
+        self._persisted_rows = total_rows
+        self._pending = []
+        self._pending_matrix = None
+        self._pending_heavy = []
+        self._pending_dels = []
+        self._needs_rewrite = False
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                self._flush()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error saving data for {self.namespace}: {e}"
+                )
+                return False  # Return error
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove the vector matrix and metadata files if they exist
+        2. Reset the in-memory store
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                # Release the memmap before removing its file
+                self._reset()
+                prefix = f"vdb_{self.namespace}."
+                for file_name in os.listdir(self._workspace_dir):
+                    if file_name.startswith(prefix):
+                        os.remove(os.path.join(self._workspace_dir, file_name))
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.final_namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}(file:{self._vectors_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
@@ -714,6 +714,18 @@ class MongoDocStatusStorage(DocStatusStorage):
         """
         return await self._data.find_one({"file_path": file_path})
 
+    async def get_docs_by_file_paths(
+        self, file_paths: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get documents for many file paths with a single $in query"""
+        result = {}
+        if not file_paths:
+            return result
+        cursor = self._data.find({"file_path": {"$in": list(set(file_paths))}})
+        async for doc in cursor:
+            result.setdefault(doc["file_path"], doc)
+        return result
+
 
 @final
 @dataclass
@@ -14,6 +14,7 @@ from lightrag.utils import (
 
 from lightrag.base import BaseVectorStorage
 from nano_vectordb import NanoVectorDB
+from .delta_log import SharedDeltaLog
 from .shared_storage import (
     get_storage_lock,
     get_update_flag,
@@ -57,6 +58,15 @@ class NanoVectorDBStorage(BaseVectorStorage):
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
 
+        # Changes since the last flush, published for the other workers on save
+        self._delta_log = SharedDeltaLog(
+            self.final_namespace,
+            os.path.join(workspace_dir, f"vdb_{self.namespace}.delta"),
+            self.workspace,
+        )
+        self._pending_ops: list[tuple[str, Any]] = []
+        self._delta_position = None
+
         self._client = NanoVectorDB(
             self.embedding_func.embedding_dim,
             storage_file=self._client_file_name,
@@ -67,22 +77,55 @@ class NanoVectorDBStorage(BaseVectorStorage):
         # Get the update flag for cross-process update notification
         self.storage_updated = await get_update_flag(self.final_namespace)
         # Get the storage lock for use in other methods
-        self._storage_lock = get_storage_lock(enable_logging=False)
+        self._storage_lock = get_storage_lock(
+            enable_logging=False, namespace=self.final_namespace
+        )
+        await self._delta_log.initialize()
+        async with self._storage_lock:
+            self._delta_position = self._delta_log.position()
+
+    def _apply_ops(self, client: NanoVectorDB, ops: list[tuple[str, Any]]) -> None:
+        for op, payload in ops:
+            if op == "upsert":
+                # NanoVectorDB consumes the vectors of the records it is given
+                client.upsert(datas=[dict(d) for d in payload])
+            else:
+                client.delete(payload)
+
+    def _record_op(self, op: str, payload: Any) -> None:
+        if self._delta_log.enabled:
+            self._pending_ops.append((op, payload))
+
+    def _sync_from_other_process(self) -> None:
+        """Catch up with another worker's flush; caller must hold the storage lock"""
+        records = self._delta_log.read_since(self._delta_position)
+        if records is not None:
+            for ops in records:
+                self._apply_ops(self._client, ops)
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} applied {len(records)} {self.namespace} updates from another process"
+            )
+        else:
+            logger.info(
+                f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+            )
+            self._client = NanoVectorDB(
+                self.embedding_func.embedding_dim,
+                storage_file=self._client_file_name,
+            )
+            self._pending_ops.clear()
+        self._delta_position = self._delta_log.position()
 
     async def _get_client(self):
         """Check if the storage should be reloaded"""
+        # Lock-free fast path: only a flush by another process requires a reload
+        if not self.storage_updated.value:
+            return self._client
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
             # Check if data needs to be reloaded
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
-                )
-                # Reload data
-                self._client = NanoVectorDB(
-                    self.embedding_func.embedding_dim,
-                    storage_file=self._client_file_name,
-                )
+                self._sync_from_other_process()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -128,6 +171,10 @@ class NanoVectorDBStorage(BaseVectorStorage):
                 d["vector"] = encoded_vector
                 d["__vector__"] = embeddings[i]
             client = await self._get_client()
+            self._record_op(
+                "upsert",
+                [{**d, "__vector__": d["__vector__"].copy()} for d in list_data],
+            )
             results = client.upsert(datas=list_data)
             return results
         else:
@@ -185,6 +232,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
         try:
             client = await self._get_client()
             client.delete(ids)
+            self._record_op("delete", list(ids))
             logger.debug(
                 f"[{self.workspace}] Successfully deleted {len(ids)} vectors from {self.namespace}"
             )
@@ -211,6 +259,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             client = await self._get_client()
             if client.get([entity_id]):
                 client.delete([entity_id])
+                self._record_op("delete", [entity_id])
                 logger.debug(
                     f"[{self.workspace}] Successfully deleted entity {entity_name}"
                 )
@@ -245,6 +294,7 @@ class NanoVectorDBStorage(BaseVectorStorage):
             if ids_to_delete:
                 client = await self._get_client()
                 client.delete(ids_to_delete)
+                self._record_op("delete", ids_to_delete)
                 logger.debug(
                     f"[{self.workspace}] Deleted {len(ids_to_delete)} relations for {entity_name}"
                 )
@@ -270,6 +320,8 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     self.embedding_func.embedding_dim,
                     storage_file=self._client_file_name,
                 )
+                self._pending_ops.clear()
+                self._delta_position = self._delta_log.position()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -279,6 +331,11 @@ class NanoVectorDBStorage(BaseVectorStorage):
             try:
                 # Save data to disk
                 self._client.save()
+                # Let the other processes apply the changes instead of reloading
+                if self._pending_ops:
+                    self._delta_log.publish(self._pending_ops)
+                    self._pending_ops = []
+                self._delta_position = self._delta_log.position()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -400,6 +457,9 @@ class NanoVectorDBStorage(BaseVectorStorage):
                     self.embedding_func.embedding_dim,
                     storage_file=self._client_file_name,
                 )
+                self._pending_ops.clear()
+                self._delta_log.reset()
+                self._delta_position = self._delta_log.position()
 
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
@@ -1,6 +1,11 @@
+import asyncio
+import heapq
+import json
 import os
+import sys
 from dataclasses import dataclass
-from typing import final
+from operator import itemgetter
+from typing import AsyncIterator, Iterator, final
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from lightrag.utils import logger
@@ -8,6 +13,7 @@ from lightrag.base import BaseGraphStorage
 from lightrag.constants import GRAPH_FIELD_SEP
 import networkx as nx
 from .shared_storage import (
+    get_namespace_data,
     get_storage_lock,
     get_update_flag,
     set_all_update_flags,
@@ -20,6 +26,15 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+# Also write the full GraphML file on every flush (for external tools reading it)
+GRAPHML_EXPORT = os.getenv("NETWORKX_GRAPHML_EXPORT", "false").lower() == "true"
+# Compact the operation log into a new snapshot once it exceeds this ratio of the snapshot size
+OPLOG_COMPACT_RATIO = float(os.getenv("NETWORKX_OPLOG_COMPACT_RATIO", "0.5"))
+# Never compact logs smaller than this many bytes
+OPLOG_COMPACT_MIN_BYTES = 1024 * 1024
+# Nodes per batch when streaming get_knowledge_graph results
+KNOWLEDGE_GRAPH_BATCH_SIZE = 200
+
 
 @final
 @dataclass
@@ -37,6 +52,115 @@ class NetworkXStorage(BaseGraphStorage):
         )
         nx.write_graphml(graph, file_name)
 
+    @staticmethod
+    def apply_oplog_record(graph: nx.Graph, record: dict) -> None:
+        """Apply one flushed batch of changes; records carry final node/edge states"""
+        for node_id, data in record["nodes"]:
+            if graph.has_node(node_id):
+                attrs = graph.nodes[node_id]
+                attrs.clear()
+                attrs.update(data)
+            else:
+                graph.add_node(node_id, **data)
+        for source, target, data in record["edges"]:
+            if graph.has_edge(source, target):
+                attrs = graph.edges[source, target]
+                attrs.clear()
+                attrs.update(data)
+            else:
+                graph.add_edge(source, target, **data)
+        for source, target in record["del_edges"]:
+            if graph.has_edge(source, target):
+                graph.remove_edge(source, target)
+        for node_id in record["del_nodes"]:
+            if graph.has_node(node_id):
+                graph.remove_node(node_id)
+
+    @staticmethod
+    def load_snapshot_graph(
+        snapshot_file, oplog_file, workspace="_"
+    ) -> tuple[nx.Graph | None, int, int]:
+        """Load the latest snapshot and replay the operation log on top of it
+
+        Returns:
+            The graph (None if no snapshot exists), the snapshot generation and the
+            byte offset of the last complete log record, so a torn write at the
+            tail can be truncated.
+        """
+        if not os.path.exists(snapshot_file):
+            return None, 0, 0
+
+        with open(snapshot_file, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        generation = snapshot.get("generation", 0)
+        graph = nx.Graph()
+        graph.add_nodes_from(snapshot["nodes"])
+        graph.add_edges_from(snapshot["edges"])
+
+        replayed, valid_offset = NetworkXStorage.replay_oplog(
+            graph, oplog_file, generation, 0, workspace
+        )
+        logger.debug(
+            f"[{workspace}] Replayed {replayed} graph log records from {oplog_file}"
+        )
+        return graph, generation, valid_offset
+
+    @staticmethod
+    def replay_oplog(
+        graph: nx.Graph, oplog_file, generation: int, offset: int = 0, workspace="_"
+    ) -> tuple[int, int]:
+        """Apply the log records of snapshot ``generation`` starting at ``offset``
+
+        Records of older generations are already contained in the snapshot; they
+        remain in the log only if compaction was interrupted before truncating it.
+
+        Returns:
+            The number of records applied and the offset after the last complete one.
+        """
+        valid_offset = offset
+        replayed = 0
+        if os.path.exists(oplog_file):
+            with open(oplog_file, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        logger.warning(
+                            f"[{workspace}] Ignoring incomplete graph log record at offset {valid_offset}"
+                        )
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        logger.warning(
+                            f"[{workspace}] Ignoring corrupt graph log record at offset {valid_offset}: {e}"
+                        )
+                        break
+                    valid_offset += len(line)
+                    if record.get("gen", 0) < generation:
+                        continue
+                    NetworkXStorage.apply_oplog_record(graph, record)
+                    replayed += 1
+        return replayed, valid_offset
+
+    @staticmethod
+    def write_snapshot(graph: nx.Graph, snapshot_file, generation: int, workspace="_"):
+        logger.info(
+            f"[{workspace}] Writing graph snapshot with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+        )
+        snapshot = {
+            "generation": generation,
+            "nodes": list(graph.nodes(data=True)),
+            "edges": list(graph.edges(data=True)),
+        }
+        tmp_file = snapshot_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        # The new generation makes records still in the log obsolete, even if
+        # the process dies before the log is truncated
+        os.replace(tmp_file, snapshot_file)
+
     def __post_init__(self):
         working_dir = self.global_config["working_dir"]
         if self.workspace:
@@ -53,42 +177,233 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        # Snapshot + append-only operation log, both JSON so loading never runs code
+        self._snapshot_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.snapshot"
+        )
+        self._oplog_file = os.path.join(workspace_dir, f"graph_{self.namespace}.oplog")
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
+        # Shared epoch, bumped whenever the snapshot is rewritten or the graph dropped.
+        # Workers still on the epoch of their load can replay new log records instead
+        # of reloading after another worker flushed.
+        self._oplog_meta = None
+        self._oplog_epoch = None
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
-        if preloaded_graph is not None:
+        self._load_graph()
+
+    def _load_graph(self):
+        """Load graph from snapshot + log, falling back to a legacy GraphML file"""
+        # Nodes/edges changed since the last flush
+        self._dirty_nodes: set[str] = set()
+        self._dirty_edges: set[tuple[str, str]] = set()
+        # Write a full snapshot on the next flush (e.g. after migrating from GraphML)
+        self._needs_snapshot = False
+        self._migrated_from_graphml = False
+
+        if self._oplog_meta is not None:
+            self._oplog_epoch = self._oplog_meta.get("epoch", 0)
+        self._snapshot_stamp = self._get_snapshot_stamp()
+        (
+            graph,
+            self._oplog_generation,
+            self._oplog_offset,
+        ) = NetworkXStorage.load_snapshot_graph(
+            self._snapshot_file, self._oplog_file, self.workspace
+        )
+        if graph is not None:
+            source = self._snapshot_file
+        else:
+            graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+            source = self._graphml_xml_file
+            self._needs_snapshot = self._migrated_from_graphml = graph is not None
+
+        if graph is not None:
+            logger.info(
+                f"[{self.workspace}] Loaded graph from {source} with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+            )
+        else:
+            logger.info(
+                f"[{self.workspace}] Created new empty graph file: {self._snapshot_file}"
+            )
+        self._graph = graph or nx.Graph()
+
+    def _get_snapshot_stamp(self):
+        try:
+            stat = os.stat(self._snapshot_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _bump_oplog_epoch(self):
+        if self._oplog_meta is not None:
+            self._oplog_epoch = self._oplog_meta.get("epoch", 0) + 1
+            self._oplog_meta["epoch"] = self._oplog_epoch
+
+    def _sync_from_other_process(self):
+        """Catch up with another worker's flush; caller must hold the storage lock"""
+        if (
+            self._oplog_meta is not None
+            and self._oplog_meta.get("epoch", 0) == self._oplog_epoch
+        ):
+            replayed, self._oplog_offset = NetworkXStorage.replay_oplog(
+                self._graph,
+                self._oplog_file,
+                self._oplog_generation,
+                self._oplog_offset,
+                self.workspace,
+            )
             logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
+                f"[{self.workspace}] Process {os.getpid()} applied {replayed} graph log records from another process"
             )
         else:
             logger.info(
-                f"[{self.workspace}] Created new empty graph file: {self._graphml_xml_file}"
+                f"[{self.workspace}] Process {os.getpid()} reloading graph {self._snapshot_file} due to modifications by another process"
+            )
+            self._load_graph()
+
+    def _mark_edge_dirty(self, source_node_id: str, target_node_id: str):
+        # Undirected graph: store each edge under one canonical key
+        if source_node_id > target_node_id:
+            source_node_id, target_node_id = target_node_id, source_node_id
+        self._dirty_edges.add((source_node_id, target_node_id))
+
+    def _mark_node_removed(self, graph: nx.Graph, node_id: str):
+        """Track a node and its incident edges before the node is removed"""
+        self._dirty_nodes.add(node_id)
+        for neighbor in graph.neighbors(node_id):
+            self._mark_edge_dirty(node_id, neighbor)
+
+    def _flush_changes(self):
+        """Persist changes since the last flush as one log record, or compact into a snapshot"""
+        log_size = self._oplog_offset
+        snapshot_size = (
+            os.path.getsize(self._snapshot_file)
+            if os.path.exists(self._snapshot_file)
+            else 0
+        )
+        if (
+            self._needs_snapshot
+            or not snapshot_size
+            or (
+                log_size > OPLOG_COMPACT_MIN_BYTES
+                and log_size > snapshot_size * OPLOG_COMPACT_RATIO
+            )
+        ):
+            self._oplog_generation += 1
+            NetworkXStorage.write_snapshot(
+                self._graph,
+                self._snapshot_file,
+                self._oplog_generation,
+                self.workspace,
             )
-        self._graph = preloaded_graph or nx.Graph()
+            # Records already in the log are contained in the snapshot
+            with open(self._oplog_file, "wb"):
+                pass
+            self._oplog_offset = 0
+            self._snapshot_stamp = self._get_snapshot_stamp()
+            self._bump_oplog_epoch()
+            if (
+                self._migrated_from_graphml
+                and not GRAPHML_EXPORT
+                and os.path.exists(self._graphml_xml_file)
+            ):
+                # The GraphML file is no longer updated, keep it only as a backup
+                os.replace(self._graphml_xml_file, self._graphml_xml_file + ".bak")
+                logger.info(
+                    f"[{self.workspace}] Migrated graph to {self._snapshot_file}, renamed {self._graphml_xml_file} to .graphml.bak"
+                )
+            self._migrated_from_graphml = False
+        elif self._dirty_nodes or self._dirty_edges:
+            graph = self._graph
+            record = {
+                "gen": self._oplog_generation,
+                "nodes": [],
+                "edges": [],
+                "del_edges": [],
+                "del_nodes": [],
+            }
+            for node_id in self._dirty_nodes:
+                if graph.has_node(node_id):
+                    record["nodes"].append((node_id, dict(graph.nodes[node_id])))
+                else:
+                    record["del_nodes"].append(node_id)
+            for source, target in self._dirty_edges:
+                if graph.has_edge(source, target):
+                    record["edges"].append(
+                        (source, target, dict(graph.edges[source, target]))
+                    )
+                else:
+                    record["del_edges"].append((source, target))
+
+            with open(self._oplog_file, "ab") as f:
+                # Drop a torn record left by an interrupted write
+                f.truncate(self._oplog_offset)
+                f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                self._oplog_offset = f.tell()
+            logger.info(
+                f"[{self.workspace}] Appended graph changes: {len(record['nodes'])} nodes, {len(record['edges'])} edges upserted, {len(record['del_nodes'])} nodes, {len(record['del_edges'])} edges deleted"
+            )
+
+        self._dirty_nodes.clear()
+        self._dirty_edges.clear()
+        self._needs_snapshot = False
+
+        if GRAPHML_EXPORT:
+            NetworkXStorage.write_nx_graph(
+                self._graph, self._graphml_xml_file, self.workspace
+            )
+
+    async def export_graphml(self, file_name: str | None = None) -> str:
+        """Export the current graph as GraphML
+
+        Args:
+            file_name: Target path, defaults to graph_{namespace}.graphml in the workspace
+
+        Returns:
+            The path of the written GraphML file
+        """
+        graph = await self._get_graph()
+        file_name = file_name or self._graphml_xml_file
+        async with self._storage_lock:
+            NetworkXStorage.write_nx_graph(graph, file_name, self.workspace)
+        return file_name
 
     async def initialize(self):
         """Initialize storage data"""
         # Get the update flag for cross-process update notification
         self.storage_updated = await get_update_flag(self.final_namespace)
         # Get the storage lock for use in other methods
-        self._storage_lock = get_storage_lock()
+        self._storage_lock = get_storage_lock(namespace=self.final_namespace)
+        self._oplog_meta = await get_namespace_data(
+            f"{self.final_namespace}_oplog_meta"
+        )
+        async with self._storage_lock:
+            if self._get_snapshot_stamp() != self._snapshot_stamp:
+                # Snapshot was rewritten by another worker since it was loaded
+                self._load_graph()
+            else:
+                self._oplog_epoch = self._oplog_meta.get("epoch", 0)
+                _, self._oplog_offset = NetworkXStorage.replay_oplog(
+                    self._graph,
+                    self._oplog_file,
+                    self._oplog_generation,
+                    self._oplog_offset,
+                    self.workspace,
+                )
 
     async def _get_graph(self):
         """Check if the storage should be reloaded"""
+        # Lock-free fast path: only a flush by another process requires a reload
+        if not self.storage_updated.value:
+            return self._graph
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
             # Check if data needs to be reloaded
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
-                )
-                # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._sync_from_other_process()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -128,6 +443,63 @@ class NetworkXStorage(BaseGraphStorage):
             return list(graph.edges(source_node_id))
         return None
 
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        """Get multiple nodes with a single reload check, missing nodes are omitted"""
+        graph = await self._get_graph()
+        nodes = graph.nodes
+        return {node_id: nodes[node_id] for node_id in node_ids if node_id in nodes}
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        """Get degrees of multiple nodes, missing nodes get degree 0"""
+        graph = await self._get_graph()
+        adj = graph.adj
+        return {
+            node_id: len(adj[node_id]) if node_id in adj else 0 for node_id in node_ids
+        }
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Get the combined degree of both endpoints for multiple edges"""
+        graph = await self._get_graph()
+        adj = graph.adj
+        degrees = {}
+        for src_id, tgt_id in edge_pairs:
+            for node_id in (src_id, tgt_id):
+                if node_id not in degrees:
+                    degrees[node_id] = len(adj[node_id]) if node_id in adj else 0
+        return {
+            (src_id, tgt_id): degrees[src_id] + degrees[tgt_id]
+            for src_id, tgt_id in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        """Get properties of multiple edges, missing edges are omitted"""
+        graph = await self._get_graph()
+        adj = graph.adj
+        result = {}
+        for pair in pairs:
+            src_id, tgt_id = pair["src"], pair["tgt"]
+            neighbors = adj.get(src_id)
+            if neighbors is not None and tgt_id in neighbors:
+                result[(src_id, tgt_id)] = neighbors[tgt_id]
+        return result
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Get edges of multiple nodes, missing nodes get an empty list"""
+        graph = await self._get_graph()
+        adj = graph.adj
+        return {
+            node_id: [(node_id, neighbor) for neighbor in adj[node_id]]
+            if node_id in adj
+            else []
+            for node_id in node_ids
+        }
+
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """
         Importance notes:
@@ -137,6 +509,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        self._dirty_nodes.add(node_id)
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -149,6 +522,9 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        # add_edge creates missing endpoint nodes
+        self._dirty_nodes.update((source_node_id, target_node_id))
+        self._mark_edge_dirty(source_node_id, target_node_id)
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -159,6 +535,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         if graph.has_node(node_id):
+            self._mark_node_removed(graph, node_id)
             graph.remove_node(node_id)
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
@@ -180,6 +557,7 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         for node in nodes:
             if graph.has_node(node):
+                self._mark_node_removed(graph, node)
                 graph.remove_node(node)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
@@ -197,6 +575,7 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+                self._mark_edge_dirty(source, target)
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -293,6 +672,157 @@ class NetworkXStorage(BaseGraphStorage):
 
         return search_results
 
+    def _resolve_max_nodes(self, max_nodes: int | None) -> int:
+        # Get max_nodes from global_config if not provided
+        if max_nodes is None:
+            return self.global_config.get("max_graph_nodes", 1000)
+        # Limit max_nodes to not exceed global_config max_graph_nodes
+        return min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
+
+    def _explore_subgraph(
+        self, graph: nx.Graph, node_label: str, max_depth: int, max_nodes: int
+    ) -> Iterator[str | bool]:
+        """Yield subgraph nodes in result order, then whether the result was truncated.
+
+        Nodes closer to the start node come first, and within the same depth
+        nodes with a higher degree come first. Each node is enqueued once, its
+        degree is looked up once, and the search stops as soon as max_nodes
+        nodes have been found.
+        """
+        if node_label == "*":
+            # Top max_nodes nodes by degree without sorting the whole graph
+            top_nodes = heapq.nlargest(max_nodes, graph.degree, key=itemgetter(1))
+            yield from (node for node, _ in top_nodes if node in graph)
+            truncated = graph.number_of_nodes() > max_nodes
+            if truncated:
+                logger.info(
+                    f"[{self.workspace}] Graph truncated: {graph.number_of_nodes()} nodes found, limited to {max_nodes}"
+                )
+            yield truncated
+            return
+
+        if node_label not in graph:
+            logger.warning(
+                f"[{self.workspace}] Node {node_label} not found in the graph"
+            )
+            yield False
+            return
+
+        adj = graph.adj
+        degree = graph.degree
+        # Frontier ordered by (depth, -degree, discovery order), which matches
+        # a level-by-level BFS that sorts every level by degree
+        frontier = [(0, -degree[node_label], 0, node_label)]
+        discovered = {node_label}
+        # Number of frontier entries per depth
+        pending = [0] * (max_depth + 2)
+        pending[0] = 1
+        found = 0
+        has_unexplored_neighbors = False
+        # A node left unexpanded because max_nodes was already covered has new neighbors
+        cut_short = False
+
+        while frontier:
+            depth, _, _, node = heapq.heappop(frontier)
+            pending[depth] -= 1
+            if node not in adj:
+                # Removed by a concurrent writer while results were streaming
+                continue
+            found += 1
+            yield node
+
+            if depth >= max_depth:
+                if not has_unexplored_neighbors:
+                    # Check if there are unexplored neighbors (skipped due to depth limit)
+                    has_unexplored_neighbors = any(
+                        n not in discovered for n in adj[node]
+                    )
+            elif found + pending[depth] >= max_nodes:
+                # Nodes already queued at this depth fill the remaining slots, so
+                # deeper nodes can never make the cut and need not be enqueued
+                if not cut_short:
+                    cut_short = any(n not in discovered for n in adj[node])
+            else:
+                for neighbor in adj[node]:
+                    if neighbor not in discovered:
+                        discovered.add(neighbor)
+                        pending[depth + 1] += 1
+                        heapq.heappush(
+                            frontier,
+                            (depth + 1, -degree[neighbor], len(discovered), neighbor),
+                        )
+
+            if found >= max_nodes:
+                truncated = bool(frontier) or cut_short
+                if truncated:
+                    logger.info(
+                        f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
+                    )
+                yield truncated
+                return
+
+        if has_unexplored_neighbors:
+            logger.info(
+                f"[{self.workspace}] Graph truncated: found {found} nodes within max_depth {max_depth}"
+            )
+        yield False
+
+    async def iter_knowledge_graph(
+        self,
+        node_label: str,
+        max_depth: int = 3,
+        max_nodes: int = None,
+        batch_size: int = KNOWLEDGE_GRAPH_BATCH_SIZE,
+    ) -> AsyncIterator[KnowledgeGraph]:
+        """Stream the subgraph of `get_knowledge_graph` in batches of up to batch_size nodes.
+
+        An edge is emitted together with whichever of its endpoints is found
+        last, so clients can render each batch as soon as it arrives.
+        """
+        max_nodes = self._resolve_max_nodes(max_nodes)
+        graph = await self._get_graph()
+        adj = graph.adj
+        node_attrs = graph.nodes
+
+        emitted: set = set()
+        batch = KnowledgeGraph()
+        for item in self._explore_subgraph(graph, node_label, max_depth, max_nodes):
+            if isinstance(item, bool):
+                batch.is_truncated = item
+                break
+
+            node_id = str(item)
+            emitted.add(item)
+            batch.nodes.append(
+                KnowledgeGraphNode(
+                    id=node_id, labels=[node_id], properties=dict(node_attrs[item])
+                )
+            )
+            for neighbor, edge_data in adj[item].items():
+                if neighbor not in emitted:
+                    continue
+                # Ensure unique edge_id for undirected graph
+                source, target = node_id, str(neighbor)
+                if source > target:
+                    source, target = target, source
+                batch.edges.append(
+                    KnowledgeGraphEdge(
+                        id=f"{source}-{target}",
+                        type="DIRECTED",
+                        source=source,
+                        target=target,
+                        properties=dict(edge_data),
+                    )
+                )
+
+            if len(batch.nodes) >= batch_size:
+                yield batch
+                batch = KnowledgeGraph()
+                # Let other requests run between batches of a large expansion
+                await asyncio.sleep(0)
+
+        yield batch
+
     async def get_knowledge_graph(
         self,
         node_label: str,
@@ -311,159 +841,13 @@ class NetworkXStorage(BaseGraphStorage):
             KnowledgeGraph object containing nodes and edges, with an is_truncated flag
             indicating whether the graph was truncated due to max_nodes limit
         """
-        # Get max_nodes from global_config if not provided
-        if max_nodes is None:
-            max_nodes = self.global_config.get("max_graph_nodes", 1000)
-        else:
-            # Limit max_nodes to not exceed global_config max_graph_nodes
-            max_nodes = min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
-
-        graph = await self._get_graph()
-
         result = KnowledgeGraph()
-
-        # Handle special case for "*" label
-        if node_label == "*":
-            # Get degrees of all nodes
-            degrees = dict(graph.degree())
-            # Sort nodes by degree in descending order and take top max_nodes
-            sorted_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)
-
-            # Check if graph is truncated
-            if len(sorted_nodes) > max_nodes:
-                result.is_truncated = True
-                logger.info(
-                    f"[{self.workspace}] Graph truncated: {len(sorted_nodes)} nodes found, limited to {max_nodes}"
-                )
-
-            limited_nodes = [node for node, _ in sorted_nodes[:max_nodes]]
-            # Create subgraph with the highest degree nodes
-            subgraph = graph.subgraph(limited_nodes)
-        else:
-            # Check if node exists
-            if node_label not in graph:
-                logger.warning(
-                    f"[{self.workspace}] Node {node_label} not found in the graph"
-                )
-                return KnowledgeGraph()  # Return empty graph
-
-            # Use modified BFS to get nodes, prioritizing high-degree nodes at the same depth
-            bfs_nodes = []
-            visited = set()
-            # Store (node, depth, degree) in the queue
-            queue = [(node_label, 0, graph.degree(node_label))]
-
-            # Flag to track if there are unexplored neighbors due to depth limit
-            has_unexplored_neighbors = False
-
-            # Modified breadth-first search with degree-based prioritization
-            while queue and len(bfs_nodes) < max_nodes:
-                # Get the current depth from the first node in queue
-                current_depth = queue[0][1]
-
-                # Collect all nodes at the current depth
-                current_level_nodes = []
-                while queue and queue[0][1] == current_depth:
-                    current_level_nodes.append(queue.pop(0))
-
-                # Sort nodes at current depth by degree (highest first)
-                current_level_nodes.sort(key=lambda x: x[2], reverse=True)
-
-                # Process all nodes at current depth in order of degree
-                for current_node, depth, degree in current_level_nodes:
-                    if current_node not in visited:
-                        visited.add(current_node)
-                        bfs_nodes.append(current_node)
-
-                        # Only explore neighbors if we haven't reached max_depth
-                        if depth < max_depth:
-                            # Add neighbor nodes to queue with incremented depth
-                            neighbors = list(graph.neighbors(current_node))
-                            # Filter out already visited neighbors
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            # Add neighbors to the queue with their degrees
-                            for neighbor in unvisited_neighbors:
-                                neighbor_degree = graph.degree(neighbor)
-                                queue.append((neighbor, depth + 1, neighbor_degree))
-                        else:
-                            # Check if there are unexplored neighbors (skipped due to depth limit)
-                            neighbors = list(graph.neighbors(current_node))
-                            unvisited_neighbors = [
-                                n for n in neighbors if n not in visited
-                            ]
-                            if unvisited_neighbors:
-                                has_unexplored_neighbors = True
-
-                    # Check if we've reached max_nodes
-                    if len(bfs_nodes) >= max_nodes:
-                        break
-
-            # Check if graph is truncated - either due to max_nodes limit or depth limit
-            if (queue and len(bfs_nodes) >= max_nodes) or has_unexplored_neighbors:
-                if len(bfs_nodes) >= max_nodes:
-                    result.is_truncated = True
-                    logger.info(
-                        f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
-                    )
-                else:
-                    logger.info(
-                        f"[{self.workspace}] Graph truncated: found {len(bfs_nodes)} nodes within max_depth {max_depth}"
-                    )
-
-            # Create subgraph with BFS discovered nodes
-            subgraph = graph.subgraph(bfs_nodes)
-
-        # Add nodes to result
-        seen_nodes = set()
-        seen_edges = set()
-        for node in subgraph.nodes():
-            if str(node) in seen_nodes:
-                continue
-
-            node_data = dict(subgraph.nodes[node])
-            # Get entity_type as labels
-            labels = []
-            if "entity_type" in node_data:
-                if isinstance(node_data["entity_type"], list):
-                    labels.extend(node_data["entity_type"])
-                else:
-                    labels.append(node_data["entity_type"])
-
-            # Create node with properties
-            node_properties = {k: v for k, v in node_data.items()}
-
-            result.nodes.append(
-                KnowledgeGraphNode(
-                    id=str(node), labels=[str(node)], properties=node_properties
-                )
-            )
-            seen_nodes.add(str(node))
-
-        # Add edges to result
-        for edge in subgraph.edges():
-            source, target = edge
-            # Esure unique edge_id for undirect graph
-            if str(source) > str(target):
-                source, target = target, source
-            edge_id = f"{source}-{target}"
-            if edge_id in seen_edges:
-                continue
-
-            edge_data = dict(subgraph.edges[edge])
-
-            # Create edge with complete information
-            result.edges.append(
-                KnowledgeGraphEdge(
-                    id=edge_id,
-                    type="DIRECTED",
-                    source=str(source),
-                    target=str(target),
-                    properties=edge_data,
-                )
-            )
-            seen_edges.add(edge_id)
+        async for batch in self.iter_knowledge_graph(
+            node_label, max_depth, max_nodes, batch_size=sys.maxsize
+        ):
+            result.nodes.extend(batch.nodes)
+            result.edges.extend(batch.edges)
+            result.is_truncated = batch.is_truncated
 
         logger.info(
             f"[{self.workspace}] Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}"
@@ -535,9 +919,7 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._load_graph()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
@@ -545,10 +927,8 @@ class NetworkXStorage(BaseGraphStorage):
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
-                # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
+                # Save changes since the last flush to disk
+                self._flush_changes()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
@@ -576,10 +956,16 @@ class NetworkXStorage(BaseGraphStorage):
         """
         try:
             async with self._storage_lock:
-                # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
-                self._graph = nx.Graph()
+                # delete graph files
+                for file_name in (
+                    self._graphml_xml_file,
+                    self._snapshot_file,
+                    self._oplog_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
+                self._bump_oplog_epoch()
+                self._load_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.final_namespace)
                 # Reset own update flag to avoid self-reloading
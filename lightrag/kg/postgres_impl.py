@@ -9,6 +9,7 @@ from typing import Any, Awaitable, Callable, TypeVar, Union, final
 import numpy as np
 import configparser
 import ssl
+import struct
 import itertools
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
@@ -33,7 +34,7 @@ from ..base import (
 )
 from ..namespace import NameSpace, is_namespace
 from ..utils import logger
-from ..constants import GRAPH_FIELD_SEP
+from ..constants import DEFAULT_POSTGRES_UPSERT_BATCH_SIZE, GRAPH_FIELD_SEP
 from ..kg.shared_storage import get_data_init_lock, get_graph_db_lock, get_storage_lock
 
 import pipmaster as pm
@@ -54,6 +55,33 @@ load_dotenv(dotenv_path=".env", override=False)
 T = TypeVar("T")
 
 
+def _encode_vector(value: Any) -> bytes:
+    """Encode a vector in pgvector's binary format: dim, unused, float4 values"""
+    if isinstance(value, str):
+        value = json.loads(value)
+    vector = np.asarray(value, dtype=">f4")
+    return struct.pack(">HH", vector.shape[0], 0) + vector.tobytes()
+
+
+def _decode_vector(data: bytes) -> list[float]:
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).tolist()
+
+
+def _parse_vector_search_setting(value: Any) -> dict[str, int]:
+    """Parse "100" or "chunks:100,entities:64" into {vector store namespace: value}
+
+    The "" key holds the value for vector stores without an explicit entry.
+    """
+    if value is None or str(value).strip() == "":
+        return {}
+    settings = {}
+    for part in str(value).split(","):
+        namespace, _, number = part.rpartition(":")
+        settings[namespace.strip()] = int(number)
+    return settings
+
+
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
         self.host = config["host"]
@@ -78,6 +106,9 @@ class PostgreSQLDB:
         self.hnsw_m = config.get("hnsw_m")
         self.hnsw_ef = config.get("hnsw_ef")
         self.ivfflat_lists = config.get("ivfflat_lists")
+        # Per vector store search settings, applied to the session of each query
+        self.hnsw_ef_search = _parse_vector_search_setting(config.get("hnsw_ef_search"))
+        self.ivfflat_probes = _parse_vector_search_setting(config.get("ivfflat_probes"))
 
         # Server settings
         self.server_settings = config.get("server_settings")
@@ -85,6 +116,12 @@ class PostgreSQLDB:
         # Statement LRU cache size (keep as-is, allow None for optional configuration)
         self.statement_cache_size = config.get("statement_cache_size")
 
+        # Rows written per executemany round trip and transaction by bulk upserts
+        self.upsert_batch_size = max(
+            1,
+            int(config.get("upsert_batch_size") or DEFAULT_POSTGRES_UPSERT_BATCH_SIZE),
+        )
+
         if self.user is None or self.password is None or self.database is None:
             raise ValueError("Missing database user, password, or database")
 
@@ -200,6 +237,7 @@ class PostgreSQLDB:
             "port": self.port,
             "min_size": 1,
             "max_size": self.max,
+            "init": self.register_vector_codec,
         }
 
         # Only add statement_cache_size if it's configured
@@ -255,6 +293,8 @@ class PostgreSQLDB:
             try:
                 async with pool.acquire() as connection:
                     await self.configure_vector_extension(connection)
+                    # The first connection was opened before the extension existed
+                    await self.register_vector_codec(connection)
             except Exception:
                 await pool.close()
                 raise
@@ -366,6 +406,48 @@ class PostgreSQLDB:
 
                     return await operation(connection)
 
+    @staticmethod
+    async def register_vector_codec(connection: asyncpg.Connection) -> None:
+        """Exchange pgvector `vector` values in binary, as numpy arrays or float lists.
+
+        Vectors are then bound as typed parameters instead of being formatted
+        into the SQL text, so vector statements stay constant and are prepared
+        once per connection by asyncpg's statement cache.
+
+        Vector upserts and queries pass numpy arrays and float lists, which
+        asyncpg can only send through this codec, so a failure to register it
+        is raised rather than leaving the connection unable to bind vectors.
+        Without the extension there is no vector type and nothing to register.
+        """
+        schema = await connection.fetchval(
+            "SELECT n.nspname FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace WHERE t.typname = 'vector'"
+        )
+        if schema is None:
+            # Extension not created yet
+            return
+        try:
+            await connection.set_type_codec(
+                "vector",
+                schema=schema,
+                encoder=_encode_vector,
+                decoder=_decode_vector,
+                format="binary",
+            )
+        except Exception as e:
+            logger.error(f"PostgreSQL, Could not register vector codec: {e}")
+            raise
+
+    def vector_search_settings(self, namespace: str) -> dict[str, int]:
+        """Session settings for a similarity search on the given vector store"""
+        if self.vector_index_type == "HNSW":
+            name, values = "hnsw.ef_search", self.hnsw_ef_search
+        elif self.vector_index_type == "IVFFLAT":
+            name, values = "ivfflat.probes", self.ivfflat_probes
+        else:
+            return {}
+        value = values.get(namespace, values.get(""))
+        return {name: value} if value else {}
+
     @staticmethod
     async def configure_vector_extension(connection: asyncpg.Connection) -> None:
         """Create VECTOR extension if it doesn't exist for vector similarity operations."""
@@ -1397,13 +1479,28 @@ class PostgreSQLDB:
         multirows: bool = False,
         with_age: bool = False,
         graph_name: str | None = None,
+        session_settings: dict[str, int] | None = None,
     ) -> dict[str, Any] | None | list[dict[str, Any]]:
-        async def _operation(connection: asyncpg.Connection) -> Any:
+        async def _fetch(connection: asyncpg.Connection) -> list[asyncpg.Record]:
             prepared_params = tuple(params) if params else ()
             if prepared_params:
-                rows = await connection.fetch(sql, *prepared_params)
+                return await connection.fetch(sql, *prepared_params)
+            return await connection.fetch(sql)
+
+        async def _operation(connection: asyncpg.Connection) -> Any:
+            if session_settings:
+                # SET LOCAL ends with the transaction, so the settings never
+                # outlive the query, also behind a transaction pooling pgbouncer
+                async with connection.transaction():
+                    await connection.execute(
+                        ";".join(
+                            f"SET LOCAL {name} = {int(value)}"
+                            for name, value in session_settings.items()
+                        )
+                    )
+                    rows = await _fetch(connection)
             else:
-                rows = await connection.fetch(sql)
+                rows = await _fetch(connection)
 
             if multirows:
                 if rows:
@@ -1464,6 +1561,34 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def executemany(self, sql: str, data: list[dict[str, Any]]) -> None:
+        """Run `sql` once for every row of `data` using asyncpg executemany.
+
+        Rows are sent in batches of `upsert_batch_size`; each batch is a single
+        pipelined round trip inside its own transaction, so a failed batch is
+        rolled back as a whole and can be retried safely.
+        """
+        if not data:
+            return
+
+        for start in range(0, len(data), self.upsert_batch_size):
+            batch = [
+                tuple(row.values())
+                for row in data[start : start + self.upsert_batch_size]
+            ]
+
+            async def _operation(connection: asyncpg.Connection, batch=batch) -> None:
+                async with connection.transaction():
+                    await connection.executemany(sql, batch)
+
+            try:
+                await self._run_with_retry(_operation)
+            except Exception as e:
+                logger.error(
+                    f"PostgreSQL database,\nsql:{sql},\nrows:{len(batch)} (first: {batch[0]}),\nerror:{e}"
+                )
+                raise
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -1544,6 +1669,14 @@ class ClientManager:
                     config.get("postgres", "ivfflat_lists", fallback="100"),
                 )
             ),
+            "hnsw_ef_search": os.environ.get(
+                "POSTGRES_HNSW_EF_SEARCH",
+                config.get("postgres", "hnsw_ef_search", fallback=None),
+            ),
+            "ivfflat_probes": os.environ.get(
+                "POSTGRES_IVFFLAT_PROBES",
+                config.get("postgres", "ivfflat_probes", fallback=None),
+            ),
             # Server settings for Supabase
             "server_settings": os.environ.get(
                 "POSTGRES_SERVER_SETTINGS",
@@ -1553,6 +1686,16 @@ class ClientManager:
                 "POSTGRES_STATEMENT_CACHE_SIZE",
                 config.get("postgres", "statement_cache_size", fallback=None),
             ),
+            "upsert_batch_size": int(
+                os.environ.get(
+                    "POSTGRES_UPSERT_BATCH_SIZE",
+                    config.get(
+                        "postgres",
+                        "upsert_batch_size",
+                        fallback=DEFAULT_POSTGRES_UPSERT_BATCH_SIZE,
+                    ),
+                )
+            ),
             # Connection retry configuration
             "connection_retry_attempts": min(
                 10,
@@ -1977,9 +2120,9 @@ class PGKVStorage(BaseKVStorage):
         if is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,
                     "tokens": v["tokens"],
@@ -1991,21 +2134,23 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
+            rows = [
+                {
                     "id": k,
                     "content": v["content"],
                     "doc_name": v.get("file_path", ""),  # Map file_path to doc_name
                     "workspace": self.workspace,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,  # Use flattened key as id
                     "original_prompt": v["original_prompt"],
@@ -2018,14 +2163,14 @@ class PGKVStorage(BaseKVStorage):
                     if v.get("queryparam")
                     else None,
                 }
-
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_ENTITIES):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,
                     "entity_names": json.dumps(v["entity_names"]),
@@ -2033,13 +2178,14 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_RELATIONS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
-            for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
-                _data = {
+            upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
+            rows = [
+                {
                     "workspace": self.workspace,
                     "id": k,
                     "relation_pairs": json.dumps(v["relation_pairs"]),
@@ -2047,7 +2193,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                for k, v in data.items()
+            ]
+        else:
+            return
+
+        await self.db.executemany(upsert_sql, rows)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -2153,7 +2304,7 @@ class PGVectorStorage(BaseVectorStorage):
                 "chunk_order_index": item["chunk_order_index"],
                 "full_doc_id": item["full_doc_id"],
                 "content": item["content"],
-                "content_vector": json.dumps(item["__vector__"].tolist()),
+                "content_vector": item["__vector__"],
                 "file_path": item["file_path"],
                 "create_time": current_time,
                 "update_time": current_time,
@@ -2181,7 +2332,7 @@ class PGVectorStorage(BaseVectorStorage):
             "id": item["__id__"],
             "entity_name": item["entity_name"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2205,7 +2356,7 @@ class PGVectorStorage(BaseVectorStorage):
             "source_id": item["src_id"],
             "target_id": item["tgt_id"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2239,17 +2390,21 @@ class PGVectorStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["__vector__"] = embeddings[i]
-        for item in list_data:
-            if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
-                upsert_sql, data = self._upsert_chunks(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
-                upsert_sql, data = self._upsert_entities(item, current_time)
-            elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
-                upsert_sql, data = self._upsert_relationships(item, current_time)
-            else:
-                raise ValueError(f"{self.namespace} is not supported")
 
-            await self.db.execute(upsert_sql, data)
+        if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
+            prepare = self._upsert_chunks
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_ENTITIES):
+            prepare = self._upsert_entities
+        elif is_namespace(self.namespace, NameSpace.VECTOR_STORE_RELATIONSHIPS):
+            prepare = self._upsert_relationships
+        else:
+            raise ValueError(f"{self.namespace} is not supported")
+
+        rows = []
+        for item in list_data:
+            upsert_sql, row = prepare(item, current_time)
+            rows.append(row)
+        await self.db.executemany(upsert_sql, rows)
 
     #################### query method ###############
     async def query(
@@ -2263,15 +2418,19 @@ class PGVectorStorage(BaseVectorStorage):
             )  # higher priority for query
             embedding = embeddings[0]
 
-        embedding_string = ",".join(map(str, embedding))
-
-        sql = SQL_TEMPLATES[self.namespace].format(embedding_string=embedding_string)
+        sql = SQL_TEMPLATES[self.namespace]
         params = {
             "workspace": self.workspace,
             "closer_than_threshold": 1 - self.cosine_better_than_threshold,
             "top_k": top_k,
+            "embedding": embedding,
         }
-        results = await self.db.query(sql, params=list(params.values()), multirows=True)
+        results = await self.db.query(
+            sql,
+            params=list(params.values()),
+            multirows=True,
+            session_settings=self.db.vector_search_settings(self.namespace),
+        )
         return results
 
     async def index_done_callback(self) -> None:
@@ -2457,8 +2616,8 @@ class PGVectorStorage(BaseVectorStorage):
             for result in results:
                 if result and "content_vector" in result and "id" in result:
                     try:
-                        # Parse JSON string to get vector as list of floats
-                        vector_data = json.loads(result["content_vector"])
+                        # Decoded to a float list by the registered vector codec
+                        vector_data = result["content_vector"]
                         if isinstance(vector_data, list):
                             vectors_dict[result["id"]] = vector_data
                     except (json.JSONDecodeError, TypeError) as e:
@@ -2666,39 +2825,58 @@ class PGDocStatusStorage(DocStatusStorage):
         if result is None or result == []:
             return None
         else:
-            # Parse chunks_list JSON string back to list
-            chunks_list = result[0].get("chunks_list", [])
-            if isinstance(chunks_list, str):
-                try:
-                    chunks_list = json.loads(chunks_list)
-                except json.JSONDecodeError:
-                    chunks_list = []
+            return self._doc_status_row_to_dict(result[0])
 
-            # Parse metadata JSON string back to dict
-            metadata = result[0].get("metadata", {})
-            if isinstance(metadata, str):
-                try:
-                    metadata = json.loads(metadata)
-                except json.JSONDecodeError:
-                    metadata = {}
+    async def get_docs_by_file_paths(
+        self, file_paths: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get documents for many file paths with a single query"""
+        if not file_paths:
+            return {}
+        sql = "select * from LIGHTRAG_DOC_STATUS where workspace=$1 and file_path = ANY($2)"
+        params = {"workspace": self.workspace, "file_paths": list(set(file_paths))}
+        rows = await self.db.query(sql, list(params.values()), True)
+
+        result = {}
+        for row in rows or []:
+            if row["file_path"] not in result:
+                result[row["file_path"]] = self._doc_status_row_to_dict(row)
+        return result
 
-            # Convert datetime objects to ISO format strings with timezone info
-            created_at = self._format_datetime_with_timezone(result[0]["created_at"])
-            updated_at = self._format_datetime_with_timezone(result[0]["updated_at"])
+    def _doc_status_row_to_dict(self, row: dict[str, Any]) -> dict[str, Any]:
+        # Parse chunks_list JSON string back to list
+        chunks_list = row.get("chunks_list", [])
+        if isinstance(chunks_list, str):
+            try:
+                chunks_list = json.loads(chunks_list)
+            except json.JSONDecodeError:
+                chunks_list = []
 
-            return dict(
-                content_length=result[0]["content_length"],
-                content_summary=result[0]["content_summary"],
-                status=result[0]["status"],
-                chunks_count=result[0]["chunks_count"],
-                created_at=created_at,
-                updated_at=updated_at,
-                file_path=result[0]["file_path"],
-                chunks_list=chunks_list,
-                metadata=metadata,
-                error_msg=result[0].get("error_msg"),
-                track_id=result[0].get("track_id"),
-            )
+        # Parse metadata JSON string back to dict
+        metadata = row.get("metadata", {})
+        if isinstance(metadata, str):
+            try:
+                metadata = json.loads(metadata)
+            except json.JSONDecodeError:
+                metadata = {}
+
+        # Convert datetime objects to ISO format strings with timezone info
+        created_at = self._format_datetime_with_timezone(row["created_at"])
+        updated_at = self._format_datetime_with_timezone(row["updated_at"])
+
+        return dict(
+            content_length=row["content_length"],
+            content_summary=row["content_summary"],
+            status=row["status"],
+            chunks_count=row["chunks_count"],
+            created_at=created_at,
+            updated_at=updated_at,
+            file_path=row["file_path"],
+            chunks_list=chunks_list,
+            metadata=metadata,
+            error_msg=row.get("error_msg"),
+            track_id=row.get("track_id"),
+        )
 
     async def get_status_counts(self) -> dict[str, int]:
         """Get counts of documents in each status"""
@@ -3044,14 +3222,14 @@ class PGDocStatusStorage(DocStatusStorage):
                   error_msg = EXCLUDED.error_msg,
                   created_at = EXCLUDED.created_at,
                   updated_at = EXCLUDED.updated_at"""
+        rows = []
         for k, v in data.items():
             # Remove timezone information, store utc time in db
             created_at = parse_datetime(v.get("created_at"))
             updated_at = parse_datetime(v.get("updated_at"))
 
             # chunks_count, chunks_list, track_id, metadata, and error_msg are optional
-            await self.db.execute(
-                sql,
+            rows.append(
                 {
                     "workspace": self.workspace,
                     "id": k,
@@ -3068,8 +3246,9 @@ class PGDocStatusStorage(DocStatusStorage):
                     "error_msg": v.get("error_msg"),  # Add error_msg support
                     "created_at": created_at,  # Use the converted datetime object
                     "updated_at": updated_at,  # Use the converted datetime object
-                },
+                }
             )
+        await self.db.executemany(sql, rows)
 
     async def drop(self) -> dict[str, str]:
         """Drop the storage"""
@@ -4998,8 +5177,8 @@ SQL_TEMPLATES = {
                             EXTRACT(EPOCH FROM r.create_time)::BIGINT AS created_at
                      FROM LIGHTRAG_VDB_RELATION r
                      WHERE r.workspace = $1
-                       AND r.content_vector <=> '[{embedding_string}]'::vector < $2
-                     ORDER BY r.content_vector <=> '[{embedding_string}]'::vector
+                       AND r.content_vector <=> $4::vector < $2
+                     ORDER BY r.content_vector <=> $4::vector
                      LIMIT $3;
                      """,
     "entities": """
@@ -5007,8 +5186,8 @@ SQL_TEMPLATES = {
                        EXTRACT(EPOCH FROM e.create_time)::BIGINT AS created_at
                 FROM LIGHTRAG_VDB_ENTITY e
                 WHERE e.workspace = $1
-                  AND e.content_vector <=> '[{embedding_string}]'::vector < $2
-                ORDER BY e.content_vector <=> '[{embedding_string}]'::vector
+                  AND e.content_vector <=> $4::vector < $2
+                ORDER BY e.content_vector <=> $4::vector
                 LIMIT $3;
                 """,
     "chunks": """
@@ -5018,8 +5197,8 @@ SQL_TEMPLATES = {
                      EXTRACT(EPOCH FROM c.create_time)::BIGINT AS created_at
               FROM LIGHTRAG_VDB_CHUNKS c
               WHERE c.workspace = $1
-                AND c.content_vector <=> '[{embedding_string}]'::vector < $2
-              ORDER BY c.content_vector <=> '[{embedding_string}]'::vector
+                AND c.content_vector <=> $4::vector < $2
+              ORDER BY c.content_vector <=> $4::vector
               LIMIT $3;
               """,
     # DROP tables
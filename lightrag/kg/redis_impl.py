@@ -1,6 +1,6 @@
 import os
 import logging
-from typing import Any, final, Union
+from typing import Any, AsyncIterator, final, Union
 from dataclasses import dataclass
 import pipmaster as pm
 import configparser
@@ -41,6 +41,49 @@ MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "200"))
 SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "30.0"))
 SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "10.0"))
 RETRY_ATTEMPTS = int(os.getenv("REDIS_RETRY_ATTEMPTS", "3"))
+# KV storage layout: "string" keeps one key per record, "hash" keeps each namespace in one hash
+KV_LAYOUT = os.getenv("REDIS_KV_LAYOUT", "string").lower()
+# Keys per SCAN/HSCAN step and per MGET/HMGET/upsert script call
+SCAN_BATCH_SIZE = int(os.getenv("REDIS_SCAN_BATCH_SIZE", "1000"))
+
+# Upsert records keeping the create_time of existing ones, in one server side step.
+# Each ARGV record is a JSON object without its closing brace; create_time is
+# read from the decoded top level of the stored value, so a nested object with
+# its own create_time field cannot be mistaken for it.
+_KEEP_CREATE_TIME_LUA = """
+local function stored_create_time(old, now)
+    if not old then
+        return now
+    end
+    local ok, record = pcall(cjson.decode, old)
+    if ok and type(record) == 'table' and type(record.create_time) == 'number' then
+        return string.format('%d', record.create_time)
+    end
+    return now
+end
+"""
+UPSERT_STRING_SCRIPT = (
+    _KEEP_CREATE_TIME_LUA
+    + """
+local now = ARGV[1]
+for i, key in ipairs(KEYS) do
+    local create_time = stored_create_time(redis.call('GET', key), now)
+    redis.call('SET', key, ARGV[i + 1] .. ', "create_time": ' .. create_time .. '}')
+end
+return #KEYS
+"""
+)
+UPSERT_HASH_SCRIPT = (
+    _KEEP_CREATE_TIME_LUA
+    + """
+local now = ARGV[1]
+for i = 2, #ARGV, 2 do
+    local create_time = stored_create_time(redis.call('HGET', KEYS[1], ARGV[i]), now)
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1] .. ', "create_time": ' .. create_time .. '}')
+end
+return (#ARGV - 1) / 2
+"""
+)
 
 # Tenacity retry decorator for Redis operations
 redis_retry = retry(
@@ -167,6 +210,10 @@ class RedisKVStorage(BaseKVStorage):
             # Use shared connection pool
             self._pool = RedisConnectionManager.get_pool(self._redis_url)
             self._redis = Redis(connection_pool=self._pool)
+            self._upsert_string_script = self._redis.register_script(
+                UPSERT_STRING_SCRIPT
+            )
+            self._upsert_hash_script = self._redis.register_script(UPSERT_HASH_SCRIPT)
             logger.info(
                 f"[{self.workspace}] Initialized Redis KV storage for {self.namespace} using shared connection pool"
             )
@@ -209,6 +256,14 @@ class RedisKVStorage(BaseKVStorage):
                     )
                     # Don't fail initialization for migration errors, just log them
 
+            if KV_LAYOUT == "hash":
+                try:
+                    await self._migrate_to_hash_layout()
+                except Exception as e:
+                    logger.error(
+                        f"[{self.workspace}] Failed to migrate {self.namespace} to the Redis hash layout: {e}"
+                    )
+
     @asynccontextmanager
     async def _get_redis_connection(self):
         """Safe context manager for Redis operations."""
@@ -263,18 +318,80 @@ class RedisKVStorage(BaseKVStorage):
         """Ensure Redis resources are cleaned up when exiting context."""
         await self.close()
 
+    def _key(self, id: str) -> str:
+        return f"{self.final_namespace}:{id}"
+
+    @property
+    def _hash_key(self) -> str:
+        # Outside the "{namespace}:*" pattern used by the string layout
+        return self.final_namespace
+
+    @staticmethod
+    def _decode(value: str | None) -> dict[str, Any] | None:
+        if not value:
+            return None
+        data = json.loads(value)
+        # Ensure time fields are present, provide default values for old data
+        data.setdefault("create_time", 0)
+        data.setdefault("update_time", 0)
+        return data
+
+    async def _scan_keys(self, redis) -> AsyncIterator[list[str]]:
+        """Yield batches of the string layout keys of this namespace using SCAN"""
+        cursor = 0
+        while True:
+            cursor, keys = await redis.scan(
+                cursor, match=f"{self.final_namespace}:*", count=SCAN_BATCH_SIZE
+            )
+            if keys:
+                yield keys
+            if cursor == 0:
+                break
+
+    async def _scan_hash(self, redis) -> AsyncIterator[dict[str, str]]:
+        """Yield batches of the hash layout fields of this namespace using HSCAN"""
+        cursor = 0
+        while True:
+            cursor, fields = await redis.hscan(
+                self._hash_key, cursor, count=SCAN_BATCH_SIZE
+            )
+            if fields:
+                yield fields
+            if cursor == 0:
+                break
+
+    async def _migrate_to_hash_layout(self) -> None:
+        """Move records stored as one key per record into the namespace hash"""
+        async with self._get_redis_connection() as redis:
+            migrated = 0
+            async for keys in self._scan_keys(redis):
+                values = await redis.mget(keys)
+                fields = {
+                    key.split(":", 1)[1]: value
+                    for key, value in zip(keys, values)
+                    if value is not None
+                }
+                pipe = redis.pipeline(transaction=True)
+                if fields:
+                    pipe.hset(self._hash_key, mapping=fields)
+                pipe.unlink(*keys)
+                await pipe.execute()
+                migrated += len(fields)
+
+            if migrated:
+                logger.info(
+                    f"[{self.workspace}] Migrated {migrated} records of {self.namespace} to the Redis hash layout"
+                )
+
     @redis_retry
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
         async with self._get_redis_connection() as redis:
             try:
-                data = await redis.get(f"{self.final_namespace}:{id}")
-                if data:
-                    result = json.loads(data)
-                    # Ensure time fields are present, provide default values for old data
-                    result.setdefault("create_time", 0)
-                    result.setdefault("update_time", 0)
-                    return result
-                return None
+                if KV_LAYOUT == "hash":
+                    data = await redis.hget(self._hash_key, id)
+                else:
+                    data = await redis.get(self._key(id))
+                return self._decode(data)
             except json.JSONDecodeError as e:
                 logger.error(f"[{self.workspace}] JSON decode error for id {id}: {e}")
                 return None
@@ -283,23 +400,17 @@ class RedisKVStorage(BaseKVStorage):
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         async with self._get_redis_connection() as redis:
             try:
-                pipe = redis.pipeline()
-                for id in ids:
-                    pipe.get(f"{self.final_namespace}:{id}")
-                results = await pipe.execute()
-
-                processed_results = []
-                for result in results:
-                    if result:
-                        data = json.loads(result)
-                        # Ensure time fields are present for all documents
-                        data.setdefault("create_time", 0)
-                        data.setdefault("update_time", 0)
-                        processed_results.append(data)
+                # One MGET/HMGET per batch, all batches in a single round trip
+                pipe = redis.pipeline(transaction=False)
+                for i in range(0, len(ids), SCAN_BATCH_SIZE):
+                    batch = ids[i : i + SCAN_BATCH_SIZE]
+                    if KV_LAYOUT == "hash":
+                        pipe.hmget(self._hash_key, batch)
                     else:
-                        processed_results.append(None)
+                        pipe.mget([self._key(id) for id in batch])
+                results = await pipe.execute()
 
-                return processed_results
+                return [self._decode(value) for batch in results for value in batch]
             except json.JSONDecodeError as e:
                 logger.error(f"[{self.workspace}] JSON decode error in batch get: {e}")
                 return [None] * len(ids)
@@ -307,40 +418,39 @@ class RedisKVStorage(BaseKVStorage):
     async def get_all(self) -> dict[str, Any]:
         """Get all data from storage
 
+        Iterates with SCAN/HSCAN so Redis is never blocked by a full keyspace walk.
+
         Returns:
             Dictionary containing all stored data
         """
         async with self._get_redis_connection() as redis:
             try:
-                # Get all keys for this namespace
-                keys = await redis.keys(f"{self.final_namespace}:*")
-
-                if not keys:
-                    return {}
-
-                # Get all values in batch
-                pipe = redis.pipeline()
-                for key in keys:
-                    pipe.get(key)
-                values = await pipe.execute()
+                if KV_LAYOUT == "hash":
+                    batches = (
+                        fields.items() async for fields in self._scan_hash(redis)
+                    )
+                else:
+                    batches = (
+                        zip(
+                            (key.split(":", 1)[1] for key in keys),
+                            await redis.mget(keys),
+                        )
+                        async for keys in self._scan_keys(redis)
+                    )
 
                 # Build result dictionary
                 result = {}
-                for key, value in zip(keys, values):
-                    if value:
-                        # Extract the ID part (after namespace:)
-                        key_id = key.split(":", 1)[1]
+                async for batch in batches:
+                    for key_id, value in batch:
                         try:
-                            data = json.loads(value)
-                            # Ensure time fields are present for all documents
-                            data.setdefault("create_time", 0)
-                            data.setdefault("update_time", 0)
-                            result[key_id] = data
+                            data = self._decode(value)
                         except json.JSONDecodeError as e:
                             logger.error(
-                                f"[{self.workspace}] JSON decode error for key {key}: {e}"
+                                f"[{self.workspace}] JSON decode error for key {key_id}: {e}"
                             )
                             continue
+                        if data is not None:
+                            result[key_id] = data
 
                 return result
             except Exception as e:
@@ -351,10 +461,13 @@ class RedisKVStorage(BaseKVStorage):
 
     async def filter_keys(self, keys: set[str]) -> set[str]:
         async with self._get_redis_connection() as redis:
-            pipe = redis.pipeline()
+            pipe = redis.pipeline(transaction=False)
             keys_list = list(keys)  # Convert set to list for indexing
             for key in keys_list:
-                pipe.exists(f"{self.final_namespace}:{key}")
+                if KV_LAYOUT == "hash":
+                    pipe.hexists(self._hash_key, key)
+                else:
+                    pipe.exists(self._key(key))
             results = await pipe.execute()
 
             existing_ids = {keys_list[i] for i, exists in enumerate(results) if exists}
@@ -370,38 +483,41 @@ class RedisKVStorage(BaseKVStorage):
         current_time = int(time.time())  # Get current Unix timestamp
 
         async with self._get_redis_connection() as redis:
-            try:
-                # Check which keys already exist to determine create vs update
-                pipe = redis.pipeline()
-                for k in data.keys():
-                    pipe.exists(f"{self.final_namespace}:{k}")
-                exists_results = await pipe.execute()
-
-                # Add timestamps to data
-                for i, (k, v) in enumerate(data.items()):
-                    # For text_chunks namespace, ensure llm_cache_list field exists
-                    if self.namespace.endswith("text_chunks"):
-                        if "llm_cache_list" not in v:
-                            v["llm_cache_list"] = []
-
-                    # Add timestamps based on whether key exists
-                    if exists_results[i]:  # Key exists, only update update_time
-                        v["update_time"] = current_time
-                    else:  # New key, set both create_time and update_time
-                        v["create_time"] = current_time
-                        v["update_time"] = current_time
-
-                    v["_id"] = k
-
-                # Store the data
-                pipe = redis.pipeline()
-                for k, v in data.items():
-                    pipe.set(f"{self.final_namespace}:{k}", json.dumps(v))
-                await pipe.execute()
-
-            except json.JSONDecodeError as e:
-                logger.error(f"[{self.workspace}] JSON decode error during upsert: {e}")
-                raise
+            # Records are sent without create_time; the upsert scripts append
+            # the stored create_time, or the current time for new records
+            prefixes = {}
+            for k, v in data.items():
+                # For text_chunks namespace, ensure llm_cache_list field exists
+                if self.namespace.endswith("text_chunks"):
+                    if "llm_cache_list" not in v:
+                        v["llm_cache_list"] = []
+
+                v["update_time"] = current_time
+                v["_id"] = k
+                record = {
+                    field: value for field, value in v.items() if field != "create_time"
+                }
+                prefixes[k] = json.dumps(record)[:-1]
+
+            # One script call per batch, all batches in a single round trip
+            pipe = redis.pipeline(transaction=False)
+            items = list(prefixes.items())
+            for i in range(0, len(items), SCAN_BATCH_SIZE):
+                batch = items[i : i + SCAN_BATCH_SIZE]
+                if KV_LAYOUT == "hash":
+                    args = [current_time]
+                    for k, prefix in batch:
+                        args.extend((k, prefix))
+                    await self._upsert_hash_script(
+                        keys=[self._hash_key], args=args, client=pipe
+                    )
+                else:
+                    await self._upsert_string_script(
+                        keys=[self._key(k) for k, _ in batch],
+                        args=[current_time] + [prefix for _, prefix in batch],
+                        client=pipe,
+                    )
+            await pipe.execute()
 
     async def index_done_callback(self) -> None:
         # Redis handles persistence automatically
@@ -413,9 +529,13 @@ class RedisKVStorage(BaseKVStorage):
             return
 
         async with self._get_redis_connection() as redis:
-            pipe = redis.pipeline()
-            for id in ids:
-                pipe.delete(f"{self.final_namespace}:{id}")
+            pipe = redis.pipeline(transaction=False)
+            for i in range(0, len(ids), SCAN_BATCH_SIZE):
+                batch = ids[i : i + SCAN_BATCH_SIZE]
+                if KV_LAYOUT == "hash":
+                    pipe.hdel(self._hash_key, *batch)
+                else:
+                    pipe.delete(*(self._key(id) for id in batch))
 
             results = await pipe.execute()
             deleted_count = sum(results)
@@ -432,25 +552,14 @@ class RedisKVStorage(BaseKVStorage):
         async with get_storage_lock():
             async with self._get_redis_connection() as redis:
                 try:
-                    # Use SCAN to find all keys with the namespace prefix
-                    pattern = f"{self.final_namespace}:*"
-                    cursor = 0
-                    deleted_count = 0
-
-                    while True:
-                        cursor, keys = await redis.scan(
-                            cursor, match=pattern, count=1000
-                        )
-                        if keys:
-                            # Delete keys in batches
-                            pipe = redis.pipeline()
-                            for key in keys:
-                                pipe.delete(key)
-                            results = await pipe.execute()
-                            deleted_count += sum(results)
-
-                        if cursor == 0:
-                            break
+                    if KV_LAYOUT == "hash":
+                        deleted_count = await redis.hlen(self._hash_key)
+                        # UNLINK frees the hash in the background
+                        await redis.unlink(self._hash_key)
+                    else:
+                        deleted_count = 0
+                        async for keys in self._scan_keys(redis):
+                            deleted_count += await redis.unlink(*keys)
 
                     logger.info(
                         f"[{self.workspace}] Dropped {deleted_count} keys from {self.namespace}"
@@ -473,32 +582,38 @@ class RedisKVStorage(BaseKVStorage):
         legacy keys that might contain nested JSON structures and migrate them.
 
         Early exit if any flattened key is found (indicating migration already done).
+        Legacy structures only exist in the string layout, so this runs before
+        records are moved into the hash layout.
         """
         from lightrag.utils import generate_cache_key
 
         async with self._get_redis_connection() as redis:
-            # Get all keys for this namespace
-            keys = await redis.keys(f"{self.final_namespace}:*")
-
-            if not keys:
+            if await redis.exists(self._hash_key):
+                # Already using the hash layout, written by the current version
                 return
 
-            # Check if we have any flattened keys already - if so, skip migration
-            has_flattened_keys = False
             keys_to_migrate = []
 
-            for key in keys:
-                # Extract the ID part (after namespace:)
-                key_id = key.split(":", 1)[1]
-
-                # Check if already in flattened format (contains exactly 2 colons for mode:cache_type:hash)
-                if ":" in key_id and len(key_id.split(":")) == 3:
-                    has_flattened_keys = True
-                    break  # Early exit - migration already done
+            async for keys in self._scan_keys(redis):
+                candidates = []
+                for key in keys:
+                    # Extract the ID part (after namespace:)
+                    key_id = key.split(":", 1)[1]
+
+                    # Check if already in flattened format (contains exactly 2 colons for mode:cache_type:hash)
+                    if ":" in key_id and len(key_id.split(":")) == 3:
+                        # Found flattened keys, assume migration is already done
+                        logger.debug(
+                            f"[{self.workspace}] Found flattened cache keys in {self.namespace}, skipping migration"
+                        )
+                        return
+                    candidates.append((key, key_id))
 
                 # Get the data to check if it's a legacy nested structure
-                data = await redis.get(key)
-                if data:
+                values = await redis.mget([key for key, _ in candidates])
+                for (key, key_id), data in zip(candidates, values):
+                    if not data:
+                        continue
                     try:
                         parsed_data = json.loads(data)
                         # Check if this looks like a legacy cache mode with nested structure
@@ -510,13 +625,6 @@ class RedisKVStorage(BaseKVStorage):
                     except json.JSONDecodeError:
                         continue
 
-            # If we found any flattened keys, assume migration is already done
-            if has_flattened_keys:
-                logger.debug(
-                    f"[{self.workspace}] Found flattened cache keys in {self.namespace}, skipping migration"
-                )
-                return
-
             if not keys_to_migrate:
                 return
 
@@ -1100,6 +1208,43 @@ class RedisDocStatusStorage(DocStatusStorage):
                 logger.error(f"[{self.workspace}] Error in get_doc_by_file_path: {e}")
                 return None
 
+    async def get_docs_by_file_paths(
+        self, file_paths: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Get documents for many file paths in a single SCAN over the namespace"""
+        wanted = set(file_paths)
+        result = {}
+        if not wanted:
+            return result
+        async with self._get_redis_connection() as redis:
+            try:
+                cursor = 0
+                while True:
+                    cursor, keys = await redis.scan(
+                        cursor, match=f"{self.final_namespace}:*", count=1000
+                    )
+                    if keys:
+                        values = await redis.mget(keys)
+                        for value in values:
+                            if not value:
+                                continue
+                            try:
+                                doc_data = json.loads(value)
+                            except json.JSONDecodeError as e:
+                                logger.error(
+                                    f"[{self.workspace}] JSON decode error in get_docs_by_file_paths: {e}"
+                                )
+                                continue
+                            file_path = doc_data.get("file_path")
+                            if file_path in wanted and file_path not in result:
+                                result[file_path] = doc_data
+
+                    if cursor == 0 or len(result) == len(wanted):
+                        break
+            except Exception as e:
+                logger.error(f"[{self.workspace}] Error in get_docs_by_file_paths: {e}")
+        return result
+
     async def drop(self) -> dict[str, str]:
         """Drop all document status data from storage and clean up resources"""
         async with get_storage_lock():
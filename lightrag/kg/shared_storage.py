@@ -88,6 +88,12 @@ _data_init_lock: Optional[LockType] = None
 # Manager for all keyed locks
 _storage_keyed_lock: Optional["KeyedUnifiedLock"] = None
 
+# Per-namespace storage locks: shared registry (multiprocess) and local lock cache
+_namespace_lock_registry: Optional[Dict[str, mp.synchronize.Lock]] = None
+_namespace_locks: Optional[Dict[str, Any]] = None
+# Per-process wait statistics of the per-namespace storage locks
+_namespace_lock_stats: Optional[Dict[str, Dict[str, float]]] = None
+
 # async locks for coroutine synchronization in multiprocess mode
 _async_locks: Optional[Dict[str, asyncio.Lock]] = None
 
@@ -127,6 +133,7 @@ class UnifiedLock(Generic[T]):
         name: str = "unnamed",
         enable_logging: bool = True,
         async_lock: Optional[asyncio.Lock] = None,
+        wait_stats: Optional[Dict[str, float]] = None,
     ):
         self._lock = lock
         self._is_async = is_async
@@ -134,8 +141,10 @@ class UnifiedLock(Generic[T]):
         self._name = name  # for debug only
         self._enable_logging = enable_logging  # for debug only
         self._async_lock = async_lock  # auxiliary lock for coroutine synchronization
+        self._wait_stats = wait_stats  # wait time accounting, see _record_lock_wait
 
     async def __aenter__(self) -> "UnifiedLock[T]":
+        wait_start = time.perf_counter()
         try:
             # If in multiprocess mode and async lock exists, acquire it first
             if not self._is_async and self._async_lock is not None:
@@ -151,6 +160,8 @@ class UnifiedLock(Generic[T]):
             else:
                 self._lock.acquire()
 
+            if self._wait_stats is not None:
+                _record_lock_wait(self._wait_stats, time.perf_counter() - wait_start)
             direct_log(
                 f"== Lock == Process {self._pid}: Lock '{self._name}' acquired (async={self._is_async})",
                 enable_output=self._enable_logging,
@@ -280,6 +291,19 @@ class UnifiedLock(Generic[T]):
             return self._lock.locked()
 
 
+# Waits longer than this count as contended acquisitions
+LOCK_CONTENTION_THRESHOLD = 0.001
+
+
+def _record_lock_wait(stats: Dict[str, float], wait: float) -> None:
+    stats["acquisitions"] += 1
+    stats["total_wait"] += wait
+    if wait > stats["max_wait"]:
+        stats["max_wait"] = wait
+    if wait > LOCK_CONTENTION_THRESHOLD:
+        stats["contended"] += 1
+
+
 def _get_combined_key(factory_name: str, key: str) -> str:
     """Return the combined key for the factory and key."""
     return f"{factory_name}:{key}"
@@ -837,8 +861,19 @@ def get_internal_lock(enable_logging: bool = False) -> UnifiedLock:
     )
 
 
-def get_storage_lock(enable_logging: bool = False) -> UnifiedLock:
-    """return unified storage lock for data consistency"""
+def get_storage_lock(
+    enable_logging: bool = False, namespace: Optional[str] = None
+) -> UnifiedLock:
+    """return unified storage lock for data consistency
+
+    Args:
+        enable_logging: Log lock acquisition and release.
+        namespace: Return the lock dedicated to this storage namespace instead of
+            the global storage lock, so that long operations on one namespace do
+            not block the others. Wait times are reported by get_keyed_lock_status().
+    """
+    if namespace is not None:
+        return _get_namespace_lock(namespace, enable_logging)
     async_lock = _async_locks.get("storage_lock") if _is_multiprocess else None
     return UnifiedLock(
         lock=_storage_lock,
@@ -849,6 +884,69 @@ def get_storage_lock(enable_logging: bool = False) -> UnifiedLock:
     )
 
 
+def _get_namespace_lock(namespace: str, enable_logging: bool) -> UnifiedLock:
+    if _namespace_locks is None:
+        raise RuntimeError("Shared-Data is not initialized")
+
+    stats = _namespace_lock_stats.get(namespace)
+    if stats is None:
+        stats = _namespace_lock_stats[namespace] = {
+            "acquisitions": 0,
+            "contended": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+        }
+
+    if not _is_multiprocess:
+        lock = _namespace_locks.get(namespace)
+        if lock is None:
+            lock = _namespace_locks[namespace] = asyncio.Lock()
+        return UnifiedLock(
+            lock=lock,
+            is_async=True,
+            name=f"storage_lock:{namespace}",
+            enable_logging=enable_logging,
+            wait_stats=stats,
+        )
+
+    # Cache the manager lock proxy together with this process's async gate
+    locks = _namespace_locks.get(namespace)
+    if locks is None:
+        with _registry_guard:
+            raw_lock = _namespace_lock_registry.get(namespace)
+            if raw_lock is None:
+                raw_lock = _manager.Lock()
+                _namespace_lock_registry[namespace] = raw_lock
+        locks = _namespace_locks[namespace] = (raw_lock, asyncio.Lock())
+    raw_lock, async_lock = locks
+    return UnifiedLock(
+        lock=raw_lock,
+        is_async=False,
+        name=f"storage_lock:{namespace}",
+        enable_logging=enable_logging,
+        async_lock=async_lock,
+        wait_stats=stats,
+    )
+
+
+def get_namespace_lock_stats() -> Dict[str, Dict[str, float]]:
+    """Wait statistics of the per-namespace storage locks in this process"""
+    if _namespace_lock_stats is None:
+        return {}
+    return {
+        namespace: {
+            "acquisitions": int(stats["acquisitions"]),
+            "contended": int(stats["contended"]),
+            "total_wait_ms": round(stats["total_wait"] * 1000, 3),
+            "avg_wait_ms": round(stats["total_wait"] * 1000 / stats["acquisitions"], 3)
+            if stats["acquisitions"]
+            else 0.0,
+            "max_wait_ms": round(stats["max_wait"] * 1000, 3),
+        }
+        for namespace, stats in _namespace_lock_stats.items()
+    }
+
+
 def get_pipeline_status_lock(enable_logging: bool = False) -> UnifiedLock:
     """return unified storage lock for data consistency"""
     async_lock = _async_locks.get("pipeline_status_lock") if _is_multiprocess else None
@@ -933,7 +1031,8 @@ def get_keyed_lock_status() -> Dict[str, Any]:
     for both multiprocess and async locks, including pending cleanup counts.
 
     Returns:
-        Same as get_lock_status in KeyedUnifiedLock
+        Same as get_lock_status in KeyedUnifiedLock, plus "namespace_locks" with
+        the wait statistics of each per-namespace storage lock in this process
     """
     global _storage_keyed_lock
 
@@ -945,10 +1044,12 @@ def get_keyed_lock_status() -> Dict[str, Any]:
             "pending_mp_cleanup": 0,
             "total_async_locks": 0,
             "pending_async_cleanup": 0,
+            "namespace_locks": {},
         }
 
     status = _storage_keyed_lock.get_lock_status()
     status["process_id"] = os.getpid()
+    status["namespace_locks"] = get_namespace_lock_stats()
     return status
 
 
@@ -989,6 +1090,9 @@ def initialize_share_data(workers: int = 1):
         _update_flags, \
         _async_locks, \
         _storage_keyed_lock, \
+        _namespace_lock_registry, \
+        _namespace_locks, \
+        _namespace_lock_stats, \
         _earliest_mp_cleanup_time, \
         _last_mp_cleanup_time
 
@@ -1016,6 +1120,7 @@ def initialize_share_data(workers: int = 1):
         _shared_dicts = _manager.dict()
         _init_flags = _manager.dict()
         _update_flags = _manager.dict()
+        _namespace_lock_registry = _manager.dict()
 
         _storage_keyed_lock = KeyedUnifiedLock()
 
@@ -1046,6 +1151,9 @@ def initialize_share_data(workers: int = 1):
         _storage_keyed_lock = KeyedUnifiedLock()
         direct_log(f"Process {os.getpid()} Shared-Data created for Single Process")
 
+    _namespace_locks = {}
+    _namespace_lock_stats = {}
+
     # Initialize multiprocess cleanup times
     _earliest_mp_cleanup_time = None
     _last_mp_cleanup_time = None
@@ -1085,6 +1193,11 @@ async def initialize_pipeline_status():
         direct_log(f"Process {os.getpid()} Pipeline namespace initialized")
 
 
+def is_multiprocess() -> bool:
+    """Whether shared data is shared between worker processes"""
+    return bool(_is_multiprocess)
+
+
 async def get_update_flag(namespace: str):
     """
     Create a namespace's update flag for a workers.
@@ -1250,7 +1363,10 @@ def finalize_share_data():
         _init_flags, \
         _initialized, \
         _update_flags, \
-        _async_locks
+        _async_locks, \
+        _namespace_lock_registry, \
+        _namespace_locks, \
+        _namespace_lock_stats
 
     # Check if already initialized
     if not _initialized:
@@ -1316,5 +1432,8 @@ def finalize_share_data():
     _data_init_lock = None
     _update_flags = None
     _async_locks = None
+    _namespace_lock_registry = None
+    _namespace_locks = None
+    _namespace_lock_stats = None
 
     direct_log(f"Process {os.getpid()} storage data finalization complete")
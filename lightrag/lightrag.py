@@ -9,11 +9,13 @@ import warnings
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from functools import partial
+from types import MappingProxyType
 from typing import (
     Any,
     AsyncIterator,
     Callable,
     Iterator,
+    Mapping,
     cast,
     final,
     Literal,
@@ -39,11 +41,17 @@ from lightrag.constants import (
     DEFAULT_SUMMARY_LENGTH_RECOMMENDED,
     DEFAULT_MAX_ASYNC,
     DEFAULT_MAX_PARALLEL_INSERT,
+    DEFAULT_PIPELINE_QUEUE_SIZE,
     DEFAULT_MAX_GRAPH_NODES,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
+    DEFAULT_SUMMARY_MAX_REDUCE_DEPTH,
     DEFAULT_LLM_TIMEOUT,
     DEFAULT_EMBEDDING_TIMEOUT,
+    DEFAULT_MERGE_VDB_BATCH_UPSERT,
+    DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    DEFAULT_SEMANTIC_CACHE_TTL,
 )
 from lightrag.utils import get_env_value
 
@@ -58,6 +66,8 @@ from lightrag.kg.shared_storage import (
     get_pipeline_status_lock,
     get_graph_db_lock,
     get_data_init_lock,
+    get_storage_lock,
+    get_storage_keyed_lock,
 )
 
 from lightrag.base import (
@@ -75,6 +85,11 @@ from lightrag.base import (
     QueryResult,
 )
 from lightrag.namespace import NameSpace
+from lightrag.llm.client_registry import (
+    acquire_client_lease,
+    release_client_lease,
+)
+from lightrag.pipeline import PipelineStage, StagedPipeline, parse_stage_workers
 from lightrag.operate import (
     chunking_by_token_size,
     extract_entities,
@@ -89,6 +104,7 @@ from lightrag.utils import (
     TiktokenTokenizer,
     EmbeddingFunc,
     always_get_an_event_loop,
+    compute_args_hash,
     compute_mdhash_id,
     lazy_external_import,
     priority_limit_async_func_call,
@@ -97,6 +113,7 @@ from lightrag.utils import (
     check_storage_env_vars,
     generate_track_id,
     convert_to_user_format,
+    SemanticQueryCache,
     logger,
 )
 from lightrag.types import KnowledgeGraph
@@ -248,7 +265,7 @@ class LightRAG:
         - `chunk_token_size`: The maximum number of tokens per chunk.
         - `chunk_overlap_token_size`: The number of overlapping tokens between consecutive chunks.
 
-    The function should return a list of dictionaries, where each dictionary contains the following keys:
+    The function is called in a worker thread. It should return a list (or any iterable) of dictionaries, where each dictionary contains the following keys:
         - `tokens`: The number of tokens in the chunk.
         - `content`: The text content of the chunk.
 
@@ -269,17 +286,28 @@ class LightRAG:
     )
     """Maximum number of concurrent embedding function calls."""
 
+    merge_vdb_batch_upsert: bool = field(
+        default=get_env_value(
+            "MERGE_VDB_BATCH_UPSERT", DEFAULT_MERGE_VDB_BATCH_UPSERT, bool
+        )
+    )
+    """If True, entity/relation vectors produced while merging a document are embedded in full batches and written with one upsert per vector storage, instead of one embedding call per entity or relation."""
+
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
             "enabled": False,
-            "similarity_threshold": 0.95,
+            "similarity_threshold": DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
             "use_llm_check": False,
+            "max_entries": DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+            "ttl": DEFAULT_SEMANTIC_CACHE_TTL,
         }
     )
-    """Configuration for embedding cache.
-    - enabled: If True, enables caching to avoid redundant computations.
-    - similarity_threshold: Minimum similarity score to use cached embeddings.
-    - use_llm_check: If True, validates cached embeddings using an LLM.
+    """Configuration for the semantic query cache, which reuses the answer of a previous query whose embedding is similar enough.
+    - enabled: If True, answers of local/global/hybrid/mix/naive queries are cached and matched by query embedding.
+    - similarity_threshold: Minimum cosine similarity between queries to reuse a cached answer.
+    - use_llm_check: If True, an LLM confirms that the cached question can be answered the same way.
+    - max_entries: Maximum number of cached answers, least recently used entries are evicted first.
+    - ttl: Seconds before a cached answer expires, 0 disables expiry. The cache is also cleared after inserts and deletions.
     """
 
     default_embedding_timeout: int = field(
@@ -312,6 +340,13 @@ class LightRAG:
     )
     """Recommended length of LLM summary output."""
 
+    summary_max_reduce_depth: int = field(
+        default=get_env_value(
+            "SUMMARY_MAX_REDUCE_DEPTH", DEFAULT_SUMMARY_MAX_REDUCE_DEPTH, int
+        )
+    )
+    """Maximum map-reduce rounds for summarizing long description lists; remaining summaries are then truncated into one final summary."""
+
     llm_model_max_async: int = field(
         default=int(os.getenv("MAX_ASYNC", DEFAULT_MAX_ASYNC))
     )
@@ -355,6 +390,17 @@ class LightRAG:
     )
     """Maximum number of parallel insert operations."""
 
+    pipeline_stage_workers: dict[str, int] = field(
+        default_factory=lambda: parse_stage_workers(os.getenv("PIPELINE_STAGE_WORKERS"))
+    )
+    """Worker count per ingestion stage (chunk, embed, extract, merge, persist).
+    Chunk, embed and extract default to `max_parallel_insert`, merge and persist to 1."""
+
+    pipeline_queue_size: int = field(
+        default=get_env_value("PIPELINE_QUEUE_SIZE", DEFAULT_PIPELINE_QUEUE_SIZE, int)
+    )
+    """Maximum number of documents waiting in front of each ingestion stage."""
+
     max_graph_nodes: int = field(
         default=get_env_value("MAX_GRAPH_NODES", DEFAULT_MAX_GRAPH_NODES, int)
     )
@@ -385,6 +431,37 @@ class LightRAG:
 
     _storages_status: StoragesStatus = field(default=StoragesStatus.NOT_CREATED)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Assigning any config field invalidates the cached global_config snapshot
+        if name in self.__dataclass_fields__:
+            self.__dict__["_config_snapshot"] = None
+        object.__setattr__(self, name, value)
+
+    @property
+    def global_config(self) -> Mapping[str, Any]:
+        """Read-only snapshot of the config fields, equivalent to ``asdict(self)``.
+
+        The snapshot is built lazily and reused until a field is reassigned or
+        one of the dict/list fields (``addon_params``, ``llm_model_kwargs``, ...)
+        is changed in place, so query and indexing hot paths no longer pay for
+        a deep copy of the whole instance on every call.
+        """
+        snapshot = self.__dict__.get("_config_snapshot")
+        if snapshot is not None and all(
+            getattr(self, name) == snapshot[name]
+            for name in self.__dict__["_config_snapshot_containers"]
+        ):
+            return snapshot
+
+        snapshot = MappingProxyType(asdict(self))
+        self.__dict__["_config_snapshot"] = snapshot
+        self.__dict__["_config_snapshot_containers"] = tuple(
+            name
+            for name, value in snapshot.items()
+            if isinstance(value, (dict, list, set))
+        )
+        return snapshot
+
     def __post_init__(self):
         from lightrag.kg.shared_storage import (
             initialize_share_data,
@@ -578,6 +655,30 @@ class LightRAG:
             )
         )
 
+        # Semantic cache of query answers (see embedding_cache_config)
+        self.semantic_query_cache: SemanticQueryCache | None = None
+        self._semantic_cache_namespace = (
+            f"{self.workspace}_semantic_query_cache"
+            if self.workspace
+            else "semantic_query_cache"
+        )
+        if self.embedding_cache_config.get("enabled"):
+            self.semantic_query_cache = SemanticQueryCache(
+                similarity_threshold=self.embedding_cache_config.get(
+                    "similarity_threshold", DEFAULT_SEMANTIC_CACHE_SIMILARITY_THRESHOLD
+                ),
+                max_entries=self.embedding_cache_config.get(
+                    "max_entries", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES
+                ),
+                ttl=self.embedding_cache_config.get("ttl", DEFAULT_SEMANTIC_CACHE_TTL),
+                llm_check_func=partial(self.llm_model_func, _priority=5)
+                if self.embedding_cache_config.get("use_llm_check")
+                else None,
+            )
+
+        # Lease on the shared HTTP clients, held between initialize and finalize
+        self._client_lease = None
+
         self._storages_status = StoragesStatus.CREATED
 
     async def initialize_storages(self):
@@ -599,6 +700,14 @@ class LightRAG:
                     # logger.debug(f"Initializing storage: {storage}")
                     await storage.initialize()
 
+            if self.semantic_query_cache is not None:
+                # Keyed on a generation shared by all workers, see _invalidate_semantic_cache
+                self.semantic_query_cache.attach_shared_state(
+                    await get_namespace_data(self._semantic_cache_namespace)
+                )
+
+            self._client_lease = acquire_client_lease()
+
             self._storages_status = StoragesStatus.INITIALIZED
             logger.debug("All storage types initialized")
 
@@ -646,6 +755,15 @@ class LightRAG:
             else:
                 logger.debug("All storages finalized successfully")
 
+            # Release the keep-alive connections of shared LLM/embedding/rerank
+            # clients, unless other instances on this loop still use them
+            if self._client_lease is not None:
+                try:
+                    await release_client_lease(self._client_lease)
+                except Exception as e:
+                    logger.error(f"Failed to close shared HTTP clients: {e}")
+                self._client_lease = None
+
             self._storages_status = StoragesStatus.FINALIZED
 
     async def check_and_migrate_data(self):
@@ -839,6 +957,27 @@ class LightRAG:
             node_label, max_depth, max_nodes
         )
 
+    async def iter_knowledge_graph(
+        self,
+        node_label: str,
+        max_depth: int = 3,
+        max_nodes: int = None,
+    ) -> AsyncIterator[KnowledgeGraph]:
+        """Stream the knowledge graph for a given label as partial KnowledgeGraph batches
+
+        Batches arrive as the graph storage finds nodes; only the last one
+        carries the is_truncated flag. See `get_knowledge_graph` for arguments.
+        """
+        if max_nodes is None:
+            max_nodes = self.max_graph_nodes
+        else:
+            max_nodes = min(max_nodes, self.max_graph_nodes)
+
+        async for batch in self.chunk_entity_relation_graph.iter_knowledge_graph(
+            node_label, max_depth, max_nodes
+        ):
+            yield batch
+
     def _get_storage_class(self, storage_name: str) -> Callable[..., Any]:
         # Direct imports for default storage implementations
         if storage_name == "JsonKVStorage":
@@ -1110,49 +1249,58 @@ class LightRAG:
         # 3. Filter out already processed documents
         # Get docs ids
         all_new_doc_ids = set(new_docs.keys())
-        # Exclude IDs of documents that are already enqueued
-        unique_new_doc_ids = await self.doc_status.filter_keys(all_new_doc_ids)
-
-        # Log ignored document IDs (documents that were filtered out because they already exist)
-        ignored_ids = list(all_new_doc_ids - unique_new_doc_ids)
-        if ignored_ids:
-            for doc_id in ignored_ids:
-                file_path = new_docs.get(doc_id, {}).get("file_path", "unknown_source")
-                logger.warning(
-                    f"Ignoring document ID (already exists): {doc_id} ({file_path})"
-                )
-            if len(ignored_ids) > 3:
-                logger.warning(
-                    f"Total Ignoring {len(ignored_ids)} document IDs that already exist in storage"
-                )
+        # Concurrent enqueues of the same content must not both pass the filter
+        # and overwrite each other's status, so the check and the upserts below
+        # run under a lock on the document ids
+        namespace = f"{self.workspace}:DocStatus" if self.workspace else "DocStatus"
+        async with get_storage_keyed_lock(
+            list(all_new_doc_ids), namespace=namespace, enable_logging=False
+        ):
+            # Exclude IDs of documents that are already enqueued
+            unique_new_doc_ids = await self.doc_status.filter_keys(all_new_doc_ids)
+
+            # Log ignored document IDs (documents that were filtered out because they already exist)
+            ignored_ids = list(all_new_doc_ids - unique_new_doc_ids)
+            if ignored_ids:
+                for doc_id in ignored_ids:
+                    file_path = new_docs.get(doc_id, {}).get(
+                        "file_path", "unknown_source"
+                    )
+                    logger.warning(
+                        f"Ignoring document ID (already exists): {doc_id} ({file_path})"
+                    )
+                if len(ignored_ids) > 3:
+                    logger.warning(
+                        f"Total Ignoring {len(ignored_ids)} document IDs that already exist in storage"
+                    )
 
-        # Filter new_docs to only include documents with unique IDs
-        new_docs = {
-            doc_id: new_docs[doc_id]
-            for doc_id in unique_new_doc_ids
-            if doc_id in new_docs
-        }
+            # Filter new_docs to only include documents with unique IDs
+            new_docs = {
+                doc_id: new_docs[doc_id]
+                for doc_id in unique_new_doc_ids
+                if doc_id in new_docs
+            }
 
-        if not new_docs:
-            logger.warning("No new unique documents were found.")
-            return
+            if not new_docs:
+                logger.warning("No new unique documents were found.")
+                return
 
-        # 4. Store document content in full_docs and status in doc_status
-        #    Store full document content separately
-        full_docs_data = {
-            doc_id: {
-                "content": contents[doc_id]["content"],
-                "file_path": contents[doc_id]["file_path"],
+            # 4. Store document content in full_docs and status in doc_status
+            #    Store full document content separately
+            full_docs_data = {
+                doc_id: {
+                    "content": contents[doc_id]["content"],
+                    "file_path": contents[doc_id]["file_path"],
+                }
+                for doc_id in new_docs.keys()
             }
-            for doc_id in new_docs.keys()
-        }
-        await self.full_docs.upsert(full_docs_data)
-        # Persist data to disk immediately
-        await self.full_docs.index_done_callback()
+            await self.full_docs.upsert(full_docs_data)
+            # Persist data to disk immediately
+            await self.full_docs.index_done_callback()
 
-        # Store document status (without content)
-        await self.doc_status.upsert(new_docs)
-        logger.debug(f"Stored {len(new_docs)} new unique documents")
+            # Store document status (without content)
+            await self.doc_status.upsert(new_docs)
+            logger.debug(f"Stored {len(new_docs)} new unique documents")
 
         return track_id
 
@@ -1468,307 +1616,232 @@ class LightRAG:
 
                 # Create a counter to track the number of processed files
                 processed_count = 0
-                # Create a semaphore to limit the number of concurrent file processing
-                semaphore = asyncio.Semaphore(self.max_parallel_insert)
-
-                async def process_document(
-                    doc_id: str,
-                    status_doc: DocProcessingStatus,
-                    split_by_character: str | None,
-                    split_by_character_only: bool,
-                    pipeline_status: dict,
-                    pipeline_status_lock: asyncio.Lock,
-                    semaphore: asyncio.Semaphore,
-                ) -> None:
-                    """Process single document"""
-                    file_extraction_stage_ok = False
-                    async with semaphore:
-                        nonlocal processed_count
-                        current_file_number = 0
-                        # Initialize to prevent UnboundLocalError in error handling
-                        first_stage_tasks = []
-                        entity_relation_task = None
-                        try:
-                            # Get file path from status document
-                            file_path = getattr(
-                                status_doc, "file_path", "unknown_source"
-                            )
-
-                            async with pipeline_status_lock:
-                                # Update processed file count and save current file number
-                                processed_count += 1
-                                current_file_number = (
-                                    processed_count  # Save the current file number
-                                )
-                                pipeline_status["cur_batch"] = processed_count
-
-                                log_message = f"Extracting stage {current_file_number}/{total_files}: {file_path}"
-                                logger.info(log_message)
-                                pipeline_status["history_messages"].append(log_message)
-                                log_message = f"Processing d-id: {doc_id}"
-                                logger.info(log_message)
-                                pipeline_status["latest_message"] = log_message
-                                pipeline_status["history_messages"].append(log_message)
-
-                                # Prevent memory growth: keep only latest 5000 messages when exceeding 10000
-                                if len(pipeline_status["history_messages"]) > 10000:
-                                    logger.info(
-                                        f"Trimming pipeline history from {len(pipeline_status['history_messages'])} to 5000 messages"
-                                    )
-                                    pipeline_status["history_messages"] = (
-                                        pipeline_status["history_messages"][-5000:]
-                                    )
-
-                            # Get document content from full_docs
-                            content_data = await self.full_docs.get_by_id(doc_id)
-                            if not content_data:
-                                raise Exception(
-                                    f"Document content not found in full_docs for doc_id: {doc_id}"
-                                )
-                            content = content_data["content"]
-
-                            # Generate chunks from document
-                            chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                    "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
-                                }
-                                for dp in self.chunking_func(
-                                    self.tokenizer,
-                                    content,
-                                    split_by_character,
-                                    split_by_character_only,
-                                    self.chunk_overlap_token_size,
-                                    self.chunk_token_size,
-                                )
-                            }
 
-                            if not chunks:
-                                logger.warning("No document chunks to process")
-
-                            # Record processing start time
-                            processing_start_time = int(time.time())
-
-                            # Process document in two stages
-                            # Stage 1: Process text chunks and docs (parallel execution)
-                            doc_status_task = asyncio.create_task(
-                                self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(
-                                                chunks.keys()
-                                            ),  # Save chunks list
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time
-                                            },
-                                        }
-                                    }
-                                )
-                            )
-                            chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
-                            )
-                            text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
-                            )
+                def status_record(job: dict[str, Any], status: DocStatus, **extra):
+                    status_doc = job["status_doc"]
+                    record = {
+                        "status": status,
+                        "content_summary": status_doc.content_summary,
+                        "content_length": status_doc.content_length,
+                        "created_at": status_doc.created_at,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                        "file_path": job["file_path"],
+                        "track_id": status_doc.track_id,  # Preserve existing track_id
+                        "metadata": {
+                            "processing_start_time": job["processing_start_time"]
+                        },
+                    }
+                    record.update(extra)
+                    return record
+
+                # Stages are connected by bounded queues: extraction of the next
+                # documents overlaps with embedding and merging of earlier ones
+                async def chunk_stage(job: dict[str, Any]) -> dict[str, Any]:
+                    nonlocal processed_count
+                    doc_id, file_path = job["doc_id"], job["file_path"]
+                    async with pipeline_status_lock:
+                        # Update processed file count and save current file number
+                        processed_count += 1
+                        job["file_number"] = processed_count
+                        pipeline_status["cur_batch"] = processed_count
 
-                            # First stage tasks (parallel execution)
-                            first_stage_tasks = [
-                                doc_status_task,
-                                chunks_vdb_task,
-                                text_chunks_task,
-                            ]
-                            entity_relation_task = None
-
-                            # Execute first stage tasks
-                            await asyncio.gather(*first_stage_tasks)
-
-                            # Stage 2: Process entity relation graph (after text_chunks are saved)
-                            entity_relation_task = asyncio.create_task(
-                                self._process_extract_entities(
-                                    chunks, pipeline_status, pipeline_status_lock
-                                )
-                            )
-                            await entity_relation_task
-                            file_extraction_stage_ok = True
-
-                        except Exception as e:
-                            # Log error and update pipeline status
-                            logger.error(traceback.format_exc())
-                            error_msg = f"Failed to extract document {current_file_number}/{total_files}: {file_path}"
-                            logger.error(error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(
-                                    traceback.format_exc()
-                                )
-                                pipeline_status["history_messages"].append(error_msg)
+                        log_message = f"Extracting stage {processed_count}/{total_files}: {file_path}"
+                        logger.info(log_message)
+                        pipeline_status["history_messages"].append(log_message)
+                        log_message = f"Processing d-id: {doc_id}"
+                        logger.info(log_message)
+                        pipeline_status["latest_message"] = log_message
+                        pipeline_status["history_messages"].append(log_message)
 
-                            # Cancel tasks that are not yet completed
-                            all_tasks = first_stage_tasks + (
-                                [entity_relation_task] if entity_relation_task else []
+                        # Prevent memory growth: keep only latest 5000 messages when exceeding 10000
+                        if len(pipeline_status["history_messages"]) > 10000:
+                            logger.info(
+                                f"Trimming pipeline history from {len(pipeline_status['history_messages'])} to 5000 messages"
                             )
-                            for task in all_tasks:
-                                if task and not task.done():
-                                    task.cancel()
-
-                            # Persistent llm cache
-                            if self.llm_response_cache:
-                                await self.llm_response_cache.index_done_callback()
-
-                            # Record processing end time for failed case
-                            processing_end_time = int(time.time())
-
-                            # Update document status to failed
-                            await self.doc_status.upsert(
-                                {
-                                    doc_id: {
-                                        "status": DocStatus.FAILED,
-                                        "error_msg": str(e),
-                                        "content_summary": status_doc.content_summary,
-                                        "content_length": status_doc.content_length,
-                                        "created_at": status_doc.created_at,
-                                        "updated_at": datetime.now(
-                                            timezone.utc
-                                        ).isoformat(),
-                                        "file_path": file_path,
-                                        "track_id": status_doc.track_id,  # Preserve existing track_id
-                                        "metadata": {
-                                            "processing_start_time": processing_start_time,
-                                            "processing_end_time": processing_end_time,
-                                        },
-                                    }
-                                }
+                            pipeline_status["history_messages"] = pipeline_status[
+                                "history_messages"
+                            ][-5000:]
+
+                    # Get document content from full_docs
+                    content_data = await self.full_docs.get_by_id(doc_id)
+                    if not content_data:
+                        raise Exception(
+                            f"Document content not found in full_docs for doc_id: {doc_id}"
+                        )
+                    content = content_data["content"]
+
+                    # Generate chunks from document in a worker thread, tokenizing
+                    # large documents would otherwise block the event loop
+                    chunking_result = await asyncio.to_thread(
+                        lambda: list(
+                            self.chunking_func(
+                                self.tokenizer,
+                                content,
+                                split_by_character,
+                                split_by_character_only,
+                                self.chunk_overlap_token_size,
+                                self.chunk_token_size,
                             )
-
-                        # Concurrency is controlled by keyed lock for individual entities and relationships
-                        if file_extraction_stage_ok:
-                            try:
-                                # Get chunk_results from entity_relation_task
-                                chunk_results = await entity_relation_task
-                                await merge_nodes_and_edges(
-                                    chunk_results=chunk_results,  # result collected from entity_relation_task
-                                    knowledge_graph_inst=self.chunk_entity_relation_graph,
-                                    entity_vdb=self.entities_vdb,
-                                    relationships_vdb=self.relationships_vdb,
-                                    global_config=asdict(self),
-                                    full_entities_storage=self.full_entities,
-                                    full_relations_storage=self.full_relations,
-                                    doc_id=doc_id,
-                                    pipeline_status=pipeline_status,
-                                    pipeline_status_lock=pipeline_status_lock,
-                                    llm_response_cache=self.llm_response_cache,
-                                    current_file_number=current_file_number,
-                                    total_files=total_files,
-                                    file_path=file_path,
-                                )
-
-                                # Record processing end time
-                                processing_end_time = int(time.time())
-
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSED,
-                                            "chunks_count": len(chunks),
-                                            "chunks_list": list(chunks.keys()),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
-                                    }
+                        )
+                    )
+                    job["chunks"] = {
+                        compute_mdhash_id(dp["content"], prefix="chunk-"): {
+                            **dp,
+                            "full_doc_id": doc_id,
+                            "file_path": file_path,  # Add file path to each chunk
+                            "llm_cache_list": [],  # Initialize empty LLM cache list for each chunk
+                        }
+                        for dp in chunking_result
+                    }
+                    if not job["chunks"]:
+                        logger.warning("No document chunks to process")
+                    return job
+
+                async def embed_stage(job: dict[str, Any]) -> dict[str, Any]:
+                    chunks = job["chunks"]
+                    # Record processing start time
+                    job["processing_start_time"] = int(time.time())
+                    await asyncio.gather(
+                        self.doc_status.upsert(
+                            {
+                                job["doc_id"]: status_record(
+                                    job,
+                                    DocStatus.PROCESSING,
+                                    chunks_count=len(chunks),
+                                    chunks_list=list(chunks.keys()),
                                 )
+                            }
+                        ),
+                        self.chunks_vdb.upsert(chunks),
+                        self.text_chunks.upsert(chunks),
+                    )
+                    return job
 
-                                # Call _insert_done after processing each file
-                                await self._insert_done()
-
-                                async with pipeline_status_lock:
-                                    log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
-                                    logger.info(log_message)
-                                    pipeline_status["latest_message"] = log_message
-                                    pipeline_status["history_messages"].append(
-                                        log_message
-                                    )
-
-                            except Exception as e:
-                                # Log error and update pipeline status
-                                logger.error(traceback.format_exc())
-                                error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
-                                logger.error(error_msg)
-                                async with pipeline_status_lock:
-                                    pipeline_status["latest_message"] = error_msg
-                                    pipeline_status["history_messages"].append(
-                                        traceback.format_exc()
-                                    )
-                                    pipeline_status["history_messages"].append(
-                                        error_msg
-                                    )
-
-                                # Persistent llm cache
-                                if self.llm_response_cache:
-                                    await self.llm_response_cache.index_done_callback()
-
-                                # Record processing end time for failed case
-                                processing_end_time = int(time.time())
-
-                                # Update document status to failed
-                                await self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.FAILED,
-                                            "error_msg": str(e),
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now().isoformat(),
-                                            "file_path": file_path,
-                                            "track_id": status_doc.track_id,  # Preserve existing track_id
-                                            "metadata": {
-                                                "processing_start_time": processing_start_time,
-                                                "processing_end_time": processing_end_time,
-                                            },
-                                        }
-                                    }
-                                )
+                async def extract_stage(job: dict[str, Any]) -> dict[str, Any]:
+                    job["chunk_results"] = await self._process_extract_entities(
+                        job["chunks"], pipeline_status, pipeline_status_lock
+                    )
+                    return job
 
-                # Create processing tasks for all documents
-                doc_tasks = []
-                for doc_id, status_doc in to_process_docs.items():
-                    doc_tasks.append(
-                        process_document(
-                            doc_id,
-                            status_doc,
-                            split_by_character,
-                            split_by_character_only,
-                            pipeline_status,
-                            pipeline_status_lock,
-                            semaphore,
+                async def merge_stage(job: dict[str, Any]) -> dict[str, Any]:
+                    # Concurrency is controlled by keyed lock for individual entities and relationships
+                    await merge_nodes_and_edges(
+                        chunk_results=job.pop("chunk_results"),
+                        knowledge_graph_inst=self.chunk_entity_relation_graph,
+                        entity_vdb=self.entities_vdb,
+                        relationships_vdb=self.relationships_vdb,
+                        global_config=self.global_config,
+                        full_entities_storage=self.full_entities,
+                        full_relations_storage=self.full_relations,
+                        doc_id=job["doc_id"],
+                        pipeline_status=pipeline_status,
+                        pipeline_status_lock=pipeline_status_lock,
+                        llm_response_cache=self.llm_response_cache,
+                        current_file_number=job["file_number"],
+                        total_files=total_files,
+                        file_path=job["file_path"],
+                    )
+                    return job
+
+                async def persist_stage(jobs: list[dict[str, Any]]) -> list:
+                    # Documents merged while the previous flush ran are persisted together
+                    processing_end_time = int(time.time())
+                    records = {}
+                    for job in jobs:
+                        record = status_record(
+                            job,
+                            DocStatus.PROCESSED,
+                            chunks_count=len(job["chunks"]),
+                            chunks_list=list(job["chunks"].keys()),
                         )
+                        record["metadata"]["processing_end_time"] = processing_end_time
+                        records[job["doc_id"]] = record
+                    await self.doc_status.upsert(records)
+                    await self._insert_done()
+
+                    async with pipeline_status_lock:
+                        for job in jobs:
+                            log_message = f"Completed processing file {job['file_number']}/{total_files}: {job['file_path']}"
+                            logger.info(log_message)
+                            pipeline_status["latest_message"] = log_message
+                            pipeline_status["history_messages"].append(log_message)
+                    return jobs
+
+                async def mark_failed(
+                    stage: str, job: dict[str, Any], e: BaseException
+                ) -> None:
+                    # Log error and update pipeline status
+                    logger.error(
+                        "".join(traceback.format_exception(type(e), e, e.__traceback__))
                     )
+                    if stage in ("merge", "persist"):
+                        error_msg = f"Merging stage failed in document {job['file_number']}/{total_files}: {job['file_path']}"
+                    else:
+                        error_msg = f"Failed to extract document {job['file_number']}/{total_files}: {job['file_path']}"
+                    logger.error(error_msg)
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = error_msg
+                        pipeline_status["history_messages"].append(
+                            "".join(
+                                traceback.format_exception(type(e), e, e.__traceback__)
+                            )
+                        )
+                        pipeline_status["history_messages"].append(error_msg)
+
+                    # Persistent llm cache
+                    if self.llm_response_cache:
+                        await self.llm_response_cache.index_done_callback()
 
-                # Wait for all document processing to complete
-                await asyncio.gather(*doc_tasks)
+                    record = status_record(job, DocStatus.FAILED, error_msg=str(e))
+                    record["metadata"]["processing_end_time"] = int(time.time())
+                    await self.doc_status.upsert({job["doc_id"]: record})
+
+                async def update_stage_stats(stats: dict[str, Any]) -> None:
+                    # Replace the whole value so multiprocess shared dicts see the change
+                    async with pipeline_status_lock:
+                        pipeline_status["stages"] = stats
+
+                # A single merge already runs up to 2 * llm_model_max_async entity and
+                # relation tasks, concurrent merges mostly wait on each other's keyed
+                # locks and summary calls, so one merge worker is the default
+                stage_workers = {
+                    "chunk": self.max_parallel_insert,
+                    "embed": self.max_parallel_insert,
+                    "extract": self.max_parallel_insert,
+                    "merge": 1,
+                    "persist": 1,
+                    **self.pipeline_stage_workers,
+                }
+                pipeline = StagedPipeline(
+                    [
+                        PipelineStage("chunk", chunk_stage, stage_workers["chunk"]),
+                        PipelineStage("embed", embed_stage, stage_workers["embed"]),
+                        PipelineStage(
+                            "extract", extract_stage, stage_workers["extract"]
+                        ),
+                        PipelineStage("merge", merge_stage, stage_workers["merge"]),
+                        PipelineStage(
+                            "persist",
+                            persist_stage,
+                            stage_workers["persist"],
+                            batch=True,
+                        ),
+                    ],
+                    queue_size=self.pipeline_queue_size,
+                    on_error=mark_failed,
+                    on_update=update_stage_stats,
+                )
+                await pipeline.run(
+                    {
+                        "doc_id": doc_id,
+                        "status_doc": status_doc,
+                        "file_path": getattr(status_doc, "file_path", "unknown_source"),
+                        "file_number": 0,
+                        "processing_start_time": int(time.time()),
+                        "chunks": {},
+                    }
+                    for doc_id, status_doc in to_process_docs.items()
+                )
 
                 # Check if there's a pending request to process more documents (with lock)
                 has_pending_request = False
@@ -1813,7 +1886,7 @@ class LightRAG:
         try:
             chunk_results = await extract_entities(
                 chunk,
-                global_config=asdict(self),
+                global_config=self.global_config,
                 pipeline_status=pipeline_status,
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
@@ -1849,6 +1922,9 @@ class LightRAG:
         ]
         await asyncio.gather(*tasks)
 
+        # Cached answers may no longer reflect the knowledge base
+        await self._invalidate_semantic_cache()
+
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
 
@@ -2225,7 +2301,7 @@ class LightRAG:
             actual data is nested under the 'data' field, with 'status' and 'message'
             fields at the top level.
         """
-        global_config = asdict(self)
+        global_config = self.global_config
 
         # Create a copy of param to avoid modifying the original
         data_param = QueryParam(
@@ -2239,6 +2315,7 @@ class LightRAG:
             max_entity_tokens=param.max_entity_tokens,
             max_relation_tokens=param.max_relation_tokens,
             max_total_tokens=param.max_total_tokens,
+            retrieval_leg_timeout=param.retrieval_leg_timeout,
             hl_keywords=param.hl_keywords,
             ll_keywords=param.ll_keywords,
             conversation_history=param.conversation_history,
@@ -2343,11 +2420,17 @@ class LightRAG:
         """
         logger.debug(f"[aquery_llm] Query param: {param}")
 
-        global_config = asdict(self)
+        global_config = self.global_config
 
         try:
             query_result = None
 
+            cached_result, semantic_cache_key = await self._semantic_cache_lookup(
+                query.strip(), param, system_prompt
+            )
+            if cached_result is not None:
+                return cached_result
+
             if param.mode in ["local", "global", "hybrid", "mix"]:
                 query_result = await kg_query(
                     query.strip(),
@@ -2442,6 +2525,17 @@ class LightRAG:
                 "is_streaming": query_result.is_streaming,
             }
 
+            if (
+                semantic_cache_key is not None
+                and isinstance(query_result.content, str)
+                and not query_result.is_streaming
+                and query_result.content != PROMPTS["fail_response"]
+            ):
+                embedding, scope, generation = semantic_cache_key
+                self.semantic_query_cache.store(
+                    query.strip(), embedding, scope, raw_data, generation
+                )
+
             return raw_data
 
         except Exception as e:
@@ -2485,6 +2579,58 @@ class LightRAG:
     async def _query_done(self):
         await self.llm_response_cache.index_done_callback()
 
+    async def _semantic_cache_lookup(
+        self, query: str, param: QueryParam, system_prompt: str | None
+    ) -> tuple[dict[str, Any] | None, tuple[Any, str] | None]:
+        """Look up a query in the semantic cache.
+
+        Returns:
+            The cached result on a hit, and the (embedding, scope, generation) key to store the
+            answer under on a miss. The key is None when the query is not cacheable.
+        """
+        if (
+            self.semantic_query_cache is None
+            or param.mode not in ["local", "global", "hybrid", "mix", "naive"]
+            or param.only_need_context
+            or param.only_need_prompt
+            or param.conversation_history
+            or param.model_func
+        ):
+            return None, None
+
+        # Only reuse answers produced with the same answer-affecting settings
+        scope = compute_args_hash(
+            param.mode,
+            param.response_type,
+            param.top_k,
+            param.chunk_top_k,
+            param.max_entity_tokens,
+            param.max_relation_tokens,
+            param.max_total_tokens,
+            param.hl_keywords,
+            param.ll_keywords,
+            param.user_prompt or "",
+            param.enable_rerank,
+            system_prompt or "",
+        )
+        try:
+            embedding = (await self.embedding_func([query]))[0]
+        except Exception as e:
+            logger.warning(f"Semantic cache skipped, failed to embed query: {e}")
+            return None, None
+
+        # Answers computed while the knowledge base changes must not be stored
+        generation = self.semantic_query_cache.current_generation()
+        cached_result = await self.semantic_query_cache.lookup(query, embedding, scope)
+        return cached_result, (embedding, scope, generation)
+
+    async def _invalidate_semantic_cache(self) -> None:
+        """Drop cached query answers in all workers after the knowledge base changed"""
+        if self.semantic_query_cache is None:
+            return
+        async with get_storage_lock(namespace=self._semantic_cache_namespace):
+            self.semantic_query_cache.invalidate()
+
     async def aclear_cache(self) -> None:
         """Clear all cache data from the LLM response cache storage.
 
@@ -2494,6 +2640,8 @@ class LightRAG:
             # Clear all cache
             await rag.aclear_cache()
         """
+        await self._invalidate_semantic_cache()
+
         if not self.llm_response_cache:
             logger.warning("No cache storage configured")
             return
@@ -2608,236 +2756,236 @@ class LightRAG:
                 - `status_code` (int): HTTP status code (e.g., 200, 404, 500).
                 - `file_path` (str | None): The file path of the deleted document, if available.
         """
+        results = await self.adelete_by_doc_ids([doc_id])
+        return results[0]
+
+    async def adelete_by_doc_ids(self, doc_ids: list[str]) -> list[DeletionResult]:
+        """Delete several documents with a single analysis, rebuild and persist pass.
+
+        The chunks, entities and relationships affected by all documents are
+        collected first. Chunks, orphaned entities and orphaned relationships
+        are then removed with one batched delete per storage, entities and
+        relationships shared with remaining documents are rebuilt once, and
+        all storages are persisted once at the end. Progress is reported in
+        `pipeline_status`.
+
+        Args:
+            doc_ids (list[str]): The IDs of the documents to delete.
+
+        Returns:
+            list[DeletionResult]: One result per requested document, in the same order.
+                Documents that do not exist get a "not_found" result; if the batch
+                fails, every existing document of the batch gets a "fail" result
+                whose message lists the steps already applied. Document records
+                are removed last, so a failed batch can be deleted again.
+        """
+        requested_ids = doc_ids
+        doc_ids = list(dict.fromkeys(doc_ids))
+        if not doc_ids:
+            return []
+
         deletion_operations_started = False
         original_exception = None
+        completed_steps: list[str] = []
+        results: dict[str, DeletionResult] = {}
+        file_paths: dict[str, str | None] = {}
 
         # Get pipeline status shared data and lock for status updates
         pipeline_status = await get_namespace_data("pipeline_status")
         pipeline_status_lock = get_pipeline_status_lock()
 
-        async with pipeline_status_lock:
-            log_message = f"Starting deletion process for document {doc_id}"
-            logger.info(log_message)
-            pipeline_status["latest_message"] = log_message
-            pipeline_status["history_messages"].append(log_message)
+        async def report(message: str) -> None:
+            logger.info(message)
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = message
+                pipeline_status["history_messages"].append(message)
+
+        batch_label = doc_ids[0] if len(doc_ids) == 1 else f"{len(doc_ids)} documents"
+        await report(f"Starting deletion process for document {batch_label}")
 
         try:
             # 1. Get the document status and related data
-            doc_status_data = await self.doc_status.get_by_id(doc_id)
-            file_path = doc_status_data.get("file_path") if doc_status_data else None
-            if not doc_status_data:
-                logger.warning(f"Document {doc_id} not found")
-                return DeletionResult(
-                    status="not_found",
-                    doc_id=doc_id,
-                    message=f"Document {doc_id} not found.",
-                    status_code=404,
-                    file_path="",
-                )
-
-            # Check document status and log warning for non-completed documents
-            raw_status = doc_status_data.get("status")
-            try:
-                doc_status = DocStatus(raw_status)
-            except ValueError:
-                doc_status = raw_status
-
-            if doc_status != DocStatus.PROCESSED:
-                if doc_status == DocStatus.PENDING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PENDING)"
-                    )
-                elif doc_status == DocStatus.PROCESSING:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PROCESSING)"
+            doc_status_list = await self.doc_status.get_by_ids(doc_ids)
+            found_ids = []
+            chunk_ids = set()
+            for doc_id, doc_status_data in zip(doc_ids, doc_status_list):
+                if not doc_status_data:
+                    logger.warning(f"Document {doc_id} not found")
+                    results[doc_id] = DeletionResult(
+                        status="not_found",
+                        doc_id=doc_id,
+                        message=f"Document {doc_id} not found.",
+                        status_code=404,
+                        file_path="",
                     )
-                elif doc_status == DocStatus.PREPROCESSED:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: PREPROCESSED)"
-                    )
-                elif doc_status == DocStatus.FAILED:
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: FAILED)"
-                    )
-                else:
+                    continue
+
+                found_ids.append(doc_id)
+                file_path = doc_status_data.get("file_path")
+                file_paths[doc_id] = file_path
+
+                # Check document status and log warning for non-completed documents
+                raw_status = doc_status_data.get("status")
+                try:
+                    doc_status = DocStatus(raw_status)
+                except ValueError:
+                    doc_status = raw_status
+                if doc_status != DocStatus.PROCESSED:
                     status_text = (
                         doc_status.value
                         if isinstance(doc_status, DocStatus)
                         else str(doc_status)
                     )
-                    warning_msg = (
-                        f"Deleting {doc_id} {file_path}(previous status: {status_text})"
+                    await report(
+                        f"Deleting {doc_id} {file_path}(previous status: {status_text.upper()})"
                     )
-                logger.info(warning_msg)
-                # Update pipeline status for monitoring
-                async with pipeline_status_lock:
-                    pipeline_status["latest_message"] = warning_msg
-                    pipeline_status["history_messages"].append(warning_msg)
 
-            # 2. Get chunk IDs from document status
-            chunk_ids = set(doc_status_data.get("chunks_list", []))
+                # 2. Get chunk IDs from document status
+                doc_chunk_ids = doc_status_data.get("chunks_list", [])
+                if not doc_chunk_ids:
+                    logger.warning(f"No chunks found for document {doc_id}")
+                chunk_ids.update(doc_chunk_ids)
 
-            if not chunk_ids:
-                logger.warning(f"No chunks found for document {doc_id}")
-                # Mark that deletion operations have started
-                deletion_operations_started = True
-                try:
-                    # Still need to delete the doc status and full doc
-                    await self.full_docs.delete([doc_id])
-                    await self.doc_status.delete([doc_id])
-                except Exception as e:
-                    logger.error(
-                        f"Failed to delete document {doc_id} with no chunks: {e}"
-                    )
-                    raise Exception(f"Failed to delete document entry: {e}") from e
-
-                async with pipeline_status_lock:
-                    log_message = (
-                        f"Document deleted without associated chunks: {doc_id}"
-                    )
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
-
-                return DeletionResult(
-                    status="success",
-                    doc_id=doc_id,
-                    message=log_message,
-                    status_code=200,
-                    file_path=file_path,
-                )
+            if not found_ids:
+                return [results[doc_id] for doc_id in requested_ids]
 
             # Mark that deletion operations have started
             deletion_operations_started = True
 
-            # 4. Analyze entities and relationships that will be affected
+            # 3. Analyze entities and relationships that will be affected
             entities_to_delete = set()
             entities_to_rebuild = {}  # entity_name -> remaining_chunk_ids
             relationships_to_delete = set()
             relationships_to_rebuild = {}  # (src, tgt) -> remaining_chunk_ids
 
-            try:
-                # Get affected entities and relations from full_entities and full_relations storage
-                doc_entities_data = await self.full_entities.get_by_id(doc_id)
-                doc_relations_data = await self.full_relations.get_by_id(doc_id)
-
-                affected_nodes = []
-                affected_edges = []
-
-                # Get entity data from graph storage using entity names from full_entities
-                if doc_entities_data and "entity_names" in doc_entities_data:
-                    entity_names = doc_entities_data["entity_names"]
-                    # get_nodes_batch returns dict[str, dict], need to convert to list[dict]
-                    nodes_dict = await self.chunk_entity_relation_graph.get_nodes_batch(
-                        entity_names
-                    )
-                    for entity_name in entity_names:
-                        node_data = nodes_dict.get(entity_name)
-                        if node_data:
-                            # Ensure compatibility with existing logic that expects "id" field
-                            if "id" not in node_data:
-                                node_data["id"] = entity_name
-                            affected_nodes.append(node_data)
-
-                # Get relation data from graph storage using relation pairs from full_relations
-                if doc_relations_data and "relation_pairs" in doc_relations_data:
-                    relation_pairs = doc_relations_data["relation_pairs"]
-                    edge_pairs_dicts = [
-                        {"src": pair[0], "tgt": pair[1]} for pair in relation_pairs
-                    ]
-                    # get_edges_batch returns dict[tuple[str, str], dict], need to convert to list[dict]
-                    edges_dict = await self.chunk_entity_relation_graph.get_edges_batch(
-                        edge_pairs_dicts
-                    )
-
-                    for pair in relation_pairs:
-                        src, tgt = pair[0], pair[1]
-                        edge_key = (src, tgt)
-                        edge_data = edges_dict.get(edge_key)
-                        if edge_data:
-                            # Ensure compatibility with existing logic that expects "source" and "target" fields
-                            if "source" not in edge_data:
-                                edge_data["source"] = src
-                            if "target" not in edge_data:
-                                edge_data["target"] = tgt
-                            affected_edges.append(edge_data)
-
-            except Exception as e:
-                logger.error(f"Failed to analyze affected graph elements: {e}")
-                raise Exception(f"Failed to analyze graph dependencies: {e}") from e
-
-            try:
-                # Process entities
-                for node_data in affected_nodes:
-                    node_label = node_data.get("entity_id")
-                    if node_label and "source_id" in node_data:
-                        sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                        remaining_sources = sources - chunk_ids
-
-                        if not remaining_sources:
-                            entities_to_delete.add(node_label)
-                        elif remaining_sources != sources:
-                            entities_to_rebuild[node_label] = remaining_sources
-
-                async with pipeline_status_lock:
-                    log_message = f"Found {len(entities_to_rebuild)} affected entities"
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
-
-                # Process relationships
-                for edge_data in affected_edges:
-                    src = edge_data.get("source")
-                    tgt = edge_data.get("target")
-
-                    if src and tgt and "source_id" in edge_data:
-                        edge_tuple = tuple(sorted((src, tgt)))
+            if chunk_ids:
+                try:
+                    # Union of the entities and relations of all documents, from full_entities and full_relations storage
+                    doc_entities_list = await self.full_entities.get_by_ids(found_ids)
+                    doc_relations_list = await self.full_relations.get_by_ids(found_ids)
+
+                    entity_names = {}
+                    for doc_entities_data in doc_entities_list:
+                        if doc_entities_data and "entity_names" in doc_entities_data:
+                            entity_names.update(
+                                dict.fromkeys(doc_entities_data["entity_names"])
+                            )
+                    relation_pairs = {}
+                    for doc_relations_data in doc_relations_list:
                         if (
-                            edge_tuple in relationships_to_delete
-                            or edge_tuple in relationships_to_rebuild
+                            doc_relations_data
+                            and "relation_pairs" in doc_relations_data
                         ):
-                            continue
+                            relation_pairs.update(
+                                dict.fromkeys(
+                                    (pair[0], pair[1])
+                                    for pair in doc_relations_data["relation_pairs"]
+                                )
+                            )
 
-                        sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                        remaining_sources = sources - chunk_ids
+                    affected_nodes = []
+                    affected_edges = []
 
-                        if not remaining_sources:
-                            relationships_to_delete.add(edge_tuple)
-                        elif remaining_sources != sources:
-                            relationships_to_rebuild[edge_tuple] = remaining_sources
+                    # Get entity data from graph storage in one batch
+                    if entity_names:
+                        nodes_dict = (
+                            await self.chunk_entity_relation_graph.get_nodes_batch(
+                                list(entity_names)
+                            )
+                        )
+                        for entity_name in entity_names:
+                            node_data = nodes_dict.get(entity_name)
+                            if node_data:
+                                # Ensure compatibility with existing logic that expects "id" field
+                                if "id" not in node_data:
+                                    node_data["id"] = entity_name
+                                affected_nodes.append(node_data)
+
+                    # Get relation data from graph storage in one batch
+                    if relation_pairs:
+                        edges_dict = (
+                            await self.chunk_entity_relation_graph.get_edges_batch(
+                                [
+                                    {"src": src, "tgt": tgt}
+                                    for src, tgt in relation_pairs
+                                ]
+                            )
+                        )
+                        for src, tgt in relation_pairs:
+                            edge_data = edges_dict.get((src, tgt))
+                            if edge_data:
+                                # Ensure compatibility with existing logic that expects "source" and "target" fields
+                                if "source" not in edge_data:
+                                    edge_data["source"] = src
+                                if "target" not in edge_data:
+                                    edge_data["target"] = tgt
+                                affected_edges.append(edge_data)
 
-                async with pipeline_status_lock:
-                    log_message = (
+                except Exception as e:
+                    logger.error(f"Failed to analyze affected graph elements: {e}")
+                    raise Exception(f"Failed to analyze graph dependencies: {e}") from e
+
+                try:
+                    # Process entities
+                    for node_data in affected_nodes:
+                        node_label = node_data.get("entity_id")
+                        if node_label and "source_id" in node_data:
+                            sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
+                            remaining_sources = sources - chunk_ids
+
+                            if not remaining_sources:
+                                entities_to_delete.add(node_label)
+                            elif remaining_sources != sources:
+                                entities_to_rebuild[node_label] = remaining_sources
+
+                    await report(f"Found {len(entities_to_rebuild)} affected entities")
+
+                    # Process relationships
+                    for edge_data in affected_edges:
+                        src = edge_data.get("source")
+                        tgt = edge_data.get("target")
+
+                        if src and tgt and "source_id" in edge_data:
+                            edge_tuple = tuple(sorted((src, tgt)))
+                            if (
+                                edge_tuple in relationships_to_delete
+                                or edge_tuple in relationships_to_rebuild
+                            ):
+                                continue
+
+                            sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
+                            remaining_sources = sources - chunk_ids
+
+                            if not remaining_sources:
+                                relationships_to_delete.add(edge_tuple)
+                            elif remaining_sources != sources:
+                                relationships_to_rebuild[edge_tuple] = remaining_sources
+
+                    await report(
                         f"Found {len(relationships_to_rebuild)} affected relations"
                     )
-                    logger.info(log_message)
-                    pipeline_status["latest_message"] = log_message
-                    pipeline_status["history_messages"].append(log_message)
 
-            except Exception as e:
-                logger.error(f"Failed to process graph analysis results: {e}")
-                raise Exception(f"Failed to process graph dependencies: {e}") from e
+                except Exception as e:
+                    logger.error(f"Failed to process graph analysis results: {e}")
+                    raise Exception(f"Failed to process graph dependencies: {e}") from e
 
             # Use graph database lock to prevent dirty read
             graph_db_lock = get_graph_db_lock(enable_logging=False)
             async with graph_db_lock:
-                # 5. Delete chunks from storage
+                # 4. Delete chunks from storage
                 if chunk_ids:
                     try:
-                        await self.chunks_vdb.delete(chunk_ids)
-                        await self.text_chunks.delete(chunk_ids)
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(chunk_ids)} chunks from storage"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
+                        await self.chunks_vdb.delete(list(chunk_ids))
+                        await self.text_chunks.delete(list(chunk_ids))
+                        completed_steps.append(f"{len(chunk_ids)} chunks deleted")
+                        await report(
+                            f"Successfully deleted {len(chunk_ids)} chunks from storage"
+                        )
                     except Exception as e:
                         logger.error(f"Failed to delete chunks: {e}")
                         raise Exception(f"Failed to delete document chunks: {e}") from e
 
-                # 6. Delete entities that have no remaining sources
+                # 5. Delete entities that have no remaining sources
                 if entities_to_delete:
                     try:
                         # Delete from vector database
@@ -2851,18 +2999,17 @@ class LightRAG:
                         await self.chunk_entity_relation_graph.remove_nodes(
                             list(entities_to_delete)
                         )
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(entities_to_delete)} entities"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
+                        completed_steps.append(
+                            f"{len(entities_to_delete)} entities deleted"
+                        )
+                        await report(
+                            f"Successfully deleted {len(entities_to_delete)} entities"
+                        )
                     except Exception as e:
                         logger.error(f"Failed to delete entities: {e}")
                         raise Exception(f"Failed to delete entities: {e}") from e
 
-                # 7. Delete relationships that have no remaining sources
+                # 6. Delete relationships that have no remaining sources
                 if relationships_to_delete:
                     try:
                         # Delete from vector database
@@ -2880,21 +3027,17 @@ class LightRAG:
                         await self.chunk_entity_relation_graph.remove_edges(
                             list(relationships_to_delete)
                         )
-
-                        async with pipeline_status_lock:
-                            log_message = f"Successfully deleted {len(relationships_to_delete)} relations"
-                            logger.info(log_message)
-                            pipeline_status["latest_message"] = log_message
-                            pipeline_status["history_messages"].append(log_message)
-
+                        completed_steps.append(
+                            f"{len(relationships_to_delete)} relations deleted"
+                        )
+                        await report(
+                            f"Successfully deleted {len(relationships_to_delete)} relations"
+                        )
                     except Exception as e:
                         logger.error(f"Failed to delete relationships: {e}")
                         raise Exception(f"Failed to delete relationships: {e}") from e
 
-                # Persist changes to graph database before releasing graph database lock
-                await self._insert_done()
-
-            # 8. Rebuild entities and relationships from remaining chunks
+            # 7. Rebuild entities and relationships from remaining chunks, once for all documents
             if entities_to_rebuild or relationships_to_rebuild:
                 try:
                     await _rebuild_knowledge_from_chunks(
@@ -2905,53 +3048,66 @@ class LightRAG:
                         relationships_vdb=self.relationships_vdb,
                         text_chunks_storage=self.text_chunks,
                         llm_response_cache=self.llm_response_cache,
-                        global_config=asdict(self),
+                        global_config=self.global_config,
                         pipeline_status=pipeline_status,
                         pipeline_status_lock=pipeline_status_lock,
                     )
+                    completed_steps.append(
+                        f"{len(entities_to_rebuild)} entities and {len(relationships_to_rebuild)} relations rebuilt"
+                    )
 
                 except Exception as e:
                     logger.error(f"Failed to rebuild knowledge from chunks: {e}")
                     raise Exception(f"Failed to rebuild knowledge graph: {e}") from e
 
-            # 9. Delete from full_entities and full_relations storage
+            # 8. Delete from full_entities and full_relations storage
             try:
-                await self.full_entities.delete([doc_id])
-                await self.full_relations.delete([doc_id])
+                await self.full_entities.delete(found_ids)
+                await self.full_relations.delete(found_ids)
+                completed_steps.append("document entity and relation lists deleted")
             except Exception as e:
                 logger.error(f"Failed to delete from full_entities/full_relations: {e}")
                 raise Exception(
                     f"Failed to delete from full_entities/full_relations: {e}"
                 ) from e
 
-            # 10. Delete original document and status
+            # 9. Delete original documents and status
             try:
-                await self.full_docs.delete([doc_id])
-                await self.doc_status.delete([doc_id])
+                await self.full_docs.delete(found_ids)
+                await self.doc_status.delete(found_ids)
             except Exception as e:
                 logger.error(f"Failed to delete document and status: {e}")
                 raise Exception(f"Failed to delete document and status: {e}") from e
 
-            return DeletionResult(
-                status="success",
-                doc_id=doc_id,
-                message=log_message,
-                status_code=200,
-                file_path=file_path,
-            )
+            for doc_id in found_ids:
+                results[doc_id] = DeletionResult(
+                    status="success",
+                    doc_id=doc_id,
+                    message=f"Document {doc_id} deleted ({len(found_ids)} documents in batch)",
+                    status_code=200,
+                    file_path=file_paths.get(doc_id),
+                )
 
         except Exception as e:
             original_exception = e
-            error_message = f"Error while deleting document {doc_id}: {e}"
+            error_message = f"Error while deleting document {batch_label}: {e}"
+            if completed_steps:
+                # Partially deleted: the document records are still present
+                error_message += (
+                    f" (partially deleted: {', '.join(completed_steps)};"
+                    " the document is kept and its deletion can be retried)"
+                )
             logger.error(error_message)
             logger.error(traceback.format_exc())
-            return DeletionResult(
-                status="fail",
-                doc_id=doc_id,
-                message=error_message,
-                status_code=500,
-                file_path=file_path,
-            )
+            for doc_id in doc_ids:
+                if doc_id not in results or results[doc_id].status == "success":
+                    results[doc_id] = DeletionResult(
+                        status="fail",
+                        doc_id=doc_id,
+                        message=error_message,
+                        status_code=500,
+                        file_path=file_paths.get(doc_id),
+                    )
 
         finally:
             # ALWAYS ensure persistence if any deletion operations were started
@@ -2959,26 +3115,27 @@ class LightRAG:
                 try:
                     await self._insert_done()
                 except Exception as persistence_error:
-                    persistence_error_msg = f"Failed to persist data after deletion attempt for {doc_id}: {persistence_error}"
+                    persistence_error_msg = f"Failed to persist data after deletion attempt for {batch_label}: {persistence_error}"
                     logger.error(persistence_error_msg)
                     logger.error(traceback.format_exc())
 
                     # If there was no original exception, this persistence error becomes the main error
                     if original_exception is None:
-                        return DeletionResult(
-                            status="fail",
-                            doc_id=doc_id,
-                            message=f"Deletion completed but failed to persist changes: {persistence_error}",
-                            status_code=500,
-                            file_path=file_path,
-                        )
-                    # If there was an original exception, log the persistence error but don't override the original error
-                    # The original error result was already returned in the except block
+                        for doc_id in found_ids:
+                            results[doc_id] = DeletionResult(
+                                status="fail",
+                                doc_id=doc_id,
+                                message=f"Deletion completed but failed to persist changes: {persistence_error}",
+                                status_code=500,
+                                file_path=file_paths.get(doc_id),
+                            )
             else:
                 logger.debug(
-                    f"No deletion operations were started for document {doc_id}, skipping persistence"
+                    f"No deletion operations were started for document {batch_label}, skipping persistence"
                 )
 
+        return [results[doc_id] for doc_id in requested_ids]
+
     async def adelete_by_entity(self, entity_name: str) -> DeletionResult:
         """Asynchronously delete an entity and all its relationships.
 
@@ -2990,12 +3147,15 @@ class LightRAG:
         """
         from lightrag.utils_graph import adelete_by_entity
 
-        return await adelete_by_entity(
-            self.chunk_entity_relation_graph,
-            self.entities_vdb,
-            self.relationships_vdb,
-            entity_name,
-        )
+        try:
+            return await adelete_by_entity(
+                self.chunk_entity_relation_graph,
+                self.entities_vdb,
+                self.relationships_vdb,
+                entity_name,
+            )
+        finally:
+            await self._invalidate_semantic_cache()
 
     def delete_by_entity(self, entity_name: str) -> DeletionResult:
         """Synchronously delete an entity and all its relationships.
@@ -3023,12 +3183,15 @@ class LightRAG:
         """
         from lightrag.utils_graph import adelete_by_relation
 
-        return await adelete_by_relation(
-            self.chunk_entity_relation_graph,
-            self.relationships_vdb,
-            source_entity,
-            target_entity,
-        )
+        try:
+            return await adelete_by_relation(
+                self.chunk_entity_relation_graph,
+                self.relationships_vdb,
+                source_entity,
+                target_entity,
+            )
+        finally:
+            await self._invalidate_semantic_cache()
 
     def delete_by_relation(
         self, source_entity: str, target_entity: str
@@ -3112,14 +3275,17 @@ class LightRAG:
         """
         from lightrag.utils_graph import aedit_entity
 
-        return await aedit_entity(
-            self.chunk_entity_relation_graph,
-            self.entities_vdb,
-            self.relationships_vdb,
-            entity_name,
-            updated_data,
-            allow_rename,
-        )
+        try:
+            return await aedit_entity(
+                self.chunk_entity_relation_graph,
+                self.entities_vdb,
+                self.relationships_vdb,
+                entity_name,
+                updated_data,
+                allow_rename,
+            )
+        finally:
+            await self._invalidate_semantic_cache()
 
     def edit_entity(
         self, entity_name: str, updated_data: dict[str, str], allow_rename: bool = True
@@ -3146,14 +3312,17 @@ class LightRAG:
         """
         from lightrag.utils_graph import aedit_relation
 
-        return await aedit_relation(
-            self.chunk_entity_relation_graph,
-            self.entities_vdb,
-            self.relationships_vdb,
-            source_entity,
-            target_entity,
-            updated_data,
-        )
+        try:
+            return await aedit_relation(
+                self.chunk_entity_relation_graph,
+                self.entities_vdb,
+                self.relationships_vdb,
+                source_entity,
+                target_entity,
+                updated_data,
+            )
+        finally:
+            await self._invalidate_semantic_cache()
 
     def edit_relation(
         self, source_entity: str, target_entity: str, updated_data: dict[str, Any]
@@ -3179,13 +3348,16 @@ class LightRAG:
         """
         from lightrag.utils_graph import acreate_entity
 
-        return await acreate_entity(
-            self.chunk_entity_relation_graph,
-            self.entities_vdb,
-            self.relationships_vdb,
-            entity_name,
-            entity_data,
-        )
+        try:
+            return await acreate_entity(
+                self.chunk_entity_relation_graph,
+                self.entities_vdb,
+                self.relationships_vdb,
+                entity_name,
+                entity_data,
+            )
+        finally:
+            await self._invalidate_semantic_cache()
 
     def create_entity(
         self, entity_name: str, entity_data: dict[str, Any]
@@ -3210,14 +3382,17 @@ class LightRAG:
         """
         from lightrag.utils_graph import acreate_relation
 
-        return await acreate_relation(
-            self.chunk_entity_relation_graph,
-            self.entities_vdb,
-            self.relationships_vdb,
-            source_entity,
-            target_entity,
-            relation_data,
-        )
+        try:
+            return await acreate_relation(
+                self.chunk_entity_relation_graph,
+                self.entities_vdb,
+                self.relationships_vdb,
+                source_entity,
+                target_entity,
+                relation_data,
+            )
+        finally:
+            await self._invalidate_semantic_cache()
 
     def create_relation(
         self, source_entity: str, target_entity: str, relation_data: dict[str, Any]
@@ -3256,15 +3431,18 @@ class LightRAG:
         """
         from lightrag.utils_graph import amerge_entities
 
-        return await amerge_entities(
-            self.chunk_entity_relation_graph,
-            self.entities_vdb,
-            self.relationships_vdb,
-            source_entities,
-            target_entity,
-            merge_strategy,
-            target_entity_data,
-        )
+        try:
+            return await amerge_entities(
+                self.chunk_entity_relation_graph,
+                self.entities_vdb,
+                self.relationships_vdb,
+                source_entities,
+                target_entity,
+                merge_strategy,
+                target_entity_data,
+            )
+        finally:
+            await self._invalidate_semantic_cache()
 
     def merge_entities(
         self,
@@ -0,0 +1,359 @@
+"""
+Process-wide registry of HTTP clients used by the LLM, embedding and rerank bindings.
+
+Creating a client per request means a new connection pool, and therefore a new
+TCP/TLS handshake, for every extraction chunk. The bindings instead ask the
+registry for a client keyed by (binding, base_url, api_key, config); the client
+is created once, keeps its connections alive and is reused by later calls.
+
+Clients are bound to the event loop they were created in, so the running loop
+is part of the key, and entries of closed loops are pruned. Several LightRAG
+instances can share a loop and therefore its clients: each instance holds a
+lease on its loop (``acquire_lease`` in ``initialize_storages``) and the
+loop's clients are closed when the last lease is released
+(``finalize_storages``). ``close_all_clients()`` closes everything on process
+shutdown. Clients are recreated lazily if a binding is used again afterwards.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from lightrag.constants import (
+    DEFAULT_HTTP_KEEPALIVE_EXPIRY,
+    DEFAULT_HTTP_MAX_CONNECTIONS,
+    DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+from lightrag.utils import get_env_value, logger
+
+
+@dataclass
+class HttpPoolLimits:
+    """Connection pool bounds applied to every client created by the registry"""
+
+    max_connections: int = field(
+        default_factory=lambda: get_env_value(
+            "HTTP_MAX_CONNECTIONS", DEFAULT_HTTP_MAX_CONNECTIONS, int
+        )
+    )
+    max_keepalive_connections: int = field(
+        default_factory=lambda: get_env_value(
+            "HTTP_MAX_KEEPALIVE_CONNECTIONS",
+            DEFAULT_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            int,
+        )
+    )
+    keepalive_expiry: float = field(
+        default_factory=lambda: get_env_value(
+            "HTTP_KEEPALIVE_EXPIRY", DEFAULT_HTTP_KEEPALIVE_EXPIRY, float
+        )
+    )
+
+    def httpx_limits(self):
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+@dataclass
+class _ClientEntry:
+    client: Any
+    loop: asyncio.AbstractEventLoop
+    binding: str
+    close: Callable[[Any], Any]
+    uses: int = 1
+
+
+@dataclass
+class ClientLease:
+    """Handle proving that an owner, such as a LightRAG instance, uses a loop's clients"""
+
+    loop: asyncio.AbstractEventLoop
+    released: bool = False
+
+
+@dataclass
+class _BindingStats:
+    clients_created: int = 0
+    client_reuses: int = 0
+    clients_closed: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+
+
+class ClientRegistry:
+    """Cache of long-lived HTTP clients shared by all calls in the process"""
+
+    def __init__(self, limits: HttpPoolLimits | None = None):
+        self.limits = limits or HttpPoolLimits()
+        self._clients: dict[tuple, _ClientEntry] = {}
+        self._stats: dict[str, _BindingStats] = {}
+        # id(loop) -> (loop, number of unreleased leases)
+        self._leases: dict[int, tuple[asyncio.AbstractEventLoop, int]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _normalize(cls, value: Any) -> Any:
+        """Reduce a config value to a hashable value-based form"""
+        if value is None or isinstance(value, (str, bytes, bool, int, float)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return tuple(cls._normalize(v) for v in value)
+        if isinstance(value, dict):
+            return tuple(sorted((str(k), cls._normalize(v)) for k, v in value.items()))
+        # Objects such as clients or callables have no value identity; keying on
+        # them would add a registry entry for every new instance
+        raise TypeError(
+            f"Client config values must be primitives, lists or dicts, got {type(value).__name__}"
+        )
+
+    @staticmethod
+    def make_key(
+        binding: str,
+        base_url: str | None,
+        api_key: str | None,
+        config: Any = None,
+        transport: Any = None,
+    ) -> tuple:
+        """Build a registry key; the api key is hashed so it is never kept in clear text
+
+        Args:
+            config: Client settings made of primitives, lists and dicts; other
+                values raise ``TypeError``.
+            transport: Caller-owned object the client wraps, such as an
+                ``httpx.AsyncClient``. It is keyed by identity and stays
+                referenced by the key, so its id cannot be reused.
+        """
+        key_digest = (
+            hashlib.sha256(api_key.encode("utf-8")).hexdigest() if api_key else None
+        )
+        return (
+            binding,
+            base_url,
+            key_digest,
+            ClientRegistry._normalize(config or None),
+            transport,
+        )
+
+    def _binding_stats(self, binding: str) -> _BindingStats:
+        stats = self._stats.get(binding)
+        if stats is None:
+            stats = self._stats[binding] = _BindingStats()
+        return stats
+
+    def get(
+        self,
+        key: tuple,
+        factory: Callable[[], Any],
+        close: Callable[[Any], Any],
+    ) -> Any:
+        """Return the client registered under ``key`` for the running loop, creating it if needed
+
+        Args:
+            key: Key produced by ``make_key``; its first element is the binding name.
+            factory: Zero-argument callable building a new client.
+            close: Callable releasing a client; may return an awaitable.
+        """
+        loop = asyncio.get_running_loop()
+        full_key = (id(loop),) + key
+        binding = key[0]
+        stale = None
+        with self._lock:
+            entry = self._clients.get(full_key)
+            if entry is not None and entry.loop is loop and not loop.is_closed():
+                entry.uses += 1
+                self._binding_stats(binding).client_reuses += 1
+                return entry.client
+            if entry is not None:
+                # Loop ids can be recycled after a loop is garbage collected
+                stale = self._clients.pop(full_key)
+                self._binding_stats(binding).clients_closed += 1
+            self._prune_closed_loops()
+            client = factory()
+            self._clients[full_key] = _ClientEntry(client, loop, binding, close)
+            self._binding_stats(binding).clients_created += 1
+        if stale is not None:
+            logger.debug(f"Dropped {binding} client bound to a stale event loop")
+        logger.debug(f"Created shared {binding} client ({len(self._clients)} active)")
+        return client
+
+    def _prune_closed_loops(self) -> None:
+        """Drop entries and leases of closed loops; their clients cannot be awaited anymore"""
+        for full_key, entry in list(self._clients.items()):
+            if entry.loop.is_closed():
+                del self._clients[full_key]
+                self._binding_stats(entry.binding).clients_closed += 1
+        for loop_id, (loop, _) in list(self._leases.items()):
+            if loop.is_closed():
+                del self._leases[loop_id]
+
+    def acquire_lease(self) -> ClientLease:
+        """Register an owner of the running loop's clients"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._prune_closed_loops()
+            _, count = self._leases.get(id(loop), (loop, 0))
+            self._leases[id(loop)] = (loop, count + 1)
+        return ClientLease(loop)
+
+    async def release(self, lease: ClientLease) -> None:
+        """Release a lease, closing the clients of its loop once no owner is left"""
+        with self._lock:
+            if lease.released:
+                return
+            lease.released = True
+            _, count = self._leases.get(id(lease.loop), (lease.loop, 0))
+            if count > 1:
+                self._leases[id(lease.loop)] = (lease.loop, count - 1)
+                return
+            self._leases.pop(id(lease.loop), None)
+            entries = [
+                self._clients.pop(full_key)
+                for full_key, entry in list(self._clients.items())
+                if entry.loop is lease.loop
+            ]
+        await self._close_entries(entries)
+
+    def record_connection(self, binding: str, reused: bool) -> None:
+        with self._lock:
+            stats = self._binding_stats(binding)
+            if reused:
+                stats.connections_reused += 1
+            else:
+                stats.connections_created += 1
+
+    async def close_all(self) -> None:
+        """Close every registered client; clients owned by other running loops are closed on those loops"""
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+            self._leases.clear()
+        await self._close_entries(entries)
+
+    async def _close_entries(self, entries: list[_ClientEntry]) -> None:
+        current_loop = asyncio.get_running_loop()
+        for entry in entries:
+            try:
+                if entry.loop is current_loop:
+                    result = entry.close(entry.client)
+                    if inspect.isawaitable(result):
+                        await result
+                elif entry.loop.is_running():
+                    # Client belongs to a loop running in another thread
+                    async def _close(entry=entry):
+                        result = entry.close(entry.client)
+                        if inspect.isawaitable(result):
+                            await result
+
+                    await asyncio.wrap_future(
+                        asyncio.run_coroutine_threadsafe(_close(), entry.loop)
+                    )
+                # Clients of stopped or closed loops cannot be awaited; drop them
+            except Exception as e:
+                logger.warning(f"Failed to close shared {entry.binding} client: {e}")
+            finally:
+                with self._lock:
+                    self._binding_stats(entry.binding).clients_closed += 1
+
+        if entries:
+            logger.info(f"Closed {len(entries)} shared HTTP clients")
+
+    def stats(self) -> dict[str, Any]:
+        """Client and connection reuse counters, overall and per binding"""
+        with self._lock:
+            per_binding = {}
+            for binding, s in self._stats.items():
+                per_binding[binding] = {
+                    "active_clients": sum(
+                        1 for e in self._clients.values() if e.binding == binding
+                    ),
+                    "clients_created": s.clients_created,
+                    "client_reuses": s.client_reuses,
+                    "clients_closed": s.clients_closed,
+                    "connections_created": s.connections_created,
+                    "connections_reused": s.connections_reused,
+                }
+
+        created = sum(b["clients_created"] for b in per_binding.values())
+        reuses = sum(b["client_reuses"] for b in per_binding.values())
+        return {
+            "active_clients": sum(b["active_clients"] for b in per_binding.values()),
+            "clients_created": created,
+            "client_reuses": reuses,
+            "client_reuse_rate": reuses / (created + reuses)
+            if created + reuses
+            else 0.0,
+            "bindings": per_binding,
+        }
+
+
+_registry = ClientRegistry()
+
+
+def get_client_registry() -> ClientRegistry:
+    return _registry
+
+
+def get_aiohttp_session(binding: str, base_url: str | None = None, **session_kwargs):
+    """Shared ``aiohttp.ClientSession`` with a bounded keep-alive connection pool
+
+    Per-request data such as auth headers should be passed to ``session.post``
+    rather than here, so that one session serves all keys for the same host.
+    """
+    import aiohttp
+
+    registry = get_client_registry()
+    # Endpoints on the same host share one connection pool
+    origin = None
+    if base_url:
+        parsed = urlsplit(base_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+    key = registry.make_key(binding, origin, None, session_kwargs)
+
+    def factory():
+        limits = registry.limits
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_create(session, ctx, params):
+            registry.record_connection(binding, reused=False)
+
+        async def on_reuse(session, ctx, params):
+            registry.record_connection(binding, reused=True)
+
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        connector = aiohttp.TCPConnector(
+            limit=limits.max_connections,
+            keepalive_timeout=limits.keepalive_expiry,
+        )
+        return aiohttp.ClientSession(
+            connector=connector, trace_configs=[trace_config], **session_kwargs
+        )
+
+    return registry.get(key, factory, lambda session: session.close())
+
+
+def acquire_client_lease() -> ClientLease:
+    return get_client_registry().acquire_lease()
+
+
+async def release_client_lease(lease: ClientLease) -> None:
+    await get_client_registry().release(lease)
+
+
+async def close_all_clients() -> None:
+    await get_client_registry().close_all()
+
+
+def get_client_stats() -> dict[str, Any]:
+    return get_client_registry().stats()
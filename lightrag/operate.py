@@ -3,8 +3,17 @@ from functools import partial
 
 import asyncio
 import json
+import re
 import json_repair
-from typing import Any, AsyncIterator, overload, Literal
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    overload,
+    Literal,
+)
 from collections import Counter, defaultdict
 
 from .utils import (
@@ -52,6 +61,7 @@ from .constants import (
     DEFAULT_KG_CHUNK_PICK_METHOD,
     DEFAULT_ENTITY_TYPES,
     DEFAULT_SUMMARY_LANGUAGE,
+    DEFAULT_SUMMARY_MAX_REDUCE_DEPTH,
 )
 from .kg.shared_storage import get_storage_keyed_lock
 import time
@@ -63,59 +73,147 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path=".env", override=False)
 
 
-def chunking_by_token_size(
+# Documents are tokenized in blocks of about this many characters, so the token
+# list of a whole document is never held in memory at once
+CHUNKING_BLOCK_CHARS = 65536
+# The pre-tokenizers of these tiktoken encodings never merge across a newline
+# followed by a non-space character, so encoding blocks split there yields the
+# same tokens as encoding the whole text. This does not hold for r50k/p50k or
+# for tokenizers in general, which are given the whole text instead.
+_BLOCKWISE_ENCODINGS = ("cl100k_base", "o200k_base", "o200k_harmony")
+_CHUNKING_BLOCK_BOUNDARY = re.compile(r"\n(?=\S)")
+
+
+def _encodes_blockwise(tokenizer: Tokenizer) -> bool:
+    encoding = getattr(tokenizer, "tokenizer", None)
+    return (
+        type(encoding).__module__.startswith("tiktoken")
+        and getattr(encoding, "name", None) in _BLOCKWISE_ENCODINGS
+    )
+
+
+def _iter_text_blocks(content: str, block_chars: int) -> Iterator[str]:
+    pos = 0
+    while pos < len(content):
+        match = _CHUNKING_BLOCK_BOUNDARY.search(content, pos + block_chars)
+        end = match.end() if match else len(content)
+        yield content[pos:end]
+        pos = end
+
+
+def _iter_token_windows(
+    tokenizer: Tokenizer,
+    content: str,
+    overlap_token_size: int,
+    max_token_size: int,
+    keep_if_fits: bool = False,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token count, text) of sliding token windows
+
+    Content is encoded block by block when the tokenizer allows it, see
+    _BLOCKWISE_ENCODINGS. With keep_if_fits, content of exactly max_token_size
+    tokens is kept as one chunk instead of also producing a trailing overlap
+    window.
+    """
+    step = max_token_size - overlap_token_size
+    if step <= 0:
+        raise ValueError(
+            f"overlap_token_size ({overlap_token_size}) must be smaller than max_token_size ({max_token_size})"
+        )
+
+    buffer: list[int] = []  # tokens from the start of the next window onwards
+    emitted = False
+    if _encodes_blockwise(tokenizer):
+        blocks = _iter_text_blocks(content, CHUNKING_BLOCK_CHARS)
+    else:
+        blocks = [content]
+    for block in blocks:
+        buffer.extend(tokenizer.encode(block))
+        while len(buffer) > max_token_size or (
+            len(buffer) == max_token_size and (emitted or not keep_if_fits)
+        ):
+            yield max_token_size, tokenizer.decode(buffer[:max_token_size])
+            del buffer[:step]
+            emitted = True
+
+    if not emitted and buffer:
+        # The first window covers all content, no need to decode it back
+        yield len(buffer), content
+        if keep_if_fits:
+            return
+        del buffer[:step]
+    while buffer:
+        yield (
+            min(max_token_size, len(buffer)),
+            tokenizer.decode(buffer[:max_token_size]),
+        )
+        del buffer[:step]
+
+
+def iter_chunks_by_token_size(
     tokenizer: Tokenizer,
     content: str,
     split_by_character: str | None = None,
     split_by_character_only: bool = False,
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
-) -> list[dict[str, Any]]:
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
+) -> Iterator[dict[str, Any]]:
+    """Generator version of chunking_by_token_size that yields chunks as they are produced."""
     if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) > max_token_size:
-                    for start in range(
-                        0, len(_tokens), max_token_size - overlap_token_size
-                    ):
-                        chunk_content = tokenizer.decode(
-                            _tokens[start : start + max_token_size]
-                        )
-                        new_chunks.append(
-                            (min(max_token_size, len(_tokens) - start), chunk_content)
-                        )
-                else:
-                    new_chunks.append((len(_tokens), chunk))
-        for index, (_len, chunk) in enumerate(new_chunks):
-            results.append(
-                {
-                    "tokens": _len,
-                    "content": chunk.strip(),
-                    "chunk_order_index": index,
-                }
-            )
+        pieces = _iter_split_pieces(
+            tokenizer,
+            content.split(split_by_character),
+            split_by_character_only,
+            overlap_token_size,
+            max_token_size,
+        )
     else:
-        for index, start in enumerate(
-            range(0, len(tokens), max_token_size - overlap_token_size)
-        ):
-            chunk_content = tokenizer.decode(tokens[start : start + max_token_size])
-            results.append(
-                {
-                    "tokens": min(max_token_size, len(tokens) - start),
-                    "content": chunk_content.strip(),
-                    "chunk_order_index": index,
-                }
+        pieces = _iter_token_windows(
+            tokenizer, content, overlap_token_size, max_token_size
+        )
+    for index, (tokens, chunk) in enumerate(pieces):
+        yield {
+            "tokens": tokens,
+            "content": chunk.strip(),
+            "chunk_order_index": index,
+        }
+
+
+def _iter_split_pieces(
+    tokenizer: Tokenizer,
+    raw_chunks: list[str],
+    split_by_character_only: bool,
+    overlap_token_size: int,
+    max_token_size: int,
+) -> Iterator[tuple[int, str]]:
+    for chunk in raw_chunks:
+        if split_by_character_only or not chunk:
+            yield len(tokenizer.encode(chunk)), chunk
+        else:
+            # Oversize pieces are further split into token windows
+            yield from _iter_token_windows(
+                tokenizer, chunk, overlap_token_size, max_token_size, keep_if_fits=True
             )
-    return results
+
+
+def chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> list[dict[str, Any]]:
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            overlap_token_size,
+            max_token_size,
+        )
+    )
 
 
 async def _handle_entity_relation_summary(
@@ -125,6 +223,8 @@ async def _handle_entity_relation_summary(
     seperator: str,
     global_config: dict,
     llm_response_cache: BaseKVStorage | None = None,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
 ) -> tuple[str, bool]:
     """Handle entity relation description summary using map-reduce approach.
 
@@ -132,14 +232,17 @@ async def _handle_entity_relation_summary(
     1. If total tokens < summary_context_size and len(description_list) < force_llm_summary_on_merge, no need to summarize
     2. If total tokens < summary_max_tokens, summarize with LLM directly
     3. Otherwise, split descriptions into chunks that fit within token limits
-    4. Summarize each chunk, then recursively process the summaries
-    5. Continue until we get a final summary within token limits or num of descriptions is less than force_llm_summary_on_merge
+    4. Summarize all chunks concurrently, then recursively process the summaries
+    5. Continue until we get a final summary within token limits or num of descriptions is less than force_llm_summary_on_merge,
+       or until summary_max_reduce_depth rounds were done, after which the remaining summaries are summarized once more
 
     Args:
         entity_or_relation_name: Name of the entity or relation being summarized
         description_list: List of description strings to summarize
         global_config: Global configuration containing tokenizer and limits
         llm_response_cache: Optional cache for LLM responses
+        pipeline_status: Optional pipeline status to report map-reduce progress to
+        pipeline_status_lock: Lock guarding pipeline_status
 
     Returns:
         Tuple of (final_summarized_description_string, llm_was_used_boolean)
@@ -157,34 +260,49 @@ async def _handle_entity_relation_summary(
     summary_context_size = global_config["summary_context_size"]
     summary_max_tokens = global_config["summary_max_tokens"]
     force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
+    max_reduce_depth = global_config.get(
+        "summary_max_reduce_depth", DEFAULT_SUMMARY_MAX_REDUCE_DEPTH
+    )
 
-    current_list = description_list[:]  # Copy the list to avoid modifying original
+    # (description, token count) pairs, so each description is only encoded once
+    current_list = [(desc, tokenizer.count_tokens(desc)) for desc in description_list]
     llm_was_used = False  # Track whether LLM was used during the entire process
+    depth = 0
 
     # Iterative map-reduce process
     while True:
         # Calculate total tokens in current list
-        total_tokens = sum(len(tokenizer.encode(desc)) for desc in current_list)
+        total_tokens = sum(tokens for _, tokens in current_list)
+        descriptions = [desc for desc, _ in current_list]
 
         # If total length is within limits, perform final summarization
-        if total_tokens <= summary_context_size or len(current_list) <= 2:
+        if (
+            total_tokens <= summary_context_size
+            or len(current_list) <= 2
+            or depth >= max_reduce_depth
+        ):
             if (
                 len(current_list) < force_llm_summary_on_merge
                 and total_tokens < summary_max_tokens
             ):
                 # no LLM needed, just join the descriptions
-                final_description = seperator.join(current_list)
+                final_description = seperator.join(descriptions)
                 return final_description if final_description else "", llm_was_used
             else:
                 if total_tokens > summary_context_size and len(current_list) <= 2:
                     logger.warning(
                         f"Summarizing {entity_or_relation_name}: Oversize descpriton found"
                     )
+                elif total_tokens > summary_context_size:
+                    logger.warning(
+                        f"Summarizing {entity_or_relation_name}: reduce depth limit {max_reduce_depth} reached, "
+                        f"truncating {len(current_list)} descriptions ({total_tokens} tokens) for the final summary"
+                    )
                 # Final summarization of remaining descriptions - LLM will be used
                 final_summary = await _summarize_descriptions(
                     description_type,
                     entity_or_relation_name,
-                    current_list,
+                    descriptions,
                     global_config,
                     llm_response_cache,
                 )
@@ -197,15 +315,13 @@ async def _handle_entity_relation_summary(
         current_tokens = 0
 
         # Currently least 3 descriptions in current_list
-        for i, desc in enumerate(current_list):
-            desc_tokens = len(tokenizer.encode(desc))
-
+        for desc, desc_tokens in current_list:
             # If adding current description would exceed limit, finalize current chunk
             if current_tokens + desc_tokens > summary_context_size and current_chunk:
                 # Ensure we have at least 2 descriptions in the chunk (when possible)
                 if len(current_chunk) == 1:
                     # Force add one more description to ensure minimum 2 per chunk
-                    current_chunk.append(desc)
+                    current_chunk.append((desc, desc_tokens))
                     chunks.append(current_chunk)
                     logger.warning(
                         f"Summarizing {entity_or_relation_name}: Oversize descpriton found"
@@ -214,37 +330,49 @@ async def _handle_entity_relation_summary(
                     current_tokens = 0
                 else:  # curren_chunk is ready for summary in reduce phase
                     chunks.append(current_chunk)
-                    current_chunk = [desc]  # leave it for next group
+                    current_chunk = [(desc, desc_tokens)]  # leave it for next group
                     current_tokens = desc_tokens
             else:
-                current_chunk.append(desc)
+                current_chunk.append((desc, desc_tokens))
                 current_tokens += desc_tokens
 
         # Add the last chunk if it exists
         if current_chunk:
             chunks.append(current_chunk)
 
-        logger.info(
-            f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups"
-        )
+        depth += 1
+        status_message = f"   Summarizing {entity_or_relation_name}: Map {len(current_list)} descriptions into {len(chunks)} groups (round {depth})"
+        logger.info(status_message)
+        if pipeline_status is not None and pipeline_status_lock is not None:
+            async with pipeline_status_lock:
+                pipeline_status["latest_message"] = status_message
+                pipeline_status["history_messages"].append(status_message)
 
-        # Reduce phase: summarize each group from chunks
-        new_summaries = []
-        for chunk in chunks:
+        # Reduce phase: summarize all groups of this round concurrently, the LLM
+        # priority limiter bounds the actual number of parallel calls
+        async def reduce_chunk(chunk: list[tuple[str, int]]) -> tuple[str, int]:
             if len(chunk) == 1:
                 # Optimization: single description chunks don't need LLM summarization
-                new_summaries.append(chunk[0])
-            else:
-                # Multiple descriptions need LLM summarization
-                summary = await _summarize_descriptions(
-                    description_type,
-                    entity_or_relation_name,
-                    chunk,
-                    global_config,
-                    llm_response_cache,
-                )
-                new_summaries.append(summary)
-                llm_was_used = True  # Mark that LLM was used in reduce phase
+                return chunk[0]
+            summary = await _summarize_descriptions(
+                description_type,
+                entity_or_relation_name,
+                [desc for desc, _ in chunk],
+                global_config,
+                llm_response_cache,
+            )
+            return summary, tokenizer.count_tokens(summary)
+
+        tasks = [asyncio.create_task(reduce_chunk(chunk)) for chunk in chunks]
+        try:
+            new_summaries = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        if any(len(chunk) > 1 for chunk in chunks):
+            llm_was_used = True  # Mark that LLM was used in reduce phase
 
         # Update current list with new summaries for next iteration
         current_list = new_summaries
@@ -1350,6 +1478,8 @@ async def _merge_nodes_then_upsert(
             GRAPH_FIELD_SEP,
             global_config,
             llm_response_cache,
+            pipeline_status,
+            pipeline_status_lock,
         )
 
         # Log based on actual LLM usage
@@ -1482,6 +1612,8 @@ async def _merge_edges_then_upsert(
             GRAPH_FIELD_SEP,
             global_config,
             llm_response_cache,
+            pipeline_status,
+            pipeline_status_lock,
         )
 
         # Log based on actual LLM usage
@@ -1576,6 +1708,153 @@ async def _merge_edges_then_upsert(
     return edge_data
 
 
+class VDBUpsertBuffer:
+    """Collects entity/relation VDB payloads produced during the merge stage
+
+    Instead of one embedding call per merged entity or relation, payloads are
+    accumulated and written with a single upsert per vector storage, so the
+    storage can embed them in full `embedding_batch_num` sized batches.
+    """
+
+    def __init__(
+        self,
+        knowledge_graph_inst: BaseGraphStorage,
+        entity_vdb: BaseVectorStorage | None,
+        relationships_vdb: BaseVectorStorage | None,
+        global_config: dict,
+    ):
+        self.knowledge_graph_inst = knowledge_graph_inst
+        self.entity_vdb = entity_vdb
+        self.relationships_vdb = relationships_vdb
+        self.global_config = global_config
+        # Later payloads for the same id replace earlier ones
+        self._entities: dict[str, dict] = {}
+        self._relations: dict[str, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self._entities) + len(self._relations)
+
+    def add_entity(self, entity_data: dict) -> None:
+        if self.entity_vdb is None or not entity_data:
+            return
+        entity_name = entity_data["entity_name"]
+        self._entities[compute_mdhash_id(entity_name, prefix="ent-")] = {
+            "entity_name": entity_name,
+            "entity_type": entity_data["entity_type"],
+            "content": f"{entity_name}\n{entity_data['description']}",
+            "source_id": entity_data["source_id"],
+            "file_path": entity_data.get("file_path", "unknown_source"),
+        }
+
+    def add_relation(self, edge_data: dict) -> None:
+        if self.relationships_vdb is None or not edge_data:
+            return
+        src_id, tgt_id = edge_data["src_id"], edge_data["tgt_id"]
+        self._relations[compute_mdhash_id(src_id + tgt_id, prefix="rel-")] = {
+            "src_id": src_id,
+            "tgt_id": tgt_id,
+            "keywords": edge_data["keywords"],
+            "content": f"{src_id}\t{tgt_id}\n{edge_data['keywords']}\n{edge_data['description']}",
+            "source_id": edge_data["source_id"],
+            "file_path": edge_data.get("file_path", "unknown_source"),
+            "weight": edge_data.get("weight", 1.0),
+        }
+
+    async def _refresh_from_graph(self) -> None:
+        """Rebuild payloads from the current graph state
+
+        Another document may have merged the same entity or relation after it was
+        buffered here, so the latest graph values are used to avoid writing a
+        stale description into the VDB.
+        """
+        if self._entities:
+            entity_names = [v["entity_name"] for v in self._entities.values()]
+            nodes = await self.knowledge_graph_inst.get_nodes_batch(entity_names)
+            for entity_name, node in nodes.items():
+                self.add_entity({**node, "entity_name": entity_name})
+
+        if self._relations:
+            buffered = list(self._relations.values())
+            edges = await self.knowledge_graph_inst.get_edges_batch(
+                [{"src": v["src_id"], "tgt": v["tgt_id"]} for v in buffered]
+            )
+            for v in buffered:
+                edge = edges.get((v["src_id"], v["tgt_id"]))
+                if edge:
+                    self.add_relation(
+                        {
+                            "keywords": v["keywords"],
+                            **edge,
+                            "src_id": v["src_id"],
+                            "tgt_id": v["tgt_id"],
+                        }
+                    )
+
+    async def flush(self) -> None:
+        """Write all buffered payloads with one bulk upsert per vector storage"""
+        if not self._entities and not self._relations:
+            return
+
+        lock_keys = {v["entity_name"] for v in self._entities.values()}
+        for v in self._relations.values():
+            lock_keys.update((v["src_id"], v["tgt_id"]))
+
+        # Only reading the graph needs the keyed locks, embedding runs without them
+        workspace = self.global_config.get("workspace", "")
+        namespace = f"{workspace}:GraphDB" if workspace else "GraphDB"
+        async with get_storage_keyed_lock(
+            list(lock_keys), namespace=namespace, enable_logging=False
+        ):
+            await self._refresh_from_graph()
+            entities, self._entities = self._entities, {}
+            relations, self._relations = self._relations, {}
+
+        if entities:
+            await self._upsert(
+                self.entity_vdb,
+                entities,
+                "entity_upsert",
+                lambda v: v["entity_name"],
+            )
+        if relations:
+            await self._upsert(
+                self.relationships_vdb,
+                relations,
+                "relationship_upsert",
+                lambda v: f"{v['src_id']}-{v['tgt_id']}",
+            )
+
+    async def _upsert(
+        self,
+        vdb: BaseVectorStorage,
+        payloads: dict[str, dict],
+        operation_name: str,
+        item_name: Callable[[dict], str],
+    ) -> None:
+        """Upsert all payloads at once, falling back to per-item upserts
+
+        If the bulk upsert fails, each item is upserted on its own with the
+        usual retries, so one bad item cannot fail the whole batch.
+        """
+        try:
+            await vdb.upsert(payloads)
+            return
+        except Exception as e:
+            logger.warning(
+                f"VDB batch {operation_name} of {len(payloads)} items failed, upserting one by one: {e}"
+            )
+
+        for vdb_id, payload in payloads.items():
+            # Use safe operation wrapper - VDB failure must throw exception
+            await safe_vdb_operation_with_exception(
+                operation=lambda data={vdb_id: payload}: vdb.upsert(data),
+                operation_name=operation_name,
+                entity_name=item_name(payload),
+                max_retries=3,
+                retry_delay=0.1,
+            )
+
+
 async def merge_nodes_and_edges(
     chunk_results: list,
     knowledge_graph_inst: BaseGraphStorage,
@@ -1643,6 +1922,13 @@ async def merge_nodes_and_edges(
     graph_max_async = global_config.get("llm_model_max_async", 4) * 2
     semaphore = asyncio.Semaphore(graph_max_async)
 
+    # Buffer VDB payloads for a bulk upsert at the end of Phase 2
+    vdb_upsert_buffer = None
+    if global_config.get("merge_vdb_batch_upsert"):
+        vdb_upsert_buffer = VDBUpsertBuffer(
+            knowledge_graph_inst, entity_vdb, relationships_vdb, global_config
+        )
+
     # ===== Phase 1: Process all entities concurrently =====
     log_message = f"Phase 1: Processing {total_entities_count} entities from {doc_id} (async: {graph_max_async})"
     logger.info(log_message)
@@ -1670,7 +1956,9 @@ async def merge_nodes_and_edges(
                     )
 
                     # Vector database operation (equally critical, must succeed)
-                    if entity_vdb is not None and entity_data:
+                    if vdb_upsert_buffer is not None:
+                        vdb_upsert_buffer.add_entity(entity_data)
+                    elif entity_vdb is not None and entity_data:
                         data_for_vdb = {
                             compute_mdhash_id(
                                 entity_data["entity_name"], prefix="ent-"
@@ -1804,6 +2092,12 @@ async def merge_nodes_and_edges(
                         return None, []
 
                     # Vector database operation (equally critical, must succeed)
+                    if vdb_upsert_buffer is not None:
+                        vdb_upsert_buffer.add_relation(edge_data)
+                        for entity_data in added_entities:
+                            vdb_upsert_buffer.add_entity(entity_data)
+                        return edge_data, added_entities
+
                     if relationships_vdb is not None:
                         data_for_vdb = {
                             compute_mdhash_id(
@@ -1935,6 +2229,15 @@ async def merge_nodes_and_edges(
                 processed_edges.append(edge_data)
             all_added_entities.extend(added_entities)
 
+    # Bulk upsert the buffered VDB payloads
+    if vdb_upsert_buffer is not None and len(vdb_upsert_buffer) > 0:
+        log_message = f"Upserting vectors for {len(vdb_upsert_buffer)} entities and relations from {doc_id}"
+        logger.info(log_message)
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
+        await vdb_upsert_buffer.flush()
+
     # ===== Phase 3: Update full_entities and full_relations storage =====
     if full_entities_storage and full_relations_storage and doc_id:
         try:
@@ -2356,9 +2659,10 @@ async def kg_query(
 
     # Call LLM
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(query + sys_prompt))
+    query_tokens = tokenizer.count_tokens(query)
+    sys_prompt_tokens = tokenizer.count_tokens(sys_prompt)
     logger.debug(
-        f"[kg_query] Sending to LLM: {len_of_prompts:,} tokens (Query: {len(tokenizer.encode(query))}, System: {len(tokenizer.encode(sys_prompt))})"
+        f"[kg_query] Sending to LLM: {query_tokens + sys_prompt_tokens:,} tokens (Query: {query_tokens}, System: {sys_prompt_tokens})"
     )
 
     # Handle cache
@@ -2523,7 +2827,7 @@ async def extract_keywords_only(
     )
 
     tokenizer: Tokenizer = global_config["tokenizer"]
-    len_of_prompts = len(tokenizer.encode(kw_prompt))
+    len_of_prompts = tokenizer.count_tokens(kw_prompt)
     logger.debug(
         f"[extract_keywords] Sending to LLM: {len_of_prompts:,} tokens (Prompt: {len_of_prompts})"
     )
@@ -2644,6 +2948,57 @@ async def _get_vector_context(
         return []
 
 
+async def _run_retrieval_legs(
+    legs: dict[str, tuple[Awaitable, Any]], timeout: float
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """
+    Run independent retrieval legs concurrently, each under its own timeout.
+
+    Args:
+        legs: Mapping of leg name to (awaitable, fallback result used on timeout)
+        timeout: Maximum seconds per leg, 0 or less disables the timeout
+
+    Returns:
+        Results per leg, and per-leg timing info: {"elapsed": seconds, "status": "ok" | "timeout"}
+    """
+    timings = {}
+
+    async def run_leg(name: str, awaitable: Awaitable, fallback: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            if timeout and timeout > 0:
+                result = await asyncio.wait_for(awaitable, timeout)
+            else:
+                result = await awaitable
+            status = "ok"
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Retrieval leg '{name}' timed out after {timeout}s, continuing with partial results"
+            )
+            result, status = fallback, "timeout"
+        timings[name] = {
+            "elapsed": round(time.perf_counter() - start, 4),
+            "status": status,
+        }
+        return result
+
+    tasks = [
+        asyncio.create_task(run_leg(name, awaitable, fallback))
+        for name, (awaitable, fallback) in legs.items()
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # One leg failed: don't leave the others running in the background
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    logger.debug(f"Retrieval leg timings: {timings}")
+    return dict(zip(legs, results)), timings
+
+
 async def _perform_kg_search(
     query: str,
     ll_keywords: str,
@@ -2660,89 +3015,94 @@ async def _perform_kg_search(
     No token truncation or formatting - just raw search results.
     """
 
-    # Initialize result containers
-    local_entities = []
-    local_relations = []
-    global_entities = []
-    global_relations = []
-    vector_chunks = []
-    chunk_tracking = {}
-
-    # Handle different query modes
-
     # Track chunk sources and metadata for final logging
     chunk_tracking = {}  # chunk_id -> {source, frequency, order}
 
-    # Pre-compute query embedding once for all vector operations
+    # Pre-compute query embedding once for all vector operations. It runs
+    # alongside the graph legs and is awaited by the vector leg only.
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
-        embedding_func_config = text_chunks_db.embedding_func
-        if embedding_func_config and embedding_func_config.func:
-            try:
-                query_embedding = await embedding_func_config.func([query])
-                query_embedding = query_embedding[
-                    0
-                ]  # Extract first embedding from batch result
-                logger.debug("Pre-computed query embedding for all vector operations")
-            except Exception as e:
-                logger.warning(f"Failed to pre-compute query embedding: {e}")
-                query_embedding = None
+    embedding_func_config = text_chunks_db.embedding_func
 
-    # Handle local and global modes
-    if query_param.mode == "local" and len(ll_keywords) > 0:
-        local_entities, local_relations = await _get_node_data(
-            ll_keywords,
-            knowledge_graph_inst,
-            entities_vdb,
-            query_param,
-        )
+    async def compute_query_embedding():
+        try:
+            query_embedding = await embedding_func_config.func([query])
+            logger.debug("Pre-computed query embedding for all vector operations")
+            return query_embedding[0]  # Extract first embedding from batch result
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embedding: {e}")
+            return None
 
-    elif query_param.mode == "global" and len(hl_keywords) > 0:
-        global_relations, global_entities = await _get_edge_data(
-            hl_keywords,
-            knowledge_graph_inst,
-            relationships_vdb,
-            query_param,
+    embedding_task = None
+    if (
+        query
+        and (kg_chunk_pick_method == "VECTOR" or chunks_vdb)
+        and embedding_func_config
+        and embedding_func_config.func
+    ):
+        embedding_task = asyncio.create_task(compute_query_embedding())
+
+    async def vector_leg():
+        # Shield the embedding so a vector leg timeout keeps it for chunk picking
+        query_embedding = (
+            await asyncio.shield(embedding_task) if embedding_task else None
+        )
+        return await _get_vector_context(
+            query, chunks_vdb, query_param, query_embedding
         )
 
-    else:  # hybrid or mix mode
-        if len(ll_keywords) > 0:
-            local_entities, local_relations = await _get_node_data(
-                ll_keywords,
-                knowledge_graph_inst,
-                entities_vdb,
-                query_param,
-            )
-        if len(hl_keywords) > 0:
-            global_relations, global_entities = await _get_edge_data(
-                hl_keywords,
-                knowledge_graph_inst,
-                relationships_vdb,
-                query_param,
-            )
+    # Local, global and vector retrieval are independent: run them concurrently.
+    # local/global modes fall back to both graph legs when their keywords are empty.
+    use_local = len(ll_keywords) > 0 and not (
+        query_param.mode == "global" and len(hl_keywords) > 0
+    )
+    use_global = len(hl_keywords) > 0 and not (
+        query_param.mode == "local" and len(ll_keywords) > 0
+    )
+    legs = {}
+    if use_local:
+        legs["local"] = (
+            _get_node_data(
+                ll_keywords, knowledge_graph_inst, entities_vdb, query_param
+            ),
+            ([], []),
+        )
+    if use_global:
+        legs["global"] = (
+            _get_edge_data(
+                hl_keywords, knowledge_graph_inst, relationships_vdb, query_param
+            ),
+            ([], []),
+        )
+    if query_param.mode == "mix" and chunks_vdb:
+        legs["vector"] = (vector_leg(), [])
 
-        # Get vector chunks for mix mode
-        if query_param.mode == "mix" and chunks_vdb:
-            vector_chunks = await _get_vector_context(
-                query,
-                chunks_vdb,
-                query_param,
-                query_embedding,
-            )
-            # Track vector chunks with source metadata
-            for i, chunk in enumerate(vector_chunks):
-                chunk_id = chunk.get("chunk_id") or chunk.get("id")
-                if chunk_id:
-                    chunk_tracking[chunk_id] = {
-                        "source": "C",
-                        "frequency": 1,  # Vector chunks always have frequency 1
-                        "order": i + 1,  # 1-based order in vector search results
-                    }
-                else:
-                    logger.warning(f"Vector chunk missing chunk_id: {chunk}")
+    try:
+        leg_results, retrieval_timings = await _run_retrieval_legs(
+            legs, query_param.retrieval_leg_timeout
+        )
+        query_embedding = await embedding_task if embedding_task else None
+    except BaseException:
+        if embedding_task:
+            embedding_task.cancel()
+        raise
+
+    local_entities, local_relations = leg_results.get("local", ([], []))
+    global_relations, global_entities = leg_results.get("global", ([], []))
+    vector_chunks = leg_results.get("vector", [])
+
+    # Track vector chunks with source metadata
+    for i, chunk in enumerate(vector_chunks):
+        chunk_id = chunk.get("chunk_id") or chunk.get("id")
+        if chunk_id:
+            chunk_tracking[chunk_id] = {
+                "source": "C",
+                "frequency": 1,  # Vector chunks always have frequency 1
+                "order": i + 1,  # 1-based order in vector search results
+            }
+        else:
+            logger.warning(f"Vector chunk missing chunk_id: {chunk}")
 
     # Round-robin merge entities
     final_entities = []
@@ -2810,6 +3170,7 @@ async def _perform_kg_search(
         "vector_chunks": vector_chunks,
         "chunk_tracking": chunk_tracking,
         "query_embedding": query_embedding,
+        "retrieval_timings": retrieval_timings,
     }
 
 
@@ -3150,7 +3511,7 @@ async def _build_llm_context(
         text_chunks_str="",
         reference_list_str="",
     )
-    kg_context_tokens = len(tokenizer.encode(pre_kg_context))
+    kg_context_tokens = tokenizer.count_tokens(pre_kg_context)
 
     # Calculate preliminary system prompt tokens
     pre_sys_prompt = sys_prompt_template.format(
@@ -3158,10 +3519,10 @@ async def _build_llm_context(
         response_type=response_type,
         user_prompt=user_prompt,
     )
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
 
     # Calculate available tokens for text chunks
-    query_tokens = len(tokenizer.encode(query))
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + kg_context_tokens + query_tokens + buffer_tokens
@@ -3362,6 +3723,9 @@ async def _build_query_context(
         "high_level": hl_keywords_list,
         "low_level": ll_keywords_list,
     }
+    raw_data["metadata"]["retrieval_timings"] = search_result.get(
+        "retrieval_timings", {}
+    )
     raw_data["metadata"]["processing_info"] = {
         "total_entities_found": len(search_result.get("final_entities", [])),
         "total_relations_found": len(search_result.get("final_relations", [])),
@@ -4061,8 +4425,8 @@ async def naive_query(
     )
 
     # Calculate available tokens for chunks
-    sys_prompt_tokens = len(tokenizer.encode(pre_sys_prompt))
-    query_tokens = len(tokenizer.encode(query))
+    sys_prompt_tokens = tokenizer.count_tokens(pre_sys_prompt)
+    query_tokens = tokenizer.count_tokens(query)
     buffer_tokens = 200  # reserved for reference list and safety buffer
     available_chunk_tokens = max_total_tokens - (
         sys_prompt_tokens + query_tokens + buffer_tokens
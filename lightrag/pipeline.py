@@ -0,0 +1,234 @@
+"""
+Staged execution for the document ingestion pipeline.
+
+A document goes through chunking, chunk embedding, entity extraction, merging
+and persisting. Running these steps back to back for each document keeps one
+backend idle while another is busy: the LLM waits while chunks are embedded,
+and extraction of the next document cannot start while the current one is
+merging. ``StagedPipeline`` instead runs every step as an independent stage:
+
+- each stage has its own worker count and an input queue bounded by
+  ``queue_size``, so a slow stage applies backpressure to the stages feeding it
+- a handler returns the item to hand to the next stage, or ``None`` to drop it
+- a handler raising an exception drops the item and calls ``on_error``
+- ``batch`` stages receive every item waiting in their queue at once, so work
+  such as flushing storages is done once for several documents
+
+``stats()`` reports per-stage queue depth, active workers, completed and failed
+counts and throughput; ``on_update`` receives it at most once per
+``update_interval`` seconds and once more when the run ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+from lightrag.utils import logger
+
+_STOP = object()
+
+
+def parse_stage_workers(value: str | None) -> dict[str, int]:
+    """Parse a ``"stage:workers,stage:workers"`` setting such as ``"extract:4,merge:2"``"""
+    workers: dict[str, int] = {}
+    if not value:
+        return workers
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, sep, count = part.partition(":")
+        if not sep:
+            raise ValueError(
+                f"Invalid stage worker setting '{part}', expected name:count"
+            )
+        workers[name.strip()] = int(count)
+    return workers
+
+
+@dataclass
+class PipelineStage:
+    """One step of a ``StagedPipeline``
+
+    Args:
+        name: Stage name used in stats and error reports.
+        handler: Coroutine function processing one item, or a list of items for
+            batch stages. Its return value is passed to the next stage; ``None``
+            stops the item. A batch handler returns a list of items.
+        workers: Number of concurrent workers.
+        batch: Hand all queued items to the handler at once.
+    """
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+    batch: bool = False
+
+    def __post_init__(self):
+        self.workers = max(1, self.workers)
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at: float | None = None
+        self.busy_time = 0.0
+
+
+class StagedPipeline:
+    """Run items through stages connected by bounded queues
+
+    Args:
+        stages: Stages in execution order.
+        queue_size: Capacity of the queue in front of each stage.
+        on_error: Awaitable callback ``(stage_name, item, exception)`` for items
+            whose handler raised.
+        on_update: Awaitable callback invoked with ``stats()`` as items move.
+        update_interval: Minimum seconds between ``on_update`` calls, since
+            publishing stats may be costly (e.g. a multiprocess shared dict).
+    """
+
+    def __init__(
+        self,
+        stages: list[PipelineStage],
+        queue_size: int,
+        on_error: Callable[[str, Any, BaseException], Awaitable[None]] | None = None,
+        on_update: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        update_interval: float = 1.0,
+    ):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.on_error = on_error
+        self.on_update = on_update
+        self.update_interval = update_interval
+        self._queues: list[asyncio.Queue] = []
+        self._last_update = 0.0
+
+    async def run(self, items: Iterable[Any]) -> None:
+        """Feed ``items`` into the first stage and return once every stage has drained"""
+        self._queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        self._last_update = 0.0
+        tasks: list[asyncio.Task] = []
+        try:
+            tasks.append(asyncio.create_task(self._feed(items)))
+            for index, stage in enumerate(self.stages):
+                workers = [
+                    asyncio.create_task(self._worker(index))
+                    for _ in range(stage.workers)
+                ]
+                tasks.extend(workers)
+                tasks.append(asyncio.create_task(self._close_next(index, workers)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await self._report(force=True)
+
+    async def _feed(self, items: Iterable[Any]) -> None:
+        for item in items:
+            await self._queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            await self._queues[0].put(_STOP)
+
+    async def _close_next(self, index: int, workers: list[asyncio.Task]) -> None:
+        # Once a stage has drained, stop the workers of the stage after it
+        await asyncio.gather(*workers)
+        if index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].workers):
+                await self._queues[index + 1].put(_STOP)
+
+    async def _worker(self, index: int) -> None:
+        stage = self.stages[index]
+        queue = self._queues[index]
+        next_queue = self._queues[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = await queue.get()
+            if item is _STOP:
+                return
+
+            stop = False
+            if stage.batch:
+                batch = [item]
+                while not queue.empty():
+                    item = queue.get_nowait()
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                item = batch
+                size = len(batch)
+            else:
+                size = 1
+
+            if stage.started_at is None:
+                stage.started_at = time.monotonic()
+            stage.active += 1
+            await self._report()
+            start = time.monotonic()
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                stage.failed += size
+                await self._handle_error(stage, item, e)
+                result = None
+            else:
+                stage.completed += size
+            finally:
+                stage.active -= 1
+                stage.busy_time += time.monotonic() - start
+
+            if next_queue is not None and result is not None:
+                for out in result if stage.batch else [result]:
+                    await next_queue.put(out)
+            await self._report()
+
+            if stop:
+                return
+
+    async def _handle_error(
+        self, stage: PipelineStage, item: Any, error: BaseException
+    ) -> None:
+        if self.on_error is None:
+            logger.error(f"Pipeline stage {stage.name} failed: {error}")
+            return
+        for failed in item if stage.batch else [item]:
+            try:
+                await self.on_error(stage.name, failed, error)
+            except Exception as e:
+                logger.error(
+                    f"Error handler of pipeline stage {stage.name} failed: {e}"
+                )
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, active workers, outcome counters and throughput per stage"""
+        now = time.monotonic()
+        stats = {}
+        for index, stage in enumerate(self.stages):
+            elapsed = now - stage.started_at if stage.started_at else 0.0
+            stats[stage.name] = {
+                "workers": stage.workers,
+                "queued": self._queues[index].qsize() if self._queues else 0,
+                "active": stage.active,
+                "completed": stage.completed,
+                "failed": stage.failed,
+                "docs_per_min": round(stage.completed * 60 / elapsed, 2)
+                if elapsed
+                else 0.0,
+                "busy_seconds": round(stage.busy_time, 2),
+            }
+        return stats
+
+    async def _report(self, force: bool = False) -> None:
+        if self.on_update is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_update < self.update_interval:
+            return
+        self._last_update = now
+        try:
+            await self.on_update(self.stats())
+        except Exception as e:
+            logger.warning(f"Failed to publish pipeline stage stats: {e}")
@@ -23,6 +23,8 @@ import traceback
 import colorsys
 import os
 
+from lightrag.kg.networkx_impl import NetworkXStorage
+
 CUSTOM_FONT = "font.ttf"
 
 DEFAULT_FONT_ENG = "Geist-Regular.ttf"
@@ -512,7 +514,7 @@ class GraphViewer:
         self.sphere_index_buffer = None
 
     def load_file(self, filepath: str):
-        """Load a GraphML file with error handling"""
+        """Load a GraphML file or a NetworkXStorage snapshot with error handling"""
         try:
             # Clear existing data
             self.id_node_map.clear()
@@ -522,7 +524,14 @@ class GraphViewer:
             self.setup_buffers()
 
             # Load new graph
-            self.graph = nx.read_graphml(filepath)
+            if filepath.endswith(".snapshot"):
+                # NetworkXStorage snapshot plus the changes logged since it was written
+                oplog_file = filepath[: -len(".snapshot")] + ".oplog"
+                self.graph, _, _ = NetworkXStorage.load_snapshot_graph(
+                    filepath, oplog_file
+                )
+            else:
+                self.graph = nx.read_graphml(filepath)
             self.calculate_layout()
             self.update_buffers()
             self.show_load_error = False
@@ -973,10 +982,14 @@ def generate_colors(n: int) -> List[glm.vec3]:
 
 
 def show_file_dialog() -> Optional[str]:
-    """Show a file dialog for selecting GraphML files"""
+    """Show a file dialog for selecting GraphML files or NetworkXStorage snapshots"""
     file_path = filedialog.askopenfilename(
         title="Select GraphML File",
-        filetypes=[("GraphML files", "*.graphml"), ("All files", "*.*")],
+        filetypes=[
+            ("GraphML files", "*.graphml"),
+            ("NetworkX snapshots", "*.snapshot"),
+            ("All files", "*.*"),
+        ],
     )
     return file_path if file_path else None
 
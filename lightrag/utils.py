@@ -2,6 +2,7 @@ from __future__ import annotations
 import weakref
 
 import asyncio
+import copy
 import html
 import csv
 import json
@@ -9,16 +10,19 @@ import logging
 import logging.handlers
 import os
 import re
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
-from hashlib import md5
+from hashlib import blake2b, md5
 from typing import Any, Protocol, Callable, TYPE_CHECKING, List, Optional
 import numpy as np
 from dotenv import load_dotenv
 
+from lightrag.prompt import PROMPTS
 from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
@@ -26,6 +30,7 @@ from lightrag.constants import (
     GRAPH_FIELD_SEP,
     DEFAULT_MAX_TOTAL_TOKENS,
     DEFAULT_MAX_FILE_PATH_LENGTH,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
 )
 
 # Initialize logger with basic configuration
@@ -918,6 +923,10 @@ class Tokenizer:
     A wrapper around a tokenizer to provide a consistent interface for encoding and decoding.
     """
 
+    count_cache_size: int = DEFAULT_TOKEN_COUNT_CACHE_SIZE
+    # Guards the count cache setup of subclasses that skip __init__
+    _count_setup_lock = threading.Lock()
+
     def __init__(self, model_name: str, tokenizer: TokenizerInterface):
         """
         Initializes the Tokenizer with a tokenizer model name and a tokenizer instance.
@@ -928,6 +937,17 @@ class Tokenizer:
         """
         self.model_name: str = model_name
         self.tokenizer: TokenizerInterface = tokenizer
+        self._init_count_cache()
+
+    def _init_count_cache(self) -> None:
+        # The lock is set first: a cache that is visible has its lock
+        self._count_lock = threading.Lock()
+        self._count_cache: OrderedDict[bytes, int] = OrderedDict()
+
+    def __deepcopy__(self, memo):
+        # Tokenizers are stateless apart from the count cache, so config snapshots
+        # (asdict on LightRAG) share the instance and its cache instead of copying the lock
+        return self
 
     def encode(self, content: str) -> List[int]:
         """
@@ -953,6 +973,39 @@ class Tokenizer:
         """
         return self.tokenizer.decode(tokens)
 
+    def count_tokens(self, content: str) -> int:
+        """
+        Returns the number of tokens in a string.
+
+        Counts are memoized in a bounded LRU keyed by a 128-bit BLAKE2b digest of
+        the content, so the entity, relation and chunk records serialized by every
+        query are only encoded once.
+
+        Args:
+            content: The string to count tokens for.
+
+        Returns:
+            The number of tokens.
+        """
+        if "_count_cache" not in self.__dict__:
+            with Tokenizer._count_setup_lock:
+                if "_count_cache" not in self.__dict__:
+                    self._init_count_cache()
+
+        key = blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self._count_lock:
+            count = self._count_cache.get(key)
+            if count is not None:
+                self._count_cache.move_to_end(key)
+                return count
+
+        count = len(self.encode(content))
+        with self._count_lock:
+            self._count_cache[key] = count
+            if len(self._count_cache) > self.count_cache_size:
+                self._count_cache.popitem(last=False)
+        return count
+
 
 class TiktokenTokenizer(Tokenizer):
     """
@@ -1010,12 +1063,22 @@ def truncate_list_by_token_size(
     max_token_size: int,
     tokenizer: Tokenizer,
 ) -> list[int]:
-    """Truncate a list of data by token size"""
+    """Truncate a list of data by token size
+
+    Keeps the longest prefix whose running token total fits in max_token_size,
+    using the tokenizer's memoized counts when available.
+    """
     if max_token_size <= 0:
         return []
+    count_tokens = getattr(tokenizer, "count_tokens", None)
+    if count_tokens is None:
+
+        def count_tokens(content):
+            return len(tokenizer.encode(content))
+
     tokens = 0
     for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+        tokens += count_tokens(key(data))
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
@@ -1123,6 +1186,205 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
     await hashing_kv.upsert({flattened_key: cache_entry})
 
 
+@dataclass
+class _SemanticCacheEntry:
+    query: str
+    scope: str
+    embedding: np.ndarray
+    result: dict
+    created_at: float
+
+
+class SemanticQueryCache:
+    """In-memory cache of final query results, matched by query embedding similarity.
+
+    Entries are partitioned by ``scope`` (a hash of every query parameter that
+    affects the answer), so a cached answer is only reused for a paraphrased
+    question asked with the same settings. The nearest cached query is found
+    with one matrix-vector product over the normalized embeddings.
+
+    Every change to the knowledge base starts a new generation. With
+    ``attach_shared_state`` the generation lives in a dict shared by all worker
+    processes, so an update in one worker invalidates the entries of all others.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float,
+        max_entries: int,
+        ttl: float = 0,
+        llm_check_func: Callable[..., Any] | None = None,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.llm_check_func = llm_check_func
+        self._entries: OrderedDict[str, _SemanticCacheEntry] = OrderedDict()
+        # Stacked embeddings for all entries, rebuilt lazily after changes
+        self._matrix: np.ndarray | None = None
+        self._matrix_keys: list[str] = []
+        self._matrix_scopes: np.ndarray | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = 0
+        self._shared_state = None
+
+    def attach_shared_state(self, state) -> None:
+        """Share the cache generation with other workers through ``state``"""
+        self._shared_state = state
+        self._generation = state.get("generation", 0)
+
+    def current_generation(self) -> int:
+        """Generation of the knowledge base, dropping entries of older generations"""
+        if self._shared_state is not None:
+            generation = self._shared_state.get("generation", 0)
+            if generation != self._generation:
+                self.clear()
+                self._generation = generation
+        return self._generation
+
+    def invalidate(self) -> None:
+        """Drop all entries and start a new generation; callers serialize this across workers"""
+        generation = self.current_generation() + 1
+        if self._shared_state is not None:
+            self._shared_state["generation"] = generation
+        self._generation = generation
+        self.clear()
+
+    def _expire(self) -> None:
+        if not self.ttl or self.ttl <= 0:
+            return
+        deadline = time.time() - self.ttl
+        # LRU moves reorder entries, so creation times are not sorted
+        expired = [k for k, e in self._entries.items() if e.created_at < deadline]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self.evictions += len(expired)
+            self._matrix = None
+
+    def _get_matrix(self) -> tuple[np.ndarray, list[str], np.ndarray]:
+        if self._matrix is None:
+            self._matrix_keys = list(self._entries.keys())
+            self._matrix = np.stack(
+                [self._entries[k].embedding for k in self._matrix_keys]
+            )
+            self._matrix_scopes = np.array(
+                [self._entries[k].scope for k in self._matrix_keys], dtype=object
+            )
+        return self._matrix, self._matrix_keys, self._matrix_scopes
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    async def lookup(self, query: str, embedding, scope: str) -> dict | None:
+        """Return the cached result of the most similar query in ``scope``, or None"""
+        self.current_generation()
+        self._expire()
+        if not self._entries:
+            self.misses += 1
+            return None
+
+        matrix, keys, scopes = self._get_matrix()
+        mask = scopes == scope
+        if not mask.any():
+            self.misses += 1
+            return None
+
+        similarities = matrix @ self._normalize(embedding)
+        similarities[~mask] = -np.inf
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.similarity_threshold:
+            self.misses += 1
+            return None
+
+        key = keys[best]
+        entry = self._entries[key]
+        if self.llm_check_func is not None and entry.query != query:
+            prompt = PROMPTS["similarity_check"].format(
+                original_prompt=query, cached_prompt=entry.query
+            )
+            try:
+                llm_similarity = float((await self.llm_check_func(prompt)).strip())
+            except Exception as e:
+                logger.warning(f"Semantic cache LLM check failed: {e}")
+                llm_similarity = 0.0
+            if llm_similarity < self.similarity_threshold:
+                logger.debug(
+                    f"Semantic cache candidate rejected by LLM check ({llm_similarity}): {entry.query}"
+                )
+                self.misses += 1
+                return None
+            # Entry may have been evicted while awaiting the LLM
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.info(
+            f" == Semantic cache == hit (similarity {similarity:.4f}) for query similar to: {entry.query[:80]}"
+        )
+        result = copy.deepcopy(entry.result)
+        result.setdefault("metadata", {})["semantic_cache"] = {
+            "hit": True,
+            "similarity": round(similarity, 4),
+            "cached_query": entry.query,
+        }
+        return result
+
+    def store(
+        self,
+        query: str,
+        embedding,
+        scope: str,
+        result: dict,
+        generation: int | None = None,
+    ) -> None:
+        """Cache a final query result, evicting the least recently used entries
+
+        ``generation`` is the value of ``current_generation()`` when the query
+        started; the result is not cached if the knowledge base changed since.
+        """
+        if generation is not None and generation != self.current_generation():
+            return
+        key = compute_args_hash(scope, query)
+        self._entries.pop(key, None)
+        self._entries[key] = _SemanticCacheEntry(
+            query=query,
+            scope=scope,
+            embedding=self._normalize(embedding),
+            result=copy.deepcopy(result),
+            created_at=time.time(),
+        )
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._matrix = None
+
+    def clear(self) -> None:
+        """Drop all entries, e.g. after the knowledge base changed"""
+        if self._entries:
+            logger.debug(f"Semantic cache cleared ({len(self._entries)} entries)")
+        self._entries.clear()
+        self._matrix = None
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
 def safe_unicode_decode(content):
     # Regular expression to find all Unicode escape sequences of the form \uXXXX
     unicode_escape_pattern = re.compile(r"\\u([0-9a-fA-F]{4})")
@@ -0,0 +1,72 @@
+"""Fixtures shared by the storage backend tests"""
+
+import numpy as np
+import pytest
+
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+EMBEDDING_DIM = 16
+
+
+@pytest.fixture
+def shared_data():
+    """Single process shared storage, cleared after the test"""
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.fixture
+def restart(shared_data):
+    """Clear the shared data, as seen by a freshly started server process"""
+
+    def restart():
+        finalize_share_data()
+        initialize_share_data()
+
+    return restart
+
+
+@pytest.fixture
+def embedding_func():
+    """Deterministic embedding: one random vector per distinct text"""
+    rng = np.random.default_rng(0)
+    vectors = {}
+
+    async def embed(texts, **kwargs):
+        return np.array(
+            [vectors.setdefault(t, rng.standard_normal(EMBEDDING_DIM)) for t in texts]
+        )
+
+    return EmbeddingFunc(embedding_dim=EMBEDDING_DIM, max_token_size=512, func=embed)
+
+
+@pytest.fixture
+def open_storage(tmp_path, shared_data, embedding_func):
+    """Create and initialize a file based storage under ``tmp_path``
+
+    Keyword arguments are passed as ``vector_db_storage_cls_kwargs``; each call
+    opens a new instance on the same working directory.
+    """
+
+    async def open_storage(storage_cls, namespace, meta_fields=None, **kwargs):
+        extra = {} if meta_fields is None else {"meta_fields": meta_fields}
+        storage = storage_cls(
+            namespace=namespace,
+            workspace="",
+            global_config={
+                "working_dir": str(tmp_path),
+                "embedding_batch_num": 8,
+                "vector_db_storage_cls_kwargs": {
+                    "cosine_better_than_threshold": -1.0,
+                    **kwargs,
+                },
+            },
+            embedding_func=embedding_func,
+            **extra,
+        )
+        await storage.initialize()
+        return storage
+
+    return open_storage
@@ -0,0 +1,174 @@
+"""
+FaissVectorDBStorage with each index type: upserts, deletes and queries through
+the ANN index, stale HNSW entries, background rebuilds and loading an index
+file written before Faiss IDs were mapped with IndexIDMap2.
+"""
+
+import functools
+import json
+import os
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from lightrag.kg.faiss_impl import FaissVectorDBStorage  # noqa: E402
+
+INDEX_TYPES = ["flat", "hnsw", "ivf_flat", "ivf_pq"]
+
+
+@pytest.fixture
+def open_faiss(open_storage):
+    # 4 bit PQ codes train on the few hundred vectors of these tests
+    return functools.partial(
+        open_storage,
+        FaissVectorDBStorage,
+        "chunks",
+        meta_fields={"content"},
+        ann_min_vectors=100,
+        pq_nbits=4,
+    )
+
+
+def chunks(start, end):
+    return {f"chunk-{i}": {"content": f"text {i}"} for i in range(start, end)}
+
+
+async def flush(storage):
+    """Save the storage and wait for the ANN rebuild the save may start"""
+    assert await storage.index_done_callback()
+    if storage._rebuild_task is not None:
+        await storage._rebuild_task
+
+
+async def query_ids(storage, text, top_k):
+    return [r["id"] for r in await storage.query(text, top_k=top_k)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index_type", INDEX_TYPES)
+async def test_upsert_delete_and_query(open_faiss, restart, index_type):
+    storage = await open_faiss(index_type=index_type)
+    await storage.upsert(chunks(0, 300))
+    await flush(storage)
+    assert (storage._ann_index is None) == (index_type == "flat")
+
+    ids = await query_ids(storage, "text 7", 5)
+    assert len(ids) == 5
+    assert "chunk-7" in ids
+    if index_type != "ivf_pq":
+        assert ids[0] == "chunk-7"
+
+    await storage.delete(["chunk-7", "chunk-8"])
+    await storage.upsert({"chunk-9": {"content": "moved"}})
+    ids = await query_ids(storage, "text 7", 5)
+    assert len(ids) == 5
+    assert not {"chunk-7", "chunk-8"} & set(ids)
+    assert "chunk-9" in await query_ids(storage, "moved", 3)
+    assert (await storage.get_by_id("chunk-9"))["content"] == "moved"
+    await flush(storage)
+
+    restart()
+    reloaded = await open_faiss(index_type=index_type)
+    assert (reloaded._ann_index is None) == (index_type == "flat")
+    assert await reloaded.get_by_id("chunk-7") is None
+    ids = await query_ids(reloaded, "text 7", 5)
+    assert len(ids) == 5
+    assert not {"chunk-7", "chunk-8"} & set(ids)
+    assert "chunk-9" in await query_ids(reloaded, "moved", 3)
+
+
+@pytest.mark.asyncio
+async def test_hnsw_excludes_stale_entries(open_faiss, restart):
+    storage = await open_faiss(index_type="hnsw", ann_rebuild_max_stale=1000)
+    await storage.upsert(chunks(0, 300))
+    await flush(storage)
+
+    # The ten nearest neighbours of the query leave the graph as stale entries
+    nearest = await query_ids(storage, "text 7", 10)
+    await storage.delete(nearest)
+    await flush(storage)
+    assert storage._rebuild_task.done()
+    assert storage._ann_index.ntotal == 300
+    # Faiss IDs follow the insertion order here
+    assert storage._ann_stale == {int(i.split("-")[1]) for i in nearest}
+
+    # Still top_k live results, without widening the search by the stale count
+    ids = await query_ids(storage, "text 7", 10)
+    assert len(ids) == 10
+    assert not set(nearest) & set(ids)
+
+    # The stale set is recomputed from the saved graph on load
+    restart()
+    reloaded = await open_faiss(index_type="hnsw", ann_rebuild_max_stale=1000)
+    assert reloaded._ann_stale == storage._ann_stale
+    assert await query_ids(reloaded, "text 7", 10) == ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index_type", ["hnsw", "ivf_flat"])
+async def test_rebuild_after_deletes(open_faiss, index_type):
+    storage = await open_faiss(index_type=index_type, ann_rebuild_max_stale=20)
+    await storage.upsert(chunks(0, 300))
+    await flush(storage)
+    first_index = storage._ann_index
+
+    await storage.delete([f"chunk-{i}" for i in range(0, 300, 10)])
+    await flush(storage)
+    if index_type == "hnsw":
+        # More stale entries than ann_rebuild_max_stale start a rebuild
+        assert storage._ann_index is not first_index
+    else:
+        # IVF lists drop removed IDs in place, nothing goes stale
+        assert storage._ann_index is first_index
+        assert await storage.rebuild_index()
+    assert storage._ann_index.ntotal == 270
+    assert storage._ann_stale == set()
+    assert storage._ann_search_params() is None
+
+    ids = await query_ids(storage, "text 11", 5)
+    assert ids[0] == "chunk-11"
+    assert not any(int(i.split("-")[1]) % 10 == 0 for i in ids)
+
+
+@pytest.mark.asyncio
+async def test_loads_baseline_flat_index(open_faiss, embedding_func, tmp_path):
+    # Layout written before IndexIDMap2: positions of an IndexFlatIP are the
+    # IDs, and the metadata still carries a copy of each vector
+    texts = [f"text {i}" for i in range(5)]
+    vectors = np.asarray(await embedding_func(texts), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+    index_file = os.path.join(tmp_path, "faiss_index_chunks.index")
+    faiss.write_index(index, index_file)
+    meta = {
+        str(i): {
+            "__id__": f"chunk-{i}",
+            "__created_at__": 1,
+            "content": text,
+            "__vector__": vectors[i].tolist(),
+        }
+        for i, text in enumerate(texts)
+    }
+    with open(index_file + ".meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    storage = await open_faiss()
+    assert isinstance(storage._index, faiss.IndexIDMap2)
+    assert storage._index.ntotal == 5
+    assert "__vector__" not in await storage.get_by_id("chunk-3")
+    assert (await query_ids(storage, "text 3", 1)) == ["chunk-3"]
+    stored = await storage.get_vectors_by_ids(["chunk-2"])
+    assert np.allclose(stored["chunk-2"], vectors[2], atol=1e-6)
+
+    # New vectors get IDs after the migrated positions
+    await storage.delete(["chunk-1"])
+    await storage.upsert(chunks(5, 7))
+    assert storage._custom_id_to_fid["chunk-6"] == 6
+    await flush(storage)
+    with open(index_file + ".meta.json", encoding="utf-8") as f:
+        saved = json.load(f)
+    assert sorted(saved) == ["0", "2", "3", "4", "5", "6"]
+    assert not any("__vector__" in m for m in saved.values())
@@ -0,0 +1,223 @@
+"""
+JsonDocStatusStorage index queries checked against a full scan.
+
+Every index backed query (status counts, status and track_id lookups, file
+path lookups and pagination for each sort field, direction and status filter)
+is compared against a full scan of the stored records after mixed upserts,
+deletes and drops, including bulk upserts and index rebuilds triggered by
+changes made through another process.
+"""
+
+import functools
+import random
+
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg.json_doc_status_impl import (
+    SORT_FIELDS,
+    JsonDocStatusStorage,
+    _DocStatusIndex,
+    _status_value,
+)
+from lightrag.utils import get_pinyin_sort_key
+
+STATUSES = list(DocStatus)
+TRACK_IDS = ["track-a", "track-b", "track-c"]
+FILE_PATHS = ["a.txt", "b.pdf", "报告.docx", "zeta.md", "", "B.pdf"]
+TIMES = [f"2025-01-0{d}T00:00:00+00:00" for d in range(1, 5)]
+
+
+def make_record(rng):
+    """Random record with frequent ties and optional fields left out"""
+    status = rng.choice(STATUSES)
+    record = {
+        # Records written by the pipeline hold the enum, reloaded ones the value
+        "status": status if rng.random() < 0.5 else status.value,
+        "content_summary": "summary",
+        "content_length": rng.randint(1, 100),
+        "created_at": rng.choice(TIMES),
+        "updated_at": rng.choice(TIMES + [None]),
+    }
+    if rng.random() < 0.8:
+        record["track_id"] = rng.choice(TRACK_IDS)
+    if rng.random() < 0.9:
+        record["file_path"] = rng.choice(FILE_PATHS)
+    return record
+
+
+def scan_page(data, status, field, descending, start, end):
+    """Reference pagination: filter and sort every record"""
+
+    def sort_key(doc_id):
+        doc = data[doc_id]
+        if field == "id":
+            return doc_id
+        if field == "file_path":
+            return get_pinyin_sort_key(doc.get("file_path", "no-file-path") or "")
+        return doc.get(field) or ""
+
+    doc_ids = [
+        doc_id
+        for doc_id, doc in data.items()
+        if status is None or _status_value(doc["status"]) == status
+    ]
+    doc_ids.sort(key=lambda doc_id: (sort_key(doc_id), doc_id), reverse=descending)
+    return doc_ids[start:end], len(doc_ids)
+
+
+@pytest.fixture
+def open_doc_status(open_storage):
+    return functools.partial(open_storage, JsonDocStatusStorage, "doc_status")
+
+
+async def assert_matches_scan(storage):
+    data = dict(storage._data)
+
+    counts = {status.value: 0 for status in DocStatus}
+    for doc in data.values():
+        counts[_status_value(doc["status"])] += 1
+    assert await storage.get_status_counts() == counts
+
+    for status in STATUSES:
+        expected = {
+            doc_id
+            for doc_id, doc in data.items()
+            if _status_value(doc["status"]) == status.value
+        }
+        docs = await storage.get_docs_by_status(status)
+        assert set(docs) == expected
+        assert all(doc.status == status for doc in docs.values())
+
+    for track_id in TRACK_IDS + ["missing"]:
+        expected = {
+            doc_id for doc_id, doc in data.items() if doc.get("track_id") == track_id
+        }
+        assert set(await storage.get_docs_by_track_id(track_id)) == expected
+
+    by_paths = await storage.get_docs_by_file_paths(FILE_PATHS + ["missing"])
+    for file_path in FILE_PATHS + ["missing"]:
+        matches = [doc for doc in data.values() if doc.get("file_path") == file_path]
+        doc = await storage.get_doc_by_file_path(file_path)
+        if matches:
+            assert doc in matches
+            assert by_paths[file_path] in matches
+        else:
+            assert doc is None
+            assert file_path not in by_paths
+
+    page_size = 10
+    for status in [None] + STATUSES:
+        status_value = status.value if status is not None else None
+        for field in SORT_FIELDS:
+            for direction in ("asc", "desc"):
+                page = 1
+                while True:
+                    start = (page - 1) * page_size
+                    expected, total = scan_page(
+                        data,
+                        status_value,
+                        field,
+                        direction == "desc",
+                        start,
+                        start + page_size,
+                    )
+                    docs, count = await storage.get_docs_paginated(
+                        status_filter=status,
+                        page=page,
+                        page_size=page_size,
+                        sort_field=field,
+                        sort_direction=direction,
+                    )
+                    assert [doc_id for doc_id, _ in docs] == expected
+                    assert count == total
+                    if start >= total:
+                        break
+                    page += 1
+
+
+@pytest.mark.asyncio
+async def test_mixed_upsert_delete_and_drop_match_full_scan(
+    open_doc_status, monkeypatch
+):
+    # Small bulk threshold so the bulk path runs alongside incremental updates
+    monkeypatch.setattr(_DocStatusIndex, "BULK_THRESHOLD", 8)
+    rng = random.Random(16)
+    storage = await open_doc_status()
+    next_id = 0
+
+    for step in range(40):
+        existing = list(storage._data)
+        op = rng.random()
+        if step == 25:
+            assert (await storage.drop())["status"] == "success"
+        elif op < 0.5 or not existing:
+            # Small batch of new documents and updates of existing ones
+            batch = {}
+            for _ in range(rng.randint(1, 6)):
+                if existing and rng.random() < 0.4:
+                    doc_id = rng.choice(existing)
+                else:
+                    doc_id, next_id = f"doc-{next_id:03d}", next_id + 1
+                batch[doc_id] = make_record(rng)
+            await storage.upsert(batch)
+        elif op < 0.7:
+            batch = {doc_id: make_record(rng) for doc_id in existing[:5]}
+            for _ in range(rng.randint(9, 20)):
+                batch[f"doc-{next_id:03d}"] = make_record(rng)
+                next_id += 1
+            await storage.upsert(batch)
+        else:
+            doomed = rng.sample(existing, min(len(existing), rng.randint(1, 5)))
+            await storage.delete(doomed + ["missing"])
+        await assert_matches_scan(storage)
+
+
+@pytest.mark.asyncio
+async def test_changes_from_another_process_rebuild_the_index(open_doc_status):
+    rng = random.Random(17)
+    ours = await open_doc_status()
+    # A second instance on the same namespace keeps its own index, like
+    # the storage of another worker process sharing the data
+    theirs = await open_doc_status()
+    await ours.upsert({f"doc-{i:03d}": make_record(rng) for i in range(30)})
+    await assert_matches_scan(ours)
+    await assert_matches_scan(theirs)
+
+    for step in range(20):
+        writer = rng.choice([ours, theirs])
+        doc_ids = list(writer._data)
+        if step % 3 == 2 and doc_ids:
+            await writer.delete(rng.sample(doc_ids, 3))
+        else:
+            updated = rng.sample(doc_ids, 3) + [f"new-{step:03d}"]
+            await writer.upsert({doc_id: make_record(rng) for doc_id in updated})
+        await assert_matches_scan(ours)
+        await assert_matches_scan(theirs)
+
+    # A write applied to the shared data directly, as another process does
+    async with ours._storage_lock:
+        ours._data["external"] = make_record(rng)
+        ours._data.pop(next(iter(ours._data)))
+        ours._index_meta["version"] = ours._index_meta["version"] + 1
+    await assert_matches_scan(ours)
+    await assert_matches_scan(theirs)
+
+    assert (await theirs.drop())["status"] == "success"
+    await assert_matches_scan(ours)
+    assert await ours.get_docs_paginated() == ([], 0)
+
+
+@pytest.mark.asyncio
+async def test_reload_rebuilds_index_from_file(open_doc_status, restart):
+    rng = random.Random(18)
+    storage = await open_doc_status()
+    await storage.upsert({f"doc-{i:03d}": make_record(rng) for i in range(40)})
+    await storage.delete(["doc-001", "doc-010"])
+    await storage.index_done_callback()
+    await assert_matches_scan(storage)
+
+    restart()
+    reloaded = await open_doc_status()
+    assert len(reloaded._data) == 38
+    await assert_matches_scan(reloaded)
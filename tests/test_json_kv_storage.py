@@ -0,0 +1,207 @@
+"""
+JsonKVStorage persistence: a JSON snapshot plus an append-only change log.
+
+The tests replay the log on reload, drop torn log tails, compact the log
+through the ``.compacting`` rename, recover from an interrupted compaction and
+check how often each fsync policy syncs.
+"""
+
+import functools
+import json
+import os
+
+import pytest
+
+from lightrag.kg import json_kv_impl
+from lightrag.kg.json_kv_impl import JsonKVStorage
+
+
+def docs(start, end, text="text"):
+    return {f"doc-{i}": {"content": f"{text} {i}"} for i in range(start, end)}
+
+
+@pytest.fixture
+def open_kv(open_storage):
+    return functools.partial(open_storage, JsonKVStorage, "full_docs")
+
+
+@pytest.fixture
+def reopen(open_kv, restart):
+    """Open the storage as a freshly started process would"""
+
+    async def reopen():
+        restart()
+        return await open_kv()
+
+    return reopen
+
+
+async def contents(storage):
+    return {k: v["content"] for k, v in (await storage.get_all()).items()}
+
+
+@pytest.mark.asyncio
+async def test_flush_appends_to_log_and_reload_replays_it(open_kv, reopen):
+    storage = await open_kv()
+    await storage.upsert(docs(0, 5))
+    await storage.index_done_callback()
+    # The first flush writes the snapshot the log is relative to
+    assert os.path.exists(storage._file_name)
+    assert not os.path.exists(storage._log_file)
+    with open(storage._file_name, "rb") as f:
+        snapshot = f.read()
+
+    await storage.upsert(docs(3, 8, "new"))
+    await storage.delete(["doc-0"])
+    await storage.index_done_callback()
+    await storage.delete(["doc-1"])
+    await storage.index_done_callback()
+
+    with open(storage._file_name, "rb") as f:
+        assert f.read() == snapshot
+    with open(storage._log_file, encoding="utf-8") as f:
+        log = [json.loads(line) for line in f]
+    assert len(log) == 2
+    assert sorted(log[0]["upsert"]) == [f"doc-{i}" for i in range(3, 8)]
+    assert log[0]["delete"] == ["doc-0"]
+    assert log[1] == {"upsert": {}, "delete": ["doc-1"]}
+
+    expected = await contents(storage)
+    reloaded = await reopen()
+    assert await contents(reloaded) == expected
+    assert sorted(expected) == [f"doc-{i}" for i in range(2, 8)]
+    assert expected["doc-3"] == "new 3"
+
+
+@pytest.mark.asyncio
+async def test_torn_log_tail_is_dropped_and_truncated(open_kv, reopen):
+    storage = await open_kv()
+    await storage.upsert(docs(0, 2))
+    await storage.index_done_callback()
+    await storage.upsert(docs(2, 3))
+    await storage.index_done_callback()
+    valid_size = os.path.getsize(storage._log_file)
+
+    # Crash in the middle of appending the next record
+    with open(storage._log_file, "ab") as f:
+        f.write(b'{"upsert": {"doc-9": {"content": "lost')
+
+    reloaded = await reopen()
+    assert sorted(await contents(reloaded)) == ["doc-0", "doc-1", "doc-2"]
+    assert os.path.getsize(reloaded._log_file) == valid_size
+
+    # Later appends start on a record boundary
+    await reloaded.upsert(docs(3, 4))
+    await reloaded.index_done_callback()
+    again = await reopen()
+    assert sorted(await contents(again)) == [f"doc-{i}" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_compaction_folds_log_into_snapshot(open_kv, reopen, monkeypatch):
+    monkeypatch.setattr(json_kv_impl, "LOG_COMPACT_MIN_BYTES", 0)
+    monkeypatch.setattr(json_kv_impl, "LOG_COMPACT_RATIO", 0.0)
+    storage = await open_kv()
+    await storage.upsert(docs(0, 3))
+    await storage.index_done_callback()
+
+    await storage.upsert(docs(3, 6))
+    await storage.delete(["doc-0"])
+    await storage.index_done_callback()
+    assert storage._compaction_task is not None
+    await storage._compaction_task
+
+    assert not os.path.exists(storage._log_file)
+    assert not os.path.exists(storage._compacting_log_file)
+    with open(storage._file_name, encoding="utf-8") as f:
+        assert sorted(json.load(f)) == [f"doc-{i}" for i in range(1, 6)]
+
+    reloaded = await reopen()
+    assert sorted(await contents(reloaded)) == [f"doc-{i}" for i in range(1, 6)]
+
+
+@pytest.mark.asyncio
+async def test_writes_during_compaction_go_to_a_new_log(open_kv, reopen, monkeypatch):
+    storage = await open_kv()
+    await storage.upsert(docs(0, 2))
+    await storage.index_done_callback()
+    await storage.upsert(docs(2, 3))
+    await storage.index_done_callback()
+
+    # Compaction has renamed the log when the next flush happens
+    os.replace(storage._log_file, storage._compacting_log_file)
+    await storage.upsert(docs(3, 4))
+    await storage.delete(["doc-2"])
+    await storage.index_done_callback()
+    assert os.path.exists(storage._log_file)
+
+    monkeypatch.setattr(json_kv_impl, "LOG_COMPACT_MIN_BYTES", 0)
+    monkeypatch.setattr(json_kv_impl, "LOG_COMPACT_RATIO", 0.0)
+    # No second compaction while one is pending
+    assert not storage._compaction_due()
+
+    reloaded = await reopen()
+    assert sorted(await contents(reloaded)) == ["doc-0", "doc-1", "doc-3"]
+
+
+@pytest.mark.asyncio
+async def test_recovers_from_interrupted_compaction(open_kv, reopen):
+    storage = await open_kv()
+    await storage.upsert(docs(0, 3))
+    await storage.index_done_callback()
+    await storage.upsert(docs(3, 5))
+    await storage.index_done_callback()
+    await storage.delete(["doc-1"])
+    await storage.index_done_callback()
+
+    # Crash after the rename, with a half written snapshot and a torn
+    # record at the end of the log being compacted
+    os.replace(storage._log_file, storage._compacting_log_file)
+    with open(storage._compacting_log_file, "ab") as f:
+        f.write(b'{"delete": ["doc-0"')
+    with open(storage._file_name + ".compacting.tmp", "w") as f:
+        f.write('{"doc-0": {"content": "partial')
+    await storage.upsert(docs(5, 6))
+    await storage.index_done_callback()
+
+    reloaded = await reopen()
+    expected = ["doc-0", "doc-2", "doc-3", "doc-4", "doc-5"]
+    assert sorted(await contents(reloaded)) == expected
+
+    # The compaction was completed on load
+    assert not os.path.exists(reloaded._compacting_log_file)
+    assert not os.path.exists(reloaded._log_file)
+    with open(reloaded._file_name, encoding="utf-8") as f:
+        assert sorted(json.load(f)) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "policy, flush_syncs", [("always", 3), ("everysec", 1), ("no", 0)]
+)
+async def test_fsync_policy(open_kv, monkeypatch, policy, flush_syncs):
+    monkeypatch.setattr(json_kv_impl, "LOG_FSYNC", policy)
+    monkeypatch.setattr(json_kv_impl, "LOG_FSYNC_INTERVAL", 0.1)
+    storage = await open_kv()
+    await storage.upsert(docs(0, 1))
+    await storage.index_done_callback()
+
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(
+        json_kv_impl.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd)
+    )
+    # Three log appends within the fsync interval
+    for i in range(1, 4):
+        await storage.upsert(docs(i, i + 1))
+        await storage.index_done_callback()
+    assert len(synced) == flush_syncs
+    if policy == "everysec":
+        # The tail of the burst is synced once the interval has passed
+        await storage._fsync_task
+        assert len(synced) == 2
+
+    # Snapshots are synced unless the policy is "no"
+    synced.clear()
+    await storage.drop()
+    assert len(synced) == (0 if policy == "no" else 1)
@@ -0,0 +1,195 @@
+"""
+MmapVectorDBStorage: queries, tombstones, appends across reloads, compaction
+into a new generation and recovery from bytes left by an interrupted flush.
+"""
+
+import functools
+import os
+
+import numpy as np
+import pytest
+
+from lightrag.kg import mmap_vector_db_impl
+from lightrag.kg.mmap_vector_db_impl import MmapVectorDBStorage
+
+
+@pytest.fixture
+def open_mmap(open_storage):
+    return functools.partial(
+        open_storage,
+        MmapVectorDBStorage,
+        "relationships",
+        meta_fields={"content", "src_id", "tgt_id"},
+    )
+
+
+def relations(start, end):
+    return {
+        f"rel-{i}": {"content": f"text {i}", "src_id": f"e{i % 5}", "tgt_id": "hub"}
+        for i in range(start, end)
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("vector_dtype", ["float32", "float16"])
+async def test_query_and_reload(open_mmap, vector_dtype):
+    storage = await open_mmap(vector_dtype=vector_dtype)
+    await storage.upsert(relations(0, 40))
+    await storage.index_done_callback()
+
+    # Incremental append after the first flush
+    await storage.upsert(relations(40, 50))
+    results = await storage.query("text 45", top_k=3)
+    assert results[0]["id"] == "rel-45"
+    assert results[0]["src_id"] == "e0"
+    await storage.index_done_callback()
+
+    reloaded = await open_mmap(vector_dtype=vector_dtype)
+    results = await reloaded.query("text 7", top_k=3)
+    assert results[0]["id"] == "rel-7"
+    assert results[0]["distance"] == pytest.approx(1.0, abs=1e-2)
+
+    vectors = await reloaded.get_vectors_by_ids(["rel-7", "rel-45", "missing"])
+    assert set(vectors) == {"rel-7", "rel-45"}
+    assert len(vectors["rel-7"]) == reloaded._dim
+
+
+@pytest.mark.asyncio
+async def test_tombstones_and_compaction(open_mmap):
+    storage = await open_mmap(compact_ratio=0.2)
+    await storage.upsert(relations(0, 50))
+    await storage.index_done_callback()
+
+    await storage.delete(["rel-1", "rel-2"])
+    await storage.upsert({"rel-3": {"content": "text 3", "src_id": "x"}})
+    assert await storage.get_by_id("rel-1") is None
+    assert (await storage.get_by_id("rel-3"))["src_id"] == "x"
+
+    await storage.delete_entity_relation("e0")
+    ids = [r["id"] for r in await storage.query("text 9", top_k=100)]
+    assert "rel-0" not in ids and "rel-1" not in ids
+    assert len(ids) == len(set(ids)) == 38
+
+    # 13 of 51 rows are tombstoned, above compact_ratio
+    await storage.index_done_callback()
+    assert os.path.getsize(storage._vectors_file) == 38 * storage._dim * 4
+
+    reloaded = await open_mmap()
+    assert (await reloaded.query("text 9", top_k=1))[0]["id"] == "rel-9"
+    assert (await reloaded.get_by_id("rel-3"))["src_id"] == "x"
+
+
+@pytest.mark.asyncio
+async def test_ignores_uncommitted_rows(open_mmap):
+    storage = await open_mmap()
+    await storage.upsert(relations(0, 10))
+    await storage.index_done_callback()
+
+    # Simulate a crash after appending vectors but before writing metadata
+    with open(storage._vectors_file, "ab") as f:
+        f.write(b"\0" * storage._dim * 4 * 3)
+
+    reloaded = await open_mmap()
+    assert (await reloaded.query("text 4", top_k=1))[0]["id"] == "rel-4"
+    assert len(await reloaded.query("text 4", top_k=100)) == 10
+
+    result = await reloaded.drop()
+    assert result["status"] == "success"
+    assert await reloaded.query("text 4", top_k=3) == []
+
+
+@pytest.mark.asyncio
+async def test_flush_appends_to_row_log(open_mmap):
+    storage = await open_mmap()
+    await storage.upsert(relations(0, 20))
+    await storage.index_done_callback()
+    rows_log = storage._gen_file(storage._generation, "rows.jsonl")
+    content_file = storage._gen_file(storage._generation, "content.jsonl")
+    with open(rows_log, "rb") as f:
+        first_log = f.read()
+    with open(content_file, "rb") as f:
+        first_content = f.read()
+
+    await storage.delete(["rel-3"])
+    await storage.upsert(relations(20, 22))
+    await storage.index_done_callback()
+
+    # Earlier bytes are left untouched, only the new rows and the delete are added
+    with open(rows_log, "rb") as f:
+        assert f.read().startswith(first_log)
+    with open(content_file, "rb") as f:
+        assert f.read().startswith(first_content)
+    with open(storage._meta_file, encoding="utf-8") as f:
+        assert "text 1" not in f.read()
+
+    reloaded = await open_mmap()
+    assert await reloaded.get_by_id("rel-3") is None
+    assert (await reloaded.get_by_id("rel-21"))["content"] == "text 21"
+    assert (await reloaded.query("text 5", top_k=1))[0]["content"] == "text 5"
+
+
+@pytest.mark.asyncio
+async def test_interrupted_compaction_keeps_previous_generation(open_mmap, monkeypatch):
+    storage = await open_mmap(compact_ratio=0.2)
+    await storage.upsert(relations(0, 20))
+    await storage.index_done_callback()
+    await storage.delete([f"rel-{i}" for i in range(10)])
+
+    # Crash after the next generation is written but before the header swap
+    def crash(*args):
+        raise OSError("simulated crash")
+
+    monkeypatch.setattr(storage, "_write_meta", crash)
+    with pytest.raises(OSError):
+        storage._flush()
+
+    reloaded = await open_mmap()
+    assert reloaded._generation == 0
+    assert len(await reloaded.query("text 4", top_k=100)) == 20
+    assert (await reloaded.get_by_id("rel-4"))["content"] == "text 4"
+
+    # The next flush overwrites the orphaned generation
+    await reloaded.delete([f"rel-{i}" for i in range(10)])
+    await reloaded.index_done_callback()
+    assert reloaded._generation == 1
+    assert not os.path.exists(reloaded._gen_file(0, "vectors"))
+    again = await open_mmap()
+    assert len(await again.query("text 14", top_k=100)) == 10
+    assert (await again.get_by_id("rel-14"))["content"] == "text 14"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "vector_dtype, tolerance", [("float32", 1e-6), ("float16", 1e-2)]
+)
+async def test_compaction_streams_rows_in_blocks(
+    open_mmap, monkeypatch, vector_dtype, tolerance
+):
+    # Blocks of a few rows so the rewrite spans many blocks
+    monkeypatch.setattr(mmap_vector_db_impl, "_REWRITE_BLOCK_BYTES", 7 * 64)
+    storage = await open_mmap()
+    await storage.upsert(relations(0, 40))
+    await storage.index_done_callback()
+    expected = await storage.get_vectors_by_ids([f"rel-{i}" for i in range(40)])
+
+    # Reopening with float16 converts the float32 rows during the rewrite
+    storage = await open_mmap(vector_dtype=vector_dtype)
+    # Persisted and pending rows are both copied, tombstones are dropped
+    await storage.delete([f"rel-{i}" for i in range(0, 40, 3)])
+    await storage.upsert(relations(40, 45))
+    await storage.index_done_callback()
+    assert storage._generation == 1
+    assert (storage._total_rows, storage._dead_rows) == (31, 0)
+    itemsize = np.dtype(vector_dtype).itemsize
+    assert os.path.getsize(storage._vectors_file) == 31 * storage._dim * itemsize
+    assert not os.path.exists(storage._gen_file(0, "vectors"))
+
+    reloaded = await open_mmap(vector_dtype=vector_dtype)
+    assert await reloaded.get_by_id("rel-3") is None
+    for i in (1, 20, 38, 44):
+        record = await reloaded.get_by_id(f"rel-{i}")
+        assert (record["content"], record["src_id"]) == (f"text {i}", f"e{i % 5}")
+    vectors = await reloaded.get_vectors_by_ids(["rel-1", "rel-38"])
+    for key, vector in vectors.items():
+        assert np.allclose(vector, expected[key], atol=tolerance)
+    assert (await reloaded.query("text 44", top_k=1))[0]["id"] == "rel-44"
@@ -0,0 +1,203 @@
+"""
+NetworkXStorage persistence: a JSON snapshot plus an append-only operation log,
+log compaction into a new snapshot generation, recovery from torn log records
+and interrupted compactions, and the migration from a GraphML file.
+"""
+
+import functools
+import json
+import os
+
+import networkx as nx
+import pytest
+
+from lightrag.kg import networkx_impl
+from lightrag.kg.networkx_impl import NetworkXStorage
+
+
+@pytest.fixture
+def open_graph(open_storage):
+    return functools.partial(open_storage, NetworkXStorage, "chunk_entity_relation")
+
+
+@pytest.fixture
+def reopen(open_graph, restart):
+    """Open the graph as a freshly started process would"""
+
+    async def reopen():
+        restart()
+        return await open_graph()
+
+    return reopen
+
+
+async def add_star(graph, hub, start, end):
+    await graph.upsert_node(hub, {"entity_type": "hub", "description": hub})
+    for i in range(start, end):
+        await graph.upsert_node(f"n{i}", {"entity_type": "leaf", "description": "v1"})
+        await graph.upsert_edge(hub, f"n{i}", {"weight": 1.0, "keywords": "k"})
+
+
+def graph_state(graph):
+    nodes = {node_id: dict(data) for node_id, data in graph._graph.nodes(data=True)}
+    edges = {
+        tuple(sorted((source, target))): dict(data)
+        for source, target, data in graph._graph.edges(data=True)
+    }
+    return nodes, edges
+
+
+def read_log(graph):
+    with open(graph._oplog_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.asyncio
+async def test_flush_appends_to_log_and_reload_replays_it(open_graph, reopen):
+    graph = await open_graph()
+    await add_star(graph, "hub", 0, 5)
+    assert await graph.index_done_callback()
+    # The first flush writes the snapshot the log is relative to
+    assert os.path.getsize(graph._oplog_file) == 0
+    with open(graph._snapshot_file, "rb") as f:
+        snapshot = f.read()
+
+    await graph.upsert_node("n1", {"entity_type": "leaf", "description": "v2"})
+    await graph.delete_node("n2")
+    await graph.remove_edges([("hub", "n3")])
+    assert await graph.index_done_callback()
+    await add_star(graph, "other", 5, 7)
+    assert await graph.index_done_callback()
+
+    with open(graph._snapshot_file, "rb") as f:
+        assert f.read() == snapshot
+    log = read_log(graph)
+    assert len(log) == 2
+    assert log[0]["nodes"] == [["n1", {"entity_type": "leaf", "description": "v2"}]]
+    assert log[0]["del_nodes"] == ["n2"]
+    assert sorted(map(sorted, log[0]["del_edges"])) == [["hub", "n2"], ["hub", "n3"]]
+
+    expected = graph_state(graph)
+    reloaded = await reopen()
+    assert graph_state(reloaded) == expected
+    assert (await reloaded.get_node("n1"))["description"] == "v2"
+    assert not await reloaded.has_node("n2")
+    assert not await reloaded.has_edge("n3", "hub")
+    assert await reloaded.has_edge("n6", "other")
+
+
+@pytest.mark.asyncio
+async def test_torn_log_tail_is_dropped_and_truncated(open_graph, reopen):
+    graph = await open_graph()
+    await add_star(graph, "hub", 0, 2)
+    await graph.index_done_callback()
+    await add_star(graph, "hub", 2, 3)
+    await graph.index_done_callback()
+    valid_size = os.path.getsize(graph._oplog_file)
+
+    # Crash in the middle of appending the next record
+    with open(graph._oplog_file, "ab") as f:
+        f.write(b'{"gen": 1, "nodes": [["lost", {"desc')
+
+    reloaded = await reopen()
+    assert sorted(reloaded._graph.nodes) == ["hub", "n0", "n1", "n2"]
+    assert reloaded._oplog_offset == valid_size
+
+    # The next record replaces the torn bytes
+    await add_star(reloaded, "hub", 3, 4)
+    await reloaded.index_done_callback()
+    assert len(read_log(reloaded)) == 2
+    again = await reopen()
+    assert sorted(again._graph.nodes) == ["hub", "n0", "n1", "n2", "n3"]
+
+
+@pytest.mark.asyncio
+async def test_compaction_writes_a_new_snapshot_generation(
+    open_graph, reopen, monkeypatch
+):
+    graph = await open_graph()
+    await add_star(graph, "hub", 0, 3)
+    await graph.index_done_callback()
+    await graph.delete_node("n0")
+    await graph.index_done_callback()
+    assert graph._oplog_generation == 1
+    assert len(read_log(graph)) == 1
+
+    monkeypatch.setattr(networkx_impl, "OPLOG_COMPACT_MIN_BYTES", 0)
+    monkeypatch.setattr(networkx_impl, "OPLOG_COMPACT_RATIO", 0.0)
+    await add_star(graph, "hub", 3, 4)
+    await graph.index_done_callback()
+    assert graph._oplog_generation == 2
+    assert os.path.getsize(graph._oplog_file) == 0
+    with open(graph._snapshot_file, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["generation"] == 2
+    assert sorted(node for node, _ in snapshot["nodes"]) == ["hub", "n1", "n2", "n3"]
+
+    expected = graph_state(graph)
+    reloaded = await reopen()
+    assert graph_state(reloaded) == expected
+
+
+@pytest.mark.asyncio
+async def test_interrupted_compaction_recovers(open_graph, reopen):
+    graph = await open_graph()
+    await add_star(graph, "hub", 0, 3)
+    await graph.index_done_callback()
+    await graph.upsert_node("n0", {"entity_type": "leaf", "description": "v2"})
+    await graph.index_done_callback()
+    expected = graph_state(graph)
+
+    # Crash while writing the next snapshot, before it replaced the current one
+    with open(graph._snapshot_file + ".tmp", "w", encoding="utf-8") as f:
+        f.write('{"generation": 2, "nodes": [["n0"')
+    reloaded = await reopen()
+    assert graph_state(reloaded) == expected
+
+    # Crash after the new snapshot replaced the old one, before the log was
+    # truncated: the old generation's records are skipped on load
+    NetworkXStorage.write_snapshot(reloaded._graph, reloaded._snapshot_file, 2)
+    assert len(read_log(reloaded)) == 1
+    snapshot_graph, generation, offset = NetworkXStorage.load_snapshot_graph(
+        reloaded._snapshot_file, reloaded._oplog_file
+    )
+    assert generation == 2
+    assert NetworkXStorage.replay_oplog(
+        snapshot_graph, reloaded._oplog_file, generation
+    ) == (0, offset)
+
+    again = await reopen()
+    assert graph_state(again) == expected
+    await again.upsert_node("n9", {"entity_type": "leaf", "description": "v1"})
+    await again.index_done_callback()
+    assert read_log(again)[-1]["gen"] == 2
+    final = await reopen()
+    assert await final.has_node("n9")
+    assert (await final.get_node("n0"))["description"] == "v2"
+
+
+@pytest.mark.asyncio
+async def test_graphml_is_migrated_and_exported(open_graph, reopen, tmp_path):
+    legacy = nx.Graph()
+    legacy.add_node("a", entity_type="person", description="old")
+    legacy.add_node("b", entity_type="place", description="old")
+    legacy.add_edge("a", "b", weight=2.0, keywords="k")
+    graphml_file = os.path.join(tmp_path, "graph_chunk_entity_relation.graphml")
+    nx.write_graphml(legacy, graphml_file)
+
+    graph = await open_graph()
+    assert (await graph.get_edge("a", "b"))["weight"] == 2.0
+    await graph.upsert_node("c", {"entity_type": "thing", "description": "new"})
+    await graph.index_done_callback()
+
+    # The snapshot replaces the GraphML file, which is kept as a backup
+    assert os.path.exists(graph._snapshot_file)
+    assert not os.path.exists(graphml_file)
+    assert os.path.exists(graphml_file + ".bak")
+    reloaded = await reopen()
+    assert sorted(reloaded._graph.nodes) == ["a", "b", "c"]
+
+    exported = nx.read_graphml(await reloaded.export_graphml())
+    assert sorted(exported.nodes) == ["a", "b", "c"]
+    assert exported.nodes["c"]["description"] == "new"
+    assert exported.edges["a", "b"]["weight"] == 2.0
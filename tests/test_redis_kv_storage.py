@@ -0,0 +1,143 @@
+"""
+RedisKVStorage against an in-memory fakeredis server, in both key layouts.
+
+The upsert path runs server side Lua scripts, so these tests need fakeredis
+with Lua support (the ``lupa`` package) and are skipped without it.
+"""
+
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from lightrag.kg import redis_impl  # noqa: E402
+from lightrag.kg.redis_impl import RedisKVStorage  # noqa: E402
+
+
+@pytest.fixture(params=["string", "hash"])
+def layout(request, monkeypatch):
+    monkeypatch.setattr(redis_impl, "KV_LAYOUT", request.param)
+    # Small batches so scans, MGET and script calls span several steps
+    monkeypatch.setattr(redis_impl, "SCAN_BATCH_SIZE", 7)
+    return request.param
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def open_redis(server, shared_data):
+    """RedisKVStorage talking to the in-memory fakeredis ``server``"""
+
+    async def open_redis(namespace="text_chunks"):
+        storage = RedisKVStorage(
+            namespace=namespace,
+            workspace="test",
+            global_config={},
+            embedding_func=None,
+        )
+        storage._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        storage._upsert_string_script = storage._redis.register_script(
+            redis_impl.UPSERT_STRING_SCRIPT
+        )
+        storage._upsert_hash_script = storage._redis.register_script(
+            redis_impl.UPSERT_HASH_SCRIPT
+        )
+        await storage.initialize()
+        return storage
+
+    return open_redis
+
+
+async def store_raw(storage, key, record):
+    if redis_impl.KV_LAYOUT == "hash":
+        await storage._redis.hset(storage._hash_key, key, json.dumps(record))
+    else:
+        await storage._redis.set(storage._key(key), json.dumps(record))
+
+
+@pytest.mark.asyncio
+async def test_upsert_and_read_back(open_redis, layout):
+    storage = await open_redis()
+    data = {
+        f"chunk-{i}": {"content": f"text {i}", "nested": {"a": [1, 2]}}
+        for i in range(20)
+    }
+    await storage.upsert(data)
+
+    record = await storage.get_by_id("chunk-3")
+    assert record["content"] == "text 3"
+    assert record["nested"] == {"a": [1, 2]}
+    assert record["llm_cache_list"] == []
+    assert record["create_time"] == record["update_time"]
+
+    results = await storage.get_by_ids(["chunk-1", "missing", "chunk-19"])
+    assert results[1] is None
+    assert [results[0]["content"], results[2]["content"]] == ["text 1", "text 19"]
+    assert len(await storage.get_all()) == 20
+    assert await storage.filter_keys({"chunk-1", "new"}) == {"new"}
+
+    await storage.delete(["chunk-1", "chunk-2", "missing"])
+    assert len(await storage.get_all()) == 18
+    assert (await storage.drop())["status"] == "success"
+    assert await storage.get_all() == {}
+
+
+@pytest.mark.asyncio
+async def test_upsert_keeps_stored_create_time(open_redis, layout):
+    storage = await open_redis()
+    await store_raw(
+        storage,
+        "old",
+        {"content": "x", "create_time": 111, "update_time": 5, "_id": "old"},
+    )
+    # A nested create_time must not be taken for the record's own
+    await store_raw(
+        storage,
+        "nested",
+        {
+            "meta": {"create_time": 222},
+            "create_time": 333,
+            "update_time": 5,
+            "_id": "nested",
+        },
+    )
+    await store_raw(
+        storage,
+        "nested-only",
+        {"meta": {"create_time": 444}, "update_time": 5, "_id": "nested-only"},
+    )
+
+    await storage.upsert(
+        {
+            "old": {"content": "y"},
+            "nested": {"content": "z"},
+            "nested-only": {"content": "w"},
+            "new": {"content": "v", "create_time": 1},
+        }
+    )
+    old = await storage.get_by_id("old")
+    assert (old["create_time"], old["content"]) == (111, "y")
+    assert (await storage.get_by_id("nested"))["create_time"] == 333
+
+    # Without a top-level create_time the record counts as new
+    nested_only = await storage.get_by_id("nested-only")
+    assert nested_only["create_time"] == nested_only["update_time"]
+    new = await storage.get_by_id("new")
+    assert new["create_time"] == new["update_time"] != 1
+
+
+@pytest.mark.asyncio
+async def test_string_keys_migrate_to_hash_layout(open_redis, monkeypatch):
+    monkeypatch.setattr(redis_impl, "KV_LAYOUT", "string")
+    storage = await open_redis("full_docs")
+    await storage.upsert({f"doc-{i}": {"content": "x"} for i in range(10)})
+
+    monkeypatch.setattr(redis_impl, "KV_LAYOUT", "hash")
+    migrated = await open_redis("full_docs")
+    assert len(await migrated.get_all()) == 10
+    assert await migrated._redis.keys("*") == [migrated._hash_key]
@@ -0,0 +1,251 @@
+"""
+StagedPipeline scheduling: ordering, backpressure from a slow stage, stop
+propagation across multi-worker and batch stages, failure isolation and stats
+reporting.
+"""
+
+import asyncio
+
+import pytest
+
+from lightrag.pipeline import PipelineStage, StagedPipeline, parse_stage_workers
+
+
+def make_stage(name, log, workers=1, delay=0.0, fail=(), batch=False):
+    """Stage appending what it handled to ``log[name]`` and passing items on"""
+    log.setdefault(name, [])
+
+    async def handler(item):
+        await asyncio.sleep(delay)
+        items = item if batch else [item]
+        if any(i in fail for i in items):
+            raise ValueError(f"{name} failed on {items}")
+        log[name].append(item)
+        return item
+
+    return PipelineStage(name, handler, workers=workers, batch=batch)
+
+
+class TestStagedPipeline:
+    @pytest.mark.asyncio
+    async def test_single_worker_stages_keep_order(self):
+        log = {}
+        pipeline = StagedPipeline(
+            [make_stage("a", log), make_stage("b", log), make_stage("c", log)],
+            queue_size=2,
+        )
+        await pipeline.run(range(20))
+        assert log["a"] == log["b"] == log["c"] == list(range(20))
+
+    @pytest.mark.asyncio
+    async def test_none_result_drops_item(self):
+        log = {}
+
+        async def odd_only(item):
+            return item if item % 2 else None
+
+        pipeline = StagedPipeline(
+            [PipelineStage("filter", odd_only), make_stage("sink", log)],
+            queue_size=4,
+        )
+        await pipeline.run(range(10))
+        assert log["sink"] == [1, 3, 5, 7, 9]
+
+    @pytest.mark.asyncio
+    async def test_slow_stage_applies_backpressure(self):
+        pulled = []
+        release = asyncio.Event()
+
+        def items():
+            for i in range(100):
+                pulled.append(i)
+                yield i
+
+        async def blocked(item):
+            await release.wait()
+            return item
+
+        log = {}
+        pipeline = StagedPipeline(
+            [make_stage("fast", log), PipelineStage("slow", blocked)],
+            queue_size=2,
+        )
+        task = asyncio.create_task(pipeline.run(items()))
+        await asyncio.sleep(0.05)
+
+        # Two queues of 2, one item in each handler and one waiting to be put
+        assert len(pulled) <= 2 * 2 + 2 + 2
+        assert pipeline.stats()["slow"]["queued"] == 2
+        release.set()
+        await task
+        assert len(pulled) == 100
+
+    @pytest.mark.asyncio
+    async def test_stop_reaches_every_worker_of_multi_worker_stages(self):
+        log = {}
+        pipeline = StagedPipeline(
+            [
+                make_stage("a", log, workers=3, delay=0.001),
+                make_stage("b", log, workers=4, delay=0.002),
+                make_stage("c", log, workers=2),
+            ],
+            queue_size=3,
+        )
+        await asyncio.wait_for(pipeline.run(range(50)), timeout=5)
+        assert sorted(log["c"]) == list(range(50))
+        stats = pipeline.stats()
+        assert all(stage["active"] == 0 for stage in stats.values())
+        assert stats["b"]["completed"] == 50
+
+    @pytest.mark.asyncio
+    async def test_batch_stage_meeting_stop_mid_drain(self):
+        log = {}
+        batches = []
+        pipeline = None
+
+        async def collect(batch):
+            if not batches:
+                # Hold the first batch until the upstream stage has finished and
+                # queued STOP behind the remaining items
+                while pipeline.stats()["a"]["completed"] < 10:
+                    await asyncio.sleep(0.001)
+                await asyncio.sleep(0.01)
+            batches.append(list(batch))
+            return batch
+
+        pipeline = StagedPipeline(
+            [
+                make_stage("a", log),
+                PipelineStage("batch", collect, batch=True),
+                make_stage("sink", log),
+            ],
+            queue_size=16,
+        )
+        await asyncio.wait_for(pipeline.run(range(10)), timeout=5)
+        assert batches == [[0], list(range(1, 10))]
+        assert log["sink"] == list(range(10))
+        assert pipeline.stats()["batch"]["completed"] == 10
+
+    @pytest.mark.asyncio
+    async def test_multi_worker_batch_stage_drains_everything(self):
+        log = {}
+        batches = []
+
+        async def collect(batch):
+            batches.append(list(batch))
+            return batch
+
+        pipeline = StagedPipeline(
+            [
+                make_stage("a", log, workers=4),
+                PipelineStage("batch", collect, workers=2, batch=True),
+                make_stage("sink", log),
+            ],
+            queue_size=16,
+        )
+        await asyncio.wait_for(pipeline.run(range(40)), timeout=5)
+        assert sorted(i for batch in batches for i in batch) == list(range(40))
+        assert sorted(log["sink"]) == list(range(40))
+        assert pipeline.stats()["batch"]["completed"] == 40
+
+    @pytest.mark.asyncio
+    async def test_handler_error_is_isolated_and_reported(self):
+        log = {}
+        errors = []
+
+        async def on_error(stage, item, error):
+            errors.append((stage, item, type(error)))
+
+        pipeline = StagedPipeline(
+            [
+                make_stage("a", log, workers=2, fail={3, 7}),
+                make_stage("b", log, fail={5}),
+            ],
+            queue_size=2,
+            on_error=on_error,
+        )
+        await pipeline.run(range(10))
+        assert sorted(log["b"]) == [0, 1, 2, 4, 6, 8, 9]
+        assert sorted(errors) == [
+            ("a", 3, ValueError),
+            ("a", 7, ValueError),
+            ("b", 5, ValueError),
+        ]
+        stats = pipeline.stats()
+        assert (stats["a"]["completed"], stats["a"]["failed"]) == (8, 2)
+        assert (stats["b"]["completed"], stats["b"]["failed"]) == (7, 1)
+
+    @pytest.mark.asyncio
+    async def test_batch_error_reports_every_item(self):
+        errors = []
+        ok = []
+
+        async def persist(batch):
+            if 2 in batch:
+                raise RuntimeError("flush failed")
+            ok.extend(batch)
+            return batch
+
+        async def on_error(stage, item, error):
+            errors.append(item)
+
+        async def slow(item):
+            await asyncio.sleep(0.001)
+            return item
+
+        pipeline = StagedPipeline(
+            [
+                PipelineStage("slow", slow),
+                PipelineStage("persist", persist, batch=True),
+            ],
+            queue_size=4,
+            on_error=on_error,
+        )
+        await pipeline.run(range(6))
+        assert sorted(ok + errors) == list(range(6))
+        assert 2 in errors
+        stats = pipeline.stats()["persist"]
+        assert stats["failed"] == len(errors)
+        assert stats["completed"] == len(ok)
+
+    @pytest.mark.asyncio
+    async def test_failing_error_handler_does_not_stop_pipeline(self):
+        log = {}
+
+        async def on_error(stage, item, error):
+            raise RuntimeError("handler broke")
+
+        pipeline = StagedPipeline(
+            [make_stage("a", log, fail={1}), make_stage("b", log)],
+            queue_size=2,
+            on_error=on_error,
+        )
+        await asyncio.wait_for(pipeline.run(range(4)), timeout=5)
+        assert log["b"] == [0, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_updates_are_throttled_with_final_report(self):
+        updates = []
+
+        async def on_update(stats):
+            updates.append(stats)
+
+        log = {}
+        pipeline = StagedPipeline(
+            [make_stage("a", log), make_stage("b", log)],
+            queue_size=2,
+            on_update=on_update,
+            update_interval=60,
+        )
+        await pipeline.run(range(20))
+        # The first move and the final report
+        assert len(updates) == 2
+        assert updates[-1]["b"]["completed"] == 20
+        assert updates[-1]["a"]["queued"] == 0
+
+
+def test_parse_stage_workers():
+    assert parse_stage_workers(None) == {}
+    assert parse_stage_workers(" extract:4, merge:2,") == {"extract": 4, "merge": 2}
+    with pytest.raises(ValueError):
+        parse_stage_workers("extract")